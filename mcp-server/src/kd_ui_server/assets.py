@@ -0,0 +1,222 @@
+"""Vendored, fingerprinted third-party assets for the base layout.
+
+The base layout depends on Chart.js, Lucide and the Inter font. By default they
+come from public CDNs; ``kd-ui-assets`` downloads pinned versions into the
+Flask app's static folder under content-hashed filenames and writes a manifest
+with Subresource Integrity hashes. When a manifest is available the base layout
+references the local copies (with preload hints) instead of the CDNs.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import urllib.request
+from pathlib import Path
+
+MANIFEST_NAME = "kd-ui-assets.json"
+MANIFEST_ENV = "KD_UI_ASSET_MANIFEST"
+
+CHARTJS_VERSION = "4.4.0"
+LUCIDE_VERSION = "0.460.0"
+
+# Pinned CDN sources — never "latest", so every URL is immutable and cacheable
+VENDOR_ASSETS = {
+    "chartjs": {
+        "kind": "script",
+        "url": f"https://cdn.jsdelivr.net/npm/chart.js@{CHARTJS_VERSION}/dist/chart.umd.js",
+        "filename": "chart.umd.js",
+    },
+    "lucide": {
+        "kind": "script",
+        "url": f"https://unpkg.com/lucide@{LUCIDE_VERSION}/dist/umd/lucide.min.js",
+        "filename": "lucide.min.js",
+    },
+    "inter": {
+        "kind": "font-css",
+        "url": (
+            "https://fonts.googleapis.com/css2"
+            "?family=Inter:wght@300;400;500;600;700&display=swap"
+        ),
+        "filename": "inter.css",
+    },
+}
+
+# Google Fonts only serves woff2 to browsers it recognises
+_FONT_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+_FONT_FACE_RE = re.compile(r"/\*\s*([\w-]+)\s*\*/\s*(@font-face\s*\{[^}]*\})")
+_FONT_URL_RE = re.compile(r"url\((https://[^)]+\.woff2)\)")
+
+
+def fingerprint(data: bytes) -> str:
+    """Short content hash used in vendored filenames."""
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def integrity(data: bytes) -> str:
+    """Subresource Integrity value for the given content."""
+    return "sha384-" + base64.b64encode(hashlib.sha384(data).digest()).decode("ascii")
+
+
+def hashed_name(filename: str, data: bytes) -> str:
+    """Insert the content hash before the extension: ``chart.umd.<hash>.js``."""
+    stem, dot, ext = filename.rpartition(".")
+    return f"{stem}.{fingerprint(data)}{dot}{ext}"
+
+
+def _fetch(url: str) -> bytes:
+    """Download a URL (with a browser UA so Google Fonts serves woff2)."""
+    request = urllib.request.Request(url, headers={"User-Agent": _FONT_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def _write(directory: Path, filename: str, data: bytes) -> str:
+    name = hashed_name(filename, data)
+    (directory / name).write_bytes(data)
+    return name
+
+
+def _vendor_font_css(css: str, directory: Path, fetch) -> tuple:
+    """Download every woff2 referenced by a Google Fonts stylesheet.
+
+    Returns the rewritten CSS and a list of ``{"file", "subset"}`` entries,
+    one per vendored file (Inter's variable font serves several faces).
+    """
+    fonts = {}
+    subsets = {face: subset for subset, face in _FONT_FACE_RE.findall(css)}
+    downloaded = {}
+
+    def rewrite(match):
+        url = match.group(1)
+        if url not in downloaded:
+            data = fetch(url)
+            downloaded[url] = _write(directory, "inter.woff2", data)
+        return f"url({downloaded[url]})"
+
+    for face, subset in subsets.items():
+        new_face = _FONT_URL_RE.sub(rewrite, face)
+        css = css.replace(face, new_face)
+        for url in _FONT_URL_RE.findall(face):
+            fonts.setdefault(downloaded[url], {"file": downloaded[url], "subset": subset})
+
+    # Any faces without a subset comment
+    css = _FONT_URL_RE.sub(rewrite, css)
+    return css, list(fonts.values())
+
+
+def vendor_assets(static_dir, subdir="vendor", names=None, fetch=_fetch) -> dict:
+    """
+    Download pinned assets into ``<static_dir>/<subdir>`` with hashed filenames.
+
+    Args:
+        static_dir: Flask static folder
+        subdir: Folder inside static for vendored files
+        names: Asset keys from ``VENDOR_ASSETS`` (default: all)
+        fetch: Callable ``url -> bytes`` (injectable for offline use)
+
+    Returns:
+        Manifest dict, also written to ``<static_dir>/<subdir>/kd-ui-assets.json``
+    """
+    directory = Path(static_dir) / subdir
+    directory.mkdir(parents=True, exist_ok=True)
+
+    manifest = {"subdir": subdir, "assets": {}}
+    for name in names or VENDOR_ASSETS:
+        spec = VENDOR_ASSETS[name]
+        data = fetch(spec["url"])
+        entry = {"kind": spec["kind"], "source": spec["url"]}
+
+        if spec["kind"] == "font-css":
+            css, fonts = _vendor_font_css(data.decode("utf-8"), directory, fetch)
+            data = css.encode("utf-8")
+            entry["fonts"] = fonts
+
+        entry["file"] = _write(directory, spec["filename"], data)
+        entry["integrity"] = integrity(data)
+        manifest["assets"][name] = entry
+
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def load_manifest(path=None):
+    """
+    Load a vendored-asset manifest.
+
+    Args:
+        path: Manifest path (default: ``$KD_UI_ASSET_MANIFEST``)
+
+    Returns:
+        Manifest dict, or None when no manifest is configured or readable
+    """
+    path = path or os.environ.get(MANIFEST_ENV)
+    if not path:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _static_url(manifest, filename):
+    return f"{{{{ url_for('static', filename='{manifest['subdir']}/{filename}') }}}}"
+
+
+def head_tags(manifest, include=("inter", "chartjs", "lucide"), indent="    "):
+    """
+    Build ``<head>`` tags for vendored assets: preload hints first, then the
+    stylesheet/script tags with SRI attributes.
+
+    Args:
+        manifest: Manifest returned by ``vendor_assets``/``load_manifest``
+        include: Asset keys to emit, in order
+        indent: Line prefix for each tag
+
+    Returns:
+        HTML string
+    """
+    assets = manifest.get("assets", {})
+    preload, tags = [], []
+
+    for name in include:
+        entry = assets.get(name)
+        if entry is None:
+            continue
+        url = _static_url(manifest, entry["file"])
+
+        if entry["kind"] == "font-css":
+            for font in entry.get("fonts", []):
+                if font["subset"] == "latin":
+                    preload.append(
+                        f'<link rel="preload" href="{_static_url(manifest, font["file"])}" '
+                        f'as="font" type="font/woff2" crossorigin>'
+                    )
+            tags.append(
+                f'<link rel="stylesheet" href="{url}" integrity="{entry["integrity"]}" '
+                'crossorigin="anonymous">'
+            )
+        elif name == "chartjs":
+            # Loaded on demand by the charts runtime, so pages without a
+            # chart never download it: point the loader at the copy and its
+            # hash, which it sets as the integrity of the script it inserts
+            tags.append(
+                f'<script>window.KD_CHART_SRC = "{url}"; '
+                f'window.KD_CHART_INTEGRITY = "{entry["integrity"]}";</script>'
+            )
+        else:
+            # Deferred scripts run before DOMContentLoaded; Lucide does one
+            # createIcons() pass once loaded since inline calls ran too early
+            onload = ' onload="lucide.createIcons()"' if name == "lucide" else ""
+            preload.append(f'<link rel="preload" href="{url}" as="script" crossorigin="anonymous">')
+            tags.append(
+                f'<script defer src="{url}" integrity="{entry["integrity"]}" '
+                f'crossorigin="anonymous"{onload}></script>'
+            )
+
+    return "\n".join(indent + tag for tag in preload + tags)
@@ -0,0 +1,235 @@
+"""Fast stdio start-up: answer the MCP handshake before the SDK is loaded.
+
+Importing the ``mcp`` SDK (pydantic models, httpx, jsonschema) takes several
+hundred milliseconds, far longer than the server's own modules. Every agent
+session starts the stdio server fresh, so ``python -m kd_ui_server.server``
+starts here instead:
+
+1. A thread imports ``kd_ui_server.server`` (and with it the SDK) in the
+   background. Tool modules are only imported by the first call that needs
+   them (see ``server._generate``).
+2. Meanwhile ``initialize``, ``tools/list``, ``resources/list`` and ``ping``
+   are answered from ``kd_ui_server.catalog`` with the standard library only.
+   Anything else is held back.
+3. Once the import finishes, the stream is handed to the real server: the
+   handshake is replayed to it (its duplicate ``initialize`` response is
+   dropped), followed by the held requests and everything read afterwards.
+
+The protocol versions offered are read from the installed SDK's source (see
+``_sdk_protocol_versions``); if they can't be, the bootstrap is skipped. The
+SDK's own reply to the replayed ``initialize`` is compared with the one sent
+and a mismatch is reported on stderr.
+
+``KD_UI_FAST_START=0`` skips the bootstrap and starts the SDK server directly.
+"""
+
+import json
+import os
+import queue
+import re
+import sys
+import threading
+
+from .catalog import CAPABILITIES, RESOURCES, SERVER_NAME, TOOLS
+
+FAST_START_ENV = "KD_UI_FAST_START"
+
+# Request id of the replayed initialize, whose response the client must not see
+_REPLAY_ID = "kd-ui-bootstrap-initialize"
+
+_LOADED = object()
+
+
+def _sdk_version():
+    # Same serverInfo.version the SDK reports for an unversioned Server
+    try:
+        from importlib.metadata import version
+
+        return version("mcp")
+    except Exception:
+        return "unknown"
+
+
+def _sdk_protocol_versions():
+    """
+    ``(supported, latest)`` protocol versions of the installed SDK, or None.
+
+    Read from ``mcp/types.py`` and ``mcp/shared/version.py`` rather than
+    imported: importing ``mcp.types`` loads pydantic, the wait this module
+    exists to hide.
+    """
+    from importlib.util import find_spec
+    from pathlib import Path
+
+    try:
+        root = Path(find_spec("mcp").origin).parent
+        types_py = (root / "types.py").read_text(encoding="utf-8")
+        version_py = (root / "shared" / "version.py").read_text(encoding="utf-8")
+    except (AttributeError, OSError, TypeError, ValueError):
+        return None
+    latest = re.search(r'^LATEST_PROTOCOL_VERSION\s*=\s*"([^"]+)"', types_py, re.M)
+    listed = re.search(
+        r"^SUPPORTED_PROTOCOL_VERSIONS\b[^=]*=\s*[\[(]([^\])]*)[\])]", version_py, re.M
+    )
+    if latest is None or listed is None:
+        return None
+    supported = []
+    for item in filter(None, (part.strip() for part in listed.group(1).split(","))):
+        if item == "LATEST_PROTOCOL_VERSION":
+            supported.append(latest.group(1))
+        elif re.fullmatch(r'"[^"]+"', item):
+            supported.append(item[1:-1])
+        else:
+            return None
+    return tuple(supported), latest.group(1)
+
+
+def _read_stdin(lines):
+    for line in sys.stdin.buffer:
+        lines.put(line)
+    lines.put(None)
+
+
+def _load(lines, failure):
+    try:
+        from . import server  # noqa: F401
+    except BaseException as exc:
+        failure.append(exc)
+    lines.put(_LOADED)
+
+
+def _write(message):
+    sys.stdout.buffer.write(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+    sys.stdout.buffer.flush()
+
+
+def _fast_result(method, params, versions):
+    """Result for a request the bootstrap can answer, else None."""
+    if method == "initialize":
+        supported, latest = versions
+        requested = (params or {}).get("protocolVersion")
+        return {
+            # Same negotiation as the SDK's ServerSession
+            "protocolVersion": requested if requested in supported else latest,
+            "capabilities": CAPABILITIES,
+            "serverInfo": {"name": SERVER_NAME, "version": _sdk_version()},
+        }
+    if method == "tools/list":
+        return {"tools": TOOLS}
+    if method == "resources/list":
+        return {"resources": RESOURCES}
+    if method == "ping":
+        return {}
+    return None
+
+
+def run():
+    """Serve MCP over stdio, answering the handshake while the SDK loads."""
+    versions = None
+    if os.environ.get(FAST_START_ENV, "1").lower() not in ("0", "false", "no", "off"):
+        versions = _sdk_protocol_versions()
+    if versions is None:
+        import asyncio
+
+        from .server import main
+
+        asyncio.run(main())
+        return
+
+    lines, failure = queue.Queue(), []
+    threading.Thread(target=_read_stdin, args=(lines,), daemon=True).start()
+    threading.Thread(target=_load, args=(lines, failure), daemon=True).start()
+
+    replay, eof, sent = [], False, None
+    while True:
+        line = lines.get()
+        if line is _LOADED:
+            break
+        if line is None:
+            # stdin closed early: still answer what was sent, then stop
+            eof = True
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            replay.append(line)
+            continue
+
+        method = message.get("method")
+        result = _fast_result(method, message.get("params"), versions) if "id" in message else None
+        if result is None:
+            replay.append(line)
+            continue
+        _write({"jsonrpc": "2.0", "id": message["id"], "result": result})
+        if method == "initialize":
+            # The real session still needs its handshake
+            sent = result
+            replay.append(json.dumps(dict(message, id=_REPLAY_ID)).encode("utf-8"))
+    if failure:
+        raise failure[0]
+
+    import anyio
+
+    anyio.run(_serve, replay, None if eof else lines, sent)
+
+
+def _check_initialize(sent, actual):
+    """Report on stderr when the fast ``initialize`` reply differs from the SDK's."""
+    if sent is not None and actual != sent:
+        sys.stderr.write(
+            "kd-ui-server: fast-start initialize reply differs from the SDK's; "
+            f"sent {json.dumps(sent, sort_keys=True)}, "
+            f"SDK {json.dumps(actual, sort_keys=True)}; set {FAST_START_ENV}=0\n"
+        )
+        sys.stderr.flush()
+
+
+async def _serve(replay, lines, sent=None):
+    """Run the SDK server on the replayed handshake, then on the rest of stdin."""
+    from io import TextIOWrapper
+
+    import anyio
+    from mcp import types
+    from mcp.shared.message import SessionMessage
+
+    from .server import app
+
+    read_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_reader = anyio.create_memory_object_stream(0)
+    stdout = anyio.wrap_file(TextIOWrapper(sys.stdout.buffer, encoding="utf-8"))
+
+    async def parse(line):
+        try:
+            message = types.JSONRPCMessage.model_validate_json(line)
+        except Exception as exc:
+            await read_writer.send(exc)
+            return
+        await read_writer.send(SessionMessage(message))
+
+    async def reader():
+        async with read_writer:
+            for line in replay:
+                await parse(line)
+            while lines is not None:
+                line = await anyio.to_thread.run_sync(lines.get, abandon_on_cancel=True)
+                if line is None:
+                    break
+                await parse(line)
+
+    async def writer():
+        async with write_reader:
+            async for session_message in write_reader:
+                if getattr(session_message.message.root, "id", None) == _REPLAY_ID:
+                    result = session_message.message.model_dump(by_alias=True, exclude_none=True)
+                    _check_initialize(sent, result.get("result"))
+                    continue
+                text = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                await stdout.write(text + "\n")
+                await stdout.flush()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(reader)
+        tg.start_soon(writer)
+        await app.run(read_stream, write_stream, app.create_initialization_options())
@@ -0,0 +1,516 @@
+"""Tool and resource catalog served by ``list_tools`` and ``list_resources``.
+
+Plain data with no imports, so the stdio bootstrap (``kd_ui_server.bootstrap``)
+can answer ``initialize``, ``tools/list`` and ``resources/list`` while the
+``mcp`` SDK and the generators are still loading.
+"""
+
+SERVER_NAME = "kd-ui-server"
+
+# What app.create_initialization_options() reports for the handlers server.py
+# registers; tests/test_bootstrap.py and the bootstrap's replay check it
+# against the SDK
+CAPABILITIES = {
+    "experimental": {},
+    "resources": {"subscribe": True, "listChanged": False},
+    "tools": {"listChanged": False},
+}
+
+ADD_COMPONENT_TYPES = [
+    "stat_card", "alert", "notifications_feed", "badge", "button", "card",
+    "modal", "navbar", "sidebar", "navigation_menu", "nav_tree",
+    "breadcrumb", "tabs", "progress", "skeleton",
+    "typography", "dropdown_menu", "chart_container",
+    "theme_toggle", "hero", "features", "testimonials",
+    "pricing", "cta", "footer", "icon_sprite", "runtime"
+]
+
+RESOURCES = [
+    {
+        "uri": "template://components/stat_card",
+        "name": "Stat Card Component",
+        "mimeType": "text/html",
+        "description": "Reusable stat card template for displaying metrics"
+    },
+    {
+        "uri": "template://components/chart_container",
+        "name": "Chart Container Component",
+        "mimeType": "text/html",
+        "description": "Container for Chart.js charts with responsive sizing"
+    },
+    {
+        "uri": "template://components/sidebar",
+        "name": "Sidebar Navigation Component",
+        "mimeType": "text/html",
+        "description": "Responsive sidebar navigation menu"
+    },
+    {
+        "uri": "template://components/navbar",
+        "name": "Top Navigation Component",
+        "mimeType": "text/html",
+        "description": "Top navigation bar with logo and menu"
+    },
+    {
+        "uri": "template://layouts/base",
+        "name": "Base Layout Template",
+        "mimeType": "text/html",
+        "description": "Base Flask template with DaisyUI setup"
+    },
+    {
+        "uri": "config://design-system",
+        "name": "Design System Configuration",
+        "mimeType": "application/json",
+        "description": "Color palette, typography, spacing, and component styles"
+    },
+    {
+        "uri": "docs://best-practices",
+        "name": "UI Best Practices Guide",
+        "mimeType": "text/markdown",
+        "description": "Guidelines for creating beautiful, accessible dashboards"
+    },
+    {
+        "uri": "docs://uiux-design-rules",
+        "name": "UI/UX Design Rules & Standards",
+        "mimeType": "text/markdown",
+        "description": (
+            "Comprehensive UI/UX design rules, constraints, and anti-patterns from expert sources"
+        )
+    },
+    {
+        "uri": "docs://dashboard-architecture",
+        "name": "Dashboard Architecture Guide",
+        "mimeType": "text/markdown",
+        "description": "Navigation models, information density, and layout logic for dashboards"
+    },
+    {
+        "uri": "docs://visual-style-system",
+        "name": "Visual Style System",
+        "mimeType": "text/markdown",
+        "description": "Typography, spacing, color, and visual polish guidelines"
+    },
+    {
+        "uri": "docs://anti-patterns",
+        "name": "UI Anti-Patterns to Avoid",
+        "mimeType": "text/markdown",
+        "description": "Common UI/UX mistakes and how to avoid them"
+    },
+    {
+        "uri": "metrics://server",
+        "name": "Server Metrics",
+        "mimeType": "application/json",
+        "description": "Per-tool latency percentiles, output sizes, error counts and cache hits"
+    }
+]
+
+# Static resources: built once, then served from the cache
+RESOURCE_URIS = [resource["uri"] for resource in RESOURCES if resource["uri"] != "metrics://server"]
+
+TOOLS = [
+    dict(
+        name="create_dashboard",
+        description="""Create a complete Flask dashboard template with DaisyUI components.
+        
+        This tool generates a responsive dashboard layout with:
+        - Sidebar navigation or top navigation
+        - Stats cards for key metrics
+        - Chart containers
+        - Data tables
+        - Responsive grid layout
+        
+        Perfect for: Admin dashboards, analytics pages, data visualization pages
+        
+        Parameters:
+        - layout: "sidebar" (default) or "topnav" - Navigation style
+        - title: Dashboard title (default: "Dashboard")
+        - theme: "light" (default), "dark", or "auto" - Color theme
+        - components: List of components to include: ["stats", "charts", "table", "filters"]
+        - icon_mode: "inline" (default) or "sprite" - Emit one SVG sprite plus <use> references
+        - prerender_icons: true/false - Resolve Lucide icons to SVG at generation time
+          (no client-side createIcons scan)
+        - demo_data: true/false - Show sample stats, orders and charts when the view passes none
+          (default: false)
+        - compact: true/false - Minify the template
+        - max_output_tokens: Token budget; output over it is regenerated in compact mode
+        
+        Returns: Complete Jinja2 template ready for Flask
+        """,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "layout": {
+                    "type": "string",
+                    "enum": ["sidebar", "topnav"],
+                    "default": "sidebar",
+                    "description": "Navigation layout style"
+                },
+                "title": {
+                    "type": "string",
+                    "default": "Dashboard",
+                    "description": "Dashboard page title"
+                },
+                "theme": {
+                    "type": "string",
+                    "enum": ["light", "dark", "auto"],
+                    "default": "light",
+                    "description": "Color theme"
+                },
+                "components": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": ["stats", "charts", "table", "filters"]
+                    },
+                    "default": ["stats", "charts"],
+                    "description": "Components to include in dashboard"
+                },
+                "icon_mode": {
+                    "type": "string",
+                    "enum": ["inline", "sprite"],
+                    "default": "inline",
+                    "description": (
+                        "Inline SVG icons or a shared <symbol> sprite with <use> references"
+                    )
+                },
+                "prerender_icons": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Render Lucide icons from the vendored set at generation time"
+                },
+                "demo_data": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": (
+                        "Embed sample data (kd_ui_server.fixtures) shown when the view passes "
+                        "no stats, transactions or chart data"
+                    )
+                }
+            }
+        }
+    ),
+    dict(
+        name="create_form",
+        description="""Create a beautiful form template with validation and DaisyUI styling.
+        
+        This tool generates forms with:
+        - Input fields with proper labels and validation
+        - Select dropdowns, checkboxes, radio buttons
+        - File upload components
+        - Submit and cancel buttons
+        - Error message displays
+        - Responsive layout
+        
+        Perfect for: Login forms, registration, data entry, settings pages
+        
+        Parameters:
+        - form_type: "login", "register", "contact", "settings", or "custom"
+        - fields: List of field configurations
+        - method: "POST" (default) or "GET"
+        - action: Form submission URL
+        - inline: true/false - Display fields inline or stacked
+        
+        Returns: Form template with proper Flask-WTF integration
+        """,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "form_type": {
+                    "type": "string",
+                    "enum": ["login", "register", "contact", "settings", "custom"],
+                    "default": "custom",
+                    "description": "Predefined form type or custom"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string"},
+                            "type": {
+                                "type": "string",
+                                "enum": ["text", "email", "password", "number", "textarea",
+                                         "select", "checkbox", "radio", "file"]
+                            },
+                            "label": {"type": "string"},
+                            "placeholder": {"type": "string"},
+                            "required": {"type": "boolean", "default": False},
+                            "options": {"type": "array", "items": {"type": "string"}}
+                        },
+                        "required": ["name", "type", "label"]
+                    },
+                    "description": "Form field configurations"
+                },
+                "method": {
+                    "type": "string",
+                    "enum": ["POST", "GET"],
+                    "default": "POST"
+                },
+                "action": {
+                    "type": "string",
+                    "default": "",
+                    "description": "Form submission URL"
+                },
+                "inline": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Display fields inline"
+                }
+            },
+            "required": ["fields"]
+        }
+    ),
+    dict(
+        name="create_table",
+        description="""Create a data table with sorting, filtering, and pagination.
+        
+        This tool generates tables with:
+        - Sortable columns
+        - Search/filter functionality
+        - Pagination controls
+        - Row actions (edit, delete, view)
+        - Responsive design (cards on mobile)
+        - Loading states
+        
+        Perfect for: User lists, product catalogs, transaction history, any data display
+        
+        Parameters:
+        - columns: List of column definitions (name, label, sortable, type)
+        - features: ["search", "sort", "pagination", "actions"]
+        - rows_per_page: Number of rows per page (default: 10)
+        - striped: Alternating row colors (default: true)
+        - hoverable: Highlight row on hover (default: true)
+        - icon_mode: "inline" (default) or "sprite" - Requires the icon_sprite component on the page
+        
+        Returns: Table template with JavaScript for interactivity
+        """,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "columns": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string"},
+                            "label": {"type": "string"},
+                            "sortable": {"type": "boolean", "default": True},
+                            "type": {
+                                "type": "string",
+                                "enum": ["text", "number", "date", "badge", "avatar"],
+                                "default": "text"
+                            }
+                        },
+                        "required": ["name", "label"]
+                    },
+                    "description": "Table column definitions"
+                },
+                "features": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": ["search", "sort", "pagination", "actions"]
+                    },
+                    "default": ["search", "sort", "pagination"],
+                    "description": "Table features to enable"
+                },
+                "rows_per_page": {
+                    "type": "integer",
+                    "default": 10,
+                    "description": "Rows per page for pagination"
+                },
+                "striped": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Alternating row colors"
+                },
+                "hoverable": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Highlight row on hover"
+                },
+                "icon_mode": {
+                    "type": "string",
+                    "enum": ["inline", "sprite"],
+                    "default": "inline",
+                    "description": (
+                        "Inline SVG icons or <use> references into the page's icon sprite"
+                    )
+                }
+            },
+            "required": ["columns"]
+        }
+    ),
+    dict(
+        name="add_component",
+        description="""Add individual UI components to your Flask templates.
+
+        Available components:
+        - stat_card: Metric display card with value, title, and trend
+        - alert: Toast flash notification (fixed overlay, auto-dismisses). Supports type, duration,
+          position, dismissable (shown by the shared toasts runtime: bounded queue, identical
+          messages coalesced)
+        - notifications_feed: Live toasts from a Server-Sent Events endpoint (config: url, topics,
+          position); serve it with kd_ui_server.flask_ext.sse_response and an in-process EventBus
+        - badge: Status indicators and labels
+        - button: Various button styles (primary, secondary, ghost, etc.)
+        - card: Content container with optional header and footer
+        - modal: Dialog/popup overlay (url loads the body on first open, with a skeleton;
+          preload: true fetches it on trigger hover)
+        - navbar: Top navigation bar
+        - sidebar: Side navigation menu (collapsed state and open submenus persist across pages
+          via a kd_sidebar_<id> cookie, restored before first paint; keep config.id stable)
+        - navigation_menu: Navigation menu component
+        - nav_tree: Navigation tree of any depth from a flat list (config.nodes: id, parent_id,
+          label, url, icon, permission); config.permissions prunes nodes, collapsed branches load
+          on first expand
+        - breadcrumb: Navigation breadcrumb trail
+        - tabs: Tabbed content sections (lazy: true defers inactive panels until first opened;
+          a tab with url loads its panel as an HTML fragment)
+        - progress: Progress bars and loading indicators
+        - skeleton: Loading skeleton placeholders
+        - typography: Typography and text components
+        - dropdown_menu: Dropdown menu with items, icons, separators, and variants
+        - chart_container: Container for Chart.js charts (Chart.js lazy-loads; charts initialise
+          when scrolled into view).
+          Config: type, labels, datasets, or data_source ({"variable": "sales_chart"} for a Jinja
+          variable, {"url": "/api/sales"} for a JSON endpoint) with optional fallback data;
+          demo_data: true embeds sample labels/datasets instead of an empty chart
+        - theme_toggle: Light/dark theme toggle button
+        - icon_sprite: Hidden SVG sprite for components generated with icon_mode "sprite"
+          (include once per page)
+        - runtime: Shared client runtime scripts (config.modules); include once per page and pass
+          include_runtime: false to the individual components
+
+        Landing page sections:
+        - hero: Hero/banner section
+        - features: Features showcase section
+        - testimonials: Testimonials/reviews section
+        - pricing: Pricing plans section
+        - cta: Call-to-action section
+        - footer: Page footer section
+
+        Parameters:
+        - component_type: Type of component to generate
+        - config: Component-specific configuration
+          (stat_card and alert accept icon_mode: "inline" or "sprite";
+           every component accepts prerender_icons: true to resolve Lucide icons
+           at generation time instead of calling lucide.createIcons() in the browser;
+           navbar, sidebar and navigation_menu accept active_mode: "route" to highlight
+           the item matching request.path at render time instead of active flags, or
+           "overlay" for page-independent, cacheable markup that is highlighted in the
+           browser from <body data-active-path>)
+
+        Returns: Component template snippet
+        """,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "component_type": {
+                    "type": "string",
+                    "enum": ADD_COMPONENT_TYPES,
+                    "description": "Type of component to generate"
+                },
+                "config": {
+                    "type": "object",
+                    "description": "Component-specific configuration",
+                    "additionalProperties": True
+                }
+            },
+            "required": ["component_type"]
+        }
+    ),
+    dict(
+        name="compose_page",
+        description="""Compose a complete page from an ordered list of sections.
+
+        Each section is an add_component call ({"component": "hero", "config": {...}}) or
+        ready-made markup ({"html": "..."}, e.g. from create_table). Shared assets are
+        emitted exactly once per page:
+        - Runtime scripts de-duplicated by module and deferred to the end of the body
+        - Repeated inline scripts and styles collapsed; styles inlined in <head> as critical CSS
+        - One icon sprite with exactly the icons the page uses (icon_mode "sprite")
+
+        Perfect for: Landing pages, settings pages, any page built from several components
+
+        Parameters:
+        - sections: Ordered list of sections
+        - layout: "standalone" (complete HTML document) or "base" (Jinja template extending
+          base.html)
+        - title: Page title
+        - theme: DaisyUI theme for the standalone document
+        - icon_mode: Default icon mode for every section
+        - prerender_icons: Default for every section
+        - critical_css: Extra CSS to inline in <head>
+
+        Returns: Complete page
+        """,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sections": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "component": {"type": "string"},
+                            "config": {"type": "object", "additionalProperties": True},
+                            "html": {"type": "string"}
+                        }
+                    },
+                    "description": "Page sections, in order"
+                },
+                "layout": {
+                    "type": "string",
+                    "enum": ["standalone", "base"],
+                    "default": "standalone",
+                    "description": "Complete document or base.html child template"
+                },
+                "title": {
+                    "type": "string",
+                    "default": "Page",
+                    "description": "Page title"
+                },
+                "theme": {
+                    "type": "string",
+                    "enum": ["light", "dark"],
+                    "default": "light",
+                    "description": "Color theme"
+                },
+                "icon_mode": {
+                    "type": "string",
+                    "enum": ["inline", "sprite"],
+                    "default": "inline",
+                    "description": "Default icon mode for every section"
+                },
+                "prerender_icons": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Render Lucide icons from the vendored set at generation time"
+                },
+                "critical_css": {
+                    "type": "string",
+                    "default": "",
+                    "description": "Extra CSS inlined in <head>"
+                }
+            },
+            "required": ["sections"]
+        }
+    )
+]
+
+# Meta-arguments accepted by every tool (see compact)
+OUTPUT_OPTIONS = {
+    "compact": {
+        "type": "boolean",
+        "default": False,
+        "description": "Minify the output: no comments or indentation, repeated inline styles "
+                       "as classes, short IDs (and no demo_data)"
+    },
+    "max_output_tokens": {
+        "type": "integer",
+        "minimum": 1,
+        "description": "Estimated-token budget; larger output is regenerated in compact mode. "
+                       "The response ends with the estimated tokens per fragment"
+    },
+}
+for _tool in TOOLS:
+    _tool["inputSchema"]["properties"].update(OUTPUT_OPTIONS)
@@ -0,0 +1,63 @@
+"""kd-ui-assets: vendor Chart.js, Lucide and Inter into a Flask static folder."""
+
+import sys
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from ..assets import MANIFEST_ENV, MANIFEST_NAME, VENDOR_ASSETS, vendor_assets
+from ..resources import component_templates
+
+console = Console()
+
+
+@click.command()
+@click.option("--static-dir", required=True, type=click.Path(file_okay=False, path_type=Path),
+              help="Flask static folder (e.g. app/static)")
+@click.option("--subdir", default="vendor", show_default=True,
+              help="Folder inside the static folder for vendored files")
+@click.option("--templates-dir", type=click.Path(file_okay=False, path_type=Path),
+              help="Also write base.html referencing the local copies into this folder")
+@click.option("--only", "names", multiple=True, type=click.Choice(sorted(VENDOR_ASSETS)),
+              help="Vendor only these assets (repeatable)")
+def cli(static_dir, subdir, templates_dir, names):
+    """Download pinned assets with content-hashed filenames and SRI hashes."""
+    try:
+        manifest = vendor_assets(static_dir, subdir=subdir, names=list(names) or None)
+    except OSError as e:
+        console.print(f"❌ Download failed: {e}", style="red")
+        sys.exit(1)
+
+    table = Table(title="Vendored assets")
+    table.add_column("Asset")
+    table.add_column("File")
+    table.add_column("Integrity", overflow="fold")
+    for name, entry in manifest["assets"].items():
+        table.add_row(name, f"{subdir}/{entry['file']}", entry["integrity"])
+        for font in entry.get("fonts", []):
+            table.add_row("", f"{subdir}/{font['file']} ({font['subset']})", "")
+    console.print(table)
+
+    manifest_path = (static_dir / subdir / MANIFEST_NAME).resolve()
+    console.print(f"✓ Manifest written: [dim]{manifest_path}[/dim]", style="green")
+
+    if templates_dir:
+        templates_dir.mkdir(parents=True, exist_ok=True)
+        base_path = templates_dir / "base.html"
+        base_path.write_text(component_templates._get_base_layout(manifest), encoding="utf-8")
+        console.print(f"✓ Base layout written: [dim]{base_path}[/dim]", style="green")
+
+    console.print()
+    console.print("💡 To serve the local copies from the MCP server's base layout resource:")
+    console.print(f"   export {MANIFEST_ENV}={manifest_path}")
+
+
+def main():
+    """Entry point for kd-ui-assets."""
+    cli()
+
+
+if __name__ == "__main__":
+    main()
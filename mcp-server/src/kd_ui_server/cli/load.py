@@ -0,0 +1,84 @@
+"""kd-ui-load: replay recorded MCP traffic against a spawned stdio server."""
+
+import asyncio
+import json
+import shlex
+import sys
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from ..loadtest import DEFAULT_SERVER_CMD, load_recording, replay
+
+console = Console()
+
+
+def _mb(value):
+    return "-" if value is None else f"{value / 2**20:.1f} MB"
+
+
+@click.command()
+@click.argument("recording", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--concurrency", "-c", default=1, show_default=True, help="Requests in flight")
+@click.option("--rate", "-r", type=float, help="Target requests per second (default: unthrottled)")
+@click.option("--requests", "-n", "total", type=int,
+              help="Requests to send (default: one pass over the recording)")
+@click.option("--duration", "-d", type=float, help="Send for this many seconds instead")
+@click.option("--warmup", type=int,
+              help="Unmeasured requests sent first (default: one per distinct tool/resource)")
+@click.option("--server-cmd", help="Command that starts the stdio server "
+              f"(default: {' '.join(DEFAULT_SERVER_CMD[1:])})")
+@click.option("--json", "as_json", is_flag=True, help="Print the report as JSON")
+def cli(recording, concurrency, rate, total, duration, warmup, server_cmd, as_json):
+    """Replay a recording made with KD_UI_RECORD=<file> and report latency and throughput."""
+    requests = load_recording(recording)
+    if not requests:
+        console.print(f"❌ No tools/call or resources/read requests in {recording}", style="red")
+        sys.exit(1)
+
+    cmd = shlex.split(server_cmd) if server_cmd else DEFAULT_SERVER_CMD
+    report = asyncio.run(replay(
+        requests, total=total, duration=duration, concurrency=concurrency, rate=rate,
+        server_cmd=cmd, warmup=warmup,
+    ))
+
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+        return
+
+    latency = report["latency_ms"]
+    rss = report["rss_bytes"]
+    console.print(
+        f"[bold]{report['requests']}[/bold] requests in {report['elapsed_s']:.2f} s "
+        f"→ [bold]{report['throughput_rps']:.1f} req/s[/bold] "
+        f"(concurrency {concurrency}{f', target {rate:g}/s' if rate else ''}), "
+        f"{report['errors']} errors, after {report['warmup']} warm-up requests"
+    )
+    console.print(
+        f"Latency p50 {latency['p50']} ms · p95 {latency['p95']} ms · "
+        f"p99 {latency['p99']} ms · max {latency['max']} ms"
+    )
+    console.print(
+        f"Server startup {1000 * report['startup_s']:.0f} ms · RSS {_mb(rss['start'])} → "
+        f"peak {_mb(rss['peak'])} → {_mb(rss['end'])}"
+    )
+
+    table = Table(title="By tool / resource")
+    table.add_column("Request")
+    table.add_column("Count", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    for key, stats in report["by_request"].items():
+        table.add_row(key, str(stats["count"]), str(stats["p50_ms"]), str(stats["p95_ms"]))
+    console.print(table)
+
+
+def main():
+    """Entry point for kd-ui-load."""
+    cli()
+
+
+if __name__ == "__main__":
+    main()
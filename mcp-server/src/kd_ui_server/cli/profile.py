@@ -0,0 +1,65 @@
+"""kd-ui-profile: replay a tool call under the stack profiler."""
+
+import sys
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from ..profiling import load_request, profile_call
+
+console = Console()
+
+
+@click.command()
+@click.argument("request", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--index", default=0, show_default=True,
+              help="Which tools/call to replay from a JSON Lines recording")
+@click.option("--repeat", default=20, show_default=True,
+              help="Calls aggregated into the profile (steadies sub-millisecond timings)")
+@click.option("--output", "-o", type=click.Path(dir_okay=False, path_type=Path),
+              help="Collapsed-stack output (default: the request path with a .folded suffix)")
+@click.option("--top", default=15, show_default=True, help="Frames listed by self time")
+def cli(request, index, repeat, output, top):
+    """Profile a saved request (.request.json), JSON-RPC message or recording."""
+    # Imported here so --help stays fast
+    from ..server import _generate
+
+    try:
+        name, arguments = load_request(request, index)
+    except (OSError, ValueError) as e:
+        console.print(f"❌ Cannot load request: {e}", style="red")
+        sys.exit(1)
+    arguments = {key: value for key, value in arguments.items() if key != "profile"}
+
+    # One warm-up call so imports and first-use caches are not profiled
+    _generate(name, arguments)
+    template, profiler = profile_call(_generate, name, arguments, repeat=repeat)
+
+    output = output or request.with_suffix(".folded")
+    output.write_text(profiler.collapsed(), encoding="utf-8")
+
+    label = name + (f" ({arguments['component_type']})" if arguments.get("component_type") else "")
+    table = Table(title=f"{label}: {profiler.total_ns / 1e6 / repeat:.3f} ms per call, "
+                        f"{len(template):,} chars")
+    table.add_column("Self ms / call", justify="right")
+    table.add_column("%", justify="right")
+    table.add_column("Frame", overflow="fold")
+    total = profiler.total_ns or 1
+    for frame, ns in profiler.top(top):
+        table.add_row(f"{ns / 1e6 / repeat:.4f}", f"{100 * ns / total:.1f}", frame)
+    console.print(table)
+    console.print(f"✓ Collapsed stacks written: [dim]{output}[/dim]", style="green")
+    console.print(
+        "💡 Render with flamegraph.pl, inferno-flamegraph or https://www.speedscope.app"
+    )
+
+
+def main():
+    """Entry point for kd-ui-profile."""
+    cli()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""kd-ui-server: run the MCP server over stdio or streamable HTTP."""
+
+import asyncio
+
+import click
+
+from ..http_server import DEFAULT_HOST, DEFAULT_PORT
+
+
+@click.command()
+@click.option("--transport", type=click.Choice(["stdio", "http"]), default="stdio",
+              show_default=True,
+              help="stdio for one agent per process, http for one shared server")
+@click.option("--host", default=DEFAULT_HOST, show_default=True, help="HTTP bind address")
+@click.option("--port", default=DEFAULT_PORT, show_default=True, help="HTTP bind port")
+@click.option("--workers", default=1, show_default=True,
+              help="HTTP worker processes (more than one implies --stateless)")
+@click.option("--limit-concurrency", type=int,
+              help="Maximum concurrent connections per worker before answering 503")
+@click.option("--max-sessions", type=int, help="Maximum concurrent MCP sessions")
+@click.option("--backlog", default=2048, show_default=True, help="Pending-connection queue size")
+@click.option("--stateless", is_flag=True, help="Do not track sessions; every request stands alone")
+@click.option("--json-response", is_flag=True, help="Plain JSON responses instead of SSE streams")
+@click.option("--pool", default=0, show_default=True,
+              help="Generator worker processes behind one front end (0: generate in-process)")
+@click.option("--no-warm", is_flag=True, help="Skip generating every tool once at startup")
+@click.option("--log-level", default="info", show_default=True)
+def cli(transport, host, port, workers, limit_concurrency, max_sessions, backlog, stateless,
+        json_response, pool, no_warm, log_level):
+    """Run the KD UI MCP server."""
+    if workers > 1 and pool:
+        raise click.UsageError("--workers and --pool are alternatives; pick one")
+
+    if transport == "stdio":
+        if not pool:
+            from ..bootstrap import run as run_stdio
+
+            run_stdio()
+            return
+
+        from ..server import main as stdio_main
+        from ..workers import start_pool
+
+        # Fork before the event loop starts
+        workers_pool = start_pool(pool)
+        try:
+            asyncio.run(stdio_main())
+        finally:
+            workers_pool.shutdown()
+        return
+
+    from ..http_server import run
+
+    run(host=host, port=port, workers=workers, limit_concurrency=limit_concurrency,
+        max_sessions=max_sessions, backlog=backlog, stateless=stateless,
+        json_response=json_response, warm=not no_warm, pool=pool, log_level=log_level)
+
+
+def main():
+    """Entry point for kd-ui-server."""
+    cli()
+
+
+if __name__ == "__main__":
+    main()
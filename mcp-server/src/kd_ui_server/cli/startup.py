@@ -0,0 +1,78 @@
+"""kd-ui-startup: measure stdio server cold start and audit import time."""
+
+import asyncio
+import json
+import shlex
+import statistics
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from ..loadtest import DEFAULT_SERVER_CMD, import_times, measure_startup
+
+console = Console()
+
+# Statements audited with -X importtime: the bootstrap that answers the
+# handshake, and the full server it hands over to
+AUDITED = (
+    ("bootstrap", "import kd_ui_server.bootstrap"),
+    ("server", "import kd_ui_server.server"),
+)
+
+
+@click.command()
+@click.option("--runs", "-n", default=5, show_default=True, help="Cold starts to measure")
+@click.option("--top", default=15, show_default=True, help="Slowest imports to list")
+@click.option("--server-cmd", help="Command that starts the stdio server "
+              f"(default: {' '.join(DEFAULT_SERVER_CMD[1:])})")
+@click.option("--json", "as_json", is_flag=True, help="Print the report as JSON")
+def cli(runs, top, server_cmd, as_json):
+    """Time a fresh server to its first responses and list the slowest imports."""
+    cmd = shlex.split(server_cmd) if server_cmd else DEFAULT_SERVER_CMD
+    samples = [asyncio.run(measure_startup(cmd)) for _ in range(runs)]
+    startup = {
+        key: round(1000 * statistics.median(s[key] for s in samples), 1) for key in samples[0]
+    }
+
+    imports = {}
+    for label, statement in AUDITED:
+        modules = import_times(statement)
+        imports[label] = {
+            "total_ms": round(sum(m["self_us"] for m in modules) / 1000, 1),
+            "kd_ui_server_ms": round(sum(m["self_us"] for m in modules
+                                         if m["module"].startswith("kd_ui_server")) / 1000, 1),
+            "slowest": sorted(modules, key=lambda m: m["cumulative_us"], reverse=True)[:top],
+        }
+
+    if as_json:
+        click.echo(json.dumps({"runs": runs, "startup_ms": startup, "imports": imports}, indent=2))
+        return
+
+    console.print(
+        f"Cold start (median of {runs}): initialize [bold]{startup['initialize_s']} ms[/bold] · "
+        f"tools/list {startup['tools_list_s']} ms · first tools/call {startup['first_call_s']} ms"
+    )
+    for label, report in imports.items():
+        console.print(
+            f"\n[bold]{label}[/bold]: {report['total_ms']} ms of imports, "
+            f"{report['kd_ui_server_ms']} ms in kd_ui_server"
+        )
+        table = Table()
+        table.add_column("Module")
+        table.add_column("Self ms", justify="right")
+        table.add_column("Cumulative ms", justify="right")
+        for module in report["slowest"]:
+            table.add_row("  " * module["depth"] + module["module"],
+                          f"{module['self_us'] / 1000:.1f}",
+                          f"{module['cumulative_us'] / 1000:.1f}")
+        console.print(table)
+
+
+def main():
+    """Entry point for kd-ui-startup."""
+    cli()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Token-aware compaction of generated templates.
+
+Generated templates go straight into an LLM context window, where size is
+counted in tokens. ``compact_html`` rewrites a fragment without changing
+what it renders:
+
+- HTML and Jinja comments are removed, and so are indentation and blank
+  lines (``<script>``, ``<style>``, ``<pre>`` and ``<textarea>`` are kept
+  verbatim)
+- inline ``style`` attributes used more than once are collapsed into one
+  generated class each, defined in a ``<style>`` block
+- long element IDs become short ones derived from a hash of the original
+  name, so a given name maps to the same short ID in every fragment and
+  every call; an ID that extends another one (``x-body`` for ``x``) keeps
+  its suffix on the short base, so scripts that build IDs by concatenation
+  still find their elements. Only ID references are rewritten: ``id``,
+  ``for``, the ARIA ID-reference attributes, ``href="#..."``,
+  ``data-*-target``, ``data-kd-chart``, ``#id`` selectors in scripts and
+  styles, and script string literals equal to an ID. Text, links and form
+  values that happen to spell an ID are left alone
+
+``estimate_tokens`` is a tokenizer-free approximation (words, punctuation
+and line breaks) that is good enough to budget with; ``fragment_report``
+applies it per output chunk and ``compact_chunks`` compacts a
+chunked output as a whole.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+
+# Contents kept verbatim
+_PROTECTED_RE = re.compile(r"<(script|style|pre|textarea)\b.*?</\1\s*>", re.S | re.I)
+_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->|\{#.*?#\}", re.S)
+_INDENT_RE = re.compile(r"\n[ \t\n]*")
+_TAG_RE = re.compile(r"<[a-zA-Z][^<>]*>")
+_STYLE_ATTR_RE = re.compile(r'\sstyle="([^"{}]*)"')
+_CLASS_ATTR_RE = re.compile(r'\sclass="([^"]*)"')
+_ID_RE = re.compile(r'(?<![\w-])id="([A-Za-z][\w-]{9,})"')
+_SCRIPT_RE = re.compile(r"<script\b.*?</script\s*>", re.S | re.I)
+_LITERAL_RE = re.compile(r"""['"]([A-Za-z][\w-]{9,})['"]""")
+_ID_REF_ATTR_RE = re.compile(
+    r'(\s(?:id|for|aria-(?:activedescendant|controls|describedby|details|errormessage|flowto'
+    r'|labelledby|owns)|data-(?:[\w-]+-)?target|data-kd-chart)="|\shref="#)([^"{}]*)"'
+)
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]|\n[ \t]*")
+_LABEL_COMMENT_RE = re.compile(r"<!--\s*(?!\[if)(.*?)\s*-->", re.S)
+_LABEL_NAME_RE = re.compile(r'\sname="(?!csrf_token)([^"{}]+)"')
+_LABEL_TAG_RE = re.compile(r"<([a-zA-Z][\w-]*)")
+
+
+def estimate_tokens(text):
+    """
+    Approximate the number of LLM tokens in ``text``.
+
+    Counts one token per punctuation character and per line break (with its
+    indentation), and one per six characters of each word.
+
+    Returns:
+        int
+    """
+    return sum(1 if not piece[0].isalnum() and piece[0] != "_" else (len(piece) + 5) // 6
+               for piece in _TOKEN_RE.findall(text))
+
+
+def _short(prefix, value):
+    return prefix + hashlib.sha1(value.encode("utf-8")).hexdigest()[:6]
+
+
+@lru_cache(maxsize=1)
+def _reserved_ids():
+    """Names the runtime scripts refer to literally; never renamed."""
+    from .runtime import RUNTIME_MODULES, sidebar_state_script
+
+    sources = "".join(RUNTIME_MODULES.values()) + sidebar_state_script()
+    return frozenset(re.findall(r"[\w-]{10,}", sources))
+
+
+def _declarations(style):
+    return ";".join(part.strip() for part in style.split(";") if part.strip())
+
+
+def _outside_protected(html, fn):
+    """Apply ``fn`` to the parts of ``html`` outside protected elements."""
+    out, last = [], 0
+    for match in _PROTECTED_RE.finditer(html):
+        out.append(fn(html[last:match.start()]))
+        out.append(match.group(0))
+        last = match.end()
+    out.append(fn(html[last:]))
+    return "".join(out)
+
+
+def _squeeze(text):
+    text = _COMMENT_RE.sub("", text)
+    return _INDENT_RE.sub("\n", text)
+
+
+def _style_of(tag):
+    match = _STYLE_ATTR_RE.search(tag)
+    return (match, _declarations(match.group(1))) if match else (None, "")
+
+
+def _with_class(tag, style, name):
+    """``tag`` without its ``style`` attribute and with class ``name`` added."""
+    tag = tag[:style.start()] + tag[style.end():]
+    if _CLASS_ATTR_RE.search(tag):
+        return _CLASS_ATTR_RE.sub(lambda m: f' class="{m.group(1)} {name}"', tag, count=1)
+    closing = " />" if tag.endswith("/>") else ">"
+    return tag[:-len(closing.strip())].rstrip() + f' class="{name}"' + closing
+
+
+def compact_chunks(chunks):
+    """
+    Compact the ordered chunks of one output.
+
+    Styles and IDs are collapsed across all chunks, so a style repeated once
+    per form field still becomes a single class.
+
+    Args:
+        chunks: Output chunks, in order
+
+    Returns:
+        List of compacted chunks, same length as ``chunks``
+    """
+    chunks = [_outside_protected(chunk, _squeeze) for chunk in chunks]
+
+    counts = {}
+
+    def count(text):
+        for tag in _TAG_RE.findall(text):
+            decl = _style_of(tag)[1]
+            if decl:
+                counts[decl] = counts.get(decl, 0) + 1
+        return text
+
+    for chunk in chunks:
+        _outside_protected(chunk, count)
+    shared = {decl: _short("k", decl) for decl, n in counts.items() if n > 1}
+
+    def rewrite(match):
+        style, decl = _style_of(match.group(0))
+        if decl not in shared:
+            return match.group(0)
+        return _with_class(match.group(0), style, shared[decl])
+
+    if shared:
+        chunks = [_outside_protected(chunk, lambda text: _TAG_RE.sub(rewrite, text))
+                  for chunk in chunks]
+
+    ids = _short_ids(chunks)
+    if ids:
+        chunks = _rewrite_ids(chunks, ids)
+
+    if shared:
+        # Doubled class: outranks component classes and their :hover rules,
+        # as the inline style did
+        rules = "".join(f".{name}.{name}{{{decl}}}" for decl, name in shared.items())
+        _insert_style(chunks, f"<style>{rules}</style>")
+    return chunks
+
+
+def _short_ids(chunks):
+    """Map each long element ID in ``chunks`` to its short replacement."""
+    reserved = _reserved_ids()
+    names = {name for chunk in chunks for name in _ID_RE.findall(chunk)
+             if name not in reserved and not name.startswith("kd-i-")}
+    # Script literals other IDs extend, e.g. ``var tid = 'kd-tbl-1a2b'`` with
+    # ``tid + '-body'``, are bases too
+    literals = {literal for chunk in chunks for script in _SCRIPT_RE.findall(chunk)
+                for literal in _LITERAL_RE.findall(script) if literal not in reserved}
+    names |= {literal for literal in literals
+              if any(name.startswith(literal + "-") for name in names)}
+
+    ids = {}
+    for name in sorted(names, key=len):
+        base = max((other for other in ids if name.startswith(other + "-")), key=len, default=None)
+        ids[name] = ids[base] + name[len(base):] if base else _short("k", name)
+    return ids
+
+
+def _rewrite_ids(chunks, ids):
+    """Replace the ID references in ``chunks`` (see the module docstring) using ``ids``."""
+    names = "|".join(map(re.escape, sorted(ids, key=len, reverse=True)))
+    selector = re.compile(r"#(" + names + r")(?![\w-])")
+    literal = re.compile(r"""(['"])(""" + names + r")\1")
+
+    def value(match):
+        token = match.group(0)
+        name = token.lstrip("#")
+        return token[:len(token) - len(name)] + ids[name] if name in ids else token
+
+    def attributes(tag):
+        return _ID_REF_ATTR_RE.sub(
+            lambda m: m.group(1) + re.sub(r"\S+", value, m.group(2)) + '"', tag
+        )
+
+    def outside(text):
+        return _TAG_RE.sub(lambda m: attributes(m.group(0)), text)
+
+    def protected(match):
+        block = match.group(0)
+        end = block.index(">") + 1
+        opening, body = attributes(block[:end]), block[end:]
+        kind = match.group(1).lower()
+        if kind == "style" or kind == "script" and "application/json" not in opening:
+            body = selector.sub(lambda m: "#" + ids[m.group(1)], body)
+            if kind == "script":
+                body = literal.sub(lambda m: m.group(1) + ids[m.group(2)] + m.group(1), body)
+        return opening + body
+
+    out = []
+    for chunk in chunks:
+        parts, last = [], 0
+        for match in _PROTECTED_RE.finditer(chunk):
+            parts += [outside(chunk[last:match.start()]), protected(match)]
+            last = match.end()
+        parts.append(outside(chunk[last:]))
+        out.append("".join(parts))
+    return out
+
+
+def _insert_style(chunks, style):
+    """Put ``style`` in the document head, the content block, or first."""
+    for marker, after in (("</head>", False), ("{% block content %}", True)):
+        for index, chunk in enumerate(chunks):
+            at = chunk.find(marker)
+            if at >= 0:
+                at += len(marker) if after else 0
+                chunks[index] = chunk[:at] + style + chunk[at:]
+                return
+    chunks[0] = style + chunks[0]
+
+
+def compact_html(html):
+    """
+    Compact one generated template.
+
+    Args:
+        html: Template or fragment markup
+
+    Returns:
+        Compacted markup that renders the same
+    """
+    return compact_chunks([html])[0]
+
+
+def fragment_label(html, index):
+    """Short human label for a fragment: its first comment, field name or tag."""
+    head = html[:2000]
+    comment = _LABEL_COMMENT_RE.search(head)
+    if comment:
+        return comment.group(1)[:40]
+    name = _LABEL_NAME_RE.search(head)
+    if name:
+        return f'field "{name.group(1)}"'
+    tag = _LABEL_TAG_RE.search(head)
+    return f"<{tag.group(1)}> #{index + 1}" if tag else f"fragment #{index + 1}"
+
+
+def fragment_report(labels, chunks, budget=None, top=10):
+    """
+    Per-fragment token estimates as a short text report.
+
+    Args:
+        labels: Label per chunk (see ``fragment_label``)
+        chunks: Output chunks, in order
+        budget: Optional ``max_output_tokens`` to compare against
+        top: Number of largest fragments listed
+
+    Returns:
+        ``(total_tokens, report text)``
+    """
+    sizes = [(label, estimate_tokens(chunk)) for label, chunk in zip(labels, chunks)]
+    total = sum(tokens for _, tokens in sizes)
+    lines = [f"Estimated tokens: {total:,} in {len(sizes)} fragment(s)"]
+    if budget is not None:
+        verdict = "within" if total <= budget else "OVER"
+        lines[0] += f" ({verdict} max_output_tokens={budget:,})"
+    shown = sorted(sizes, key=lambda item: item[1], reverse=True)[:top]
+    for label, tokens in sorted(shown, key=lambda item: sizes.index(item)):
+        lines.append(f"  {tokens:>7,}  {label}")
+    if len(sizes) > top:
+        lines.append(f"  ({len(sizes) - top} smaller fragment(s) not listed)")
+    return total, "\n".join(lines)
@@ -235,13 +235,17 @@ def get_design_system() -> dict:
         },
         "icons": {
             "library": "lucide",
-            "cdn": "https://unpkg.com/lucide@latest/dist/umd/lucide.js",
+            "cdn": "https://unpkg.com/lucide@0.460.0/dist/umd/lucide.min.js",
             "size": {
                 "sm": "16",
                 "md": "20",
                 "lg": "24"
             },
             "stroke_width": "2",
+            "vendored": (
+                "kd_ui_server/data/lucide-icons.json "
+                "(pass prerender_icons to render icons without JS)"
+            ),
             "common": {
                 "dashboard": "layout-dashboard",
                 "analytics": "bar-chart-3",
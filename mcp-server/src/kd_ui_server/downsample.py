@@ -0,0 +1,174 @@
+"""Server-side downsampling for chart series.
+
+A browser chart cannot usefully draw more points than it has pixels, so long
+time series should be reduced before they are serialized into a page or a JSON
+endpoint. Two methods are provided:
+
+- ``lttb``: Largest-Triangle-Three-Buckets, keeps the visual shape of a line
+- ``minmax``: keeps the minimum and maximum of each bucket, preserves spikes
+
+Both use NumPy when it is installed (``pip install kd-ui-mcp-server[charts]``)
+and fall back to pure Python otherwise.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+DEFAULT_THRESHOLD = 2000
+
+
+def lttb(x, y, threshold=DEFAULT_THRESHOLD):
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Args:
+        x: Sequence of numeric x values (sorted ascending)
+        y: Sequence of numeric y values, same length as ``x``
+        threshold: Number of points to keep (first and last are always kept)
+
+    Returns:
+        Tuple ``(xs, ys)`` of lists
+    """
+    n = len(x)
+    if len(y) != n:
+        raise ValueError("x and y must have the same length")
+    if threshold >= n or threshold < 3:
+        return list(x), list(y)
+
+    if np is not None:
+        return _lttb_numpy(np.asarray(x, dtype=float), np.asarray(y, dtype=float), threshold)
+    return _lttb_python(list(x), list(y), threshold)
+
+
+def _lttb_python(x, y, threshold):
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    xs, ys = [x[0]], [y[0]]
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(x[next_start:next_end]) / span
+        avg_y = sum(y[next_start:next_end]) / span
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = x[a], y[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+
+        xs.append(x[best])
+        ys.append(y[best])
+        a = best
+
+    xs.append(x[-1])
+    ys.append(y[-1])
+    return xs, ys
+
+
+def _lttb_numpy(x, y, threshold):
+    n = len(x)
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(int) + 1
+    edges[-1] = n - 1
+
+    # Bucket averages, vectorized over all buckets at once
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    picked = np.empty(threshold, dtype=int)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = start + int(area.argmax())
+        picked[i + 1] = a
+
+    return x[picked].tolist(), y[picked].tolist()
+
+
+def minmax(x, y, threshold=DEFAULT_THRESHOLD):
+    """
+    Downsample by keeping the min and max point of each bucket.
+
+    Args:
+        x: Sequence of x values (sorted ascending)
+        y: Sequence of numeric y values, same length as ``x``
+        threshold: Approximate number of points to keep (two per bucket)
+
+    Returns:
+        Tuple ``(xs, ys)`` of lists, in x order
+    """
+    n = len(x)
+    if len(y) != n:
+        raise ValueError("x and y must have the same length")
+    buckets = max(threshold // 2, 1)
+    if n <= threshold:
+        return list(x), list(y)
+
+    if np is not None:
+        ya = np.asarray(y, dtype=float)
+        edges = (np.arange(buckets + 1) * n / buckets).astype(int)
+        lo = np.minimum.reduceat(ya, edges[:-1])
+        hi = np.maximum.reduceat(ya, edges[:-1])
+        # Position of each bucket's extreme: first index where the value matches
+        idx = []
+        for start, end, vmin, vmax in zip(edges[:-1], edges[1:], lo, hi):
+            segment = ya[start:end]
+            i_min = start + int(np.argmax(segment == vmin))
+            i_max = start + int(np.argmax(segment == vmax))
+            idx.extend(sorted({i_min, i_max}))
+        return np.asarray(x)[idx].tolist(), ya[idx].tolist()
+
+    xs, ys = [], []
+    for b in range(buckets):
+        start, end = b * n // buckets, (b + 1) * n // buckets
+        segment = range(start, end)
+        i_min = min(segment, key=y.__getitem__)
+        i_max = max(segment, key=y.__getitem__)
+        for i in sorted({i_min, i_max}):
+            xs.append(x[i])
+            ys.append(y[i])
+    return xs, ys
+
+
+METHODS = {"lttb": lttb, "minmax": minmax}
+
+
+def to_chart_data(x, y, label="Dataset", threshold=DEFAULT_THRESHOLD, method="lttb",
+                  x_format=None, **dataset_options):
+    """
+    Downsample a series and shape it as a Chart.js ``data`` object.
+
+    Bind the result to a chart container's ``data_source`` (Jinja variable) or
+    return it from the JSON endpoint the container fetches.
+
+    Args:
+        x: X values (numbers; use ``x_format`` to turn them into labels)
+        y: Y values
+        label: Dataset label
+        threshold: Target number of points
+        method: "lttb" or "minmax"
+        x_format: Optional callable applied to each kept x value for labels
+        **dataset_options: Extra Chart.js dataset options (borderColor, ...)
+
+    Returns:
+        ``{"labels": [...], "datasets": [{"label": ..., "data": [...]}]}``
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    xs, ys = METHODS[method](x, y, threshold)
+    labels = [x_format(v) for v in xs] if x_format else xs
+    return {"labels": labels, "datasets": [dict(label=label, data=ys, **dataset_options)]}
@@ -0,0 +1,299 @@
+"""In-process pub/sub bus for Server-Sent Events.
+
+One ``EventBus`` per app process fans events out to every connected client of
+a ``notifications_feed`` component. Each client gets a bounded buffer, so a
+slow connection can never grow memory without limit: when the buffer is full
+the oldest pending event is dropped, and events published with the same
+``key`` replace each other instead of queueing up (the client only needs the
+latest "3 jobs failing" count, not every intermediate one).
+
+The bus also keeps the last ``history`` events, so a client that reconnects
+with ``Last-Event-ID`` (``EventSource`` does this on its own) gets what it
+missed replayed, as far back as that history reaches.
+
+The bus is plain threads + asyncio and needs no broker, so it works in tests
+and local runs as-is. ``publish`` is safe to call from any thread; consumers
+iterate a ``Subscription`` synchronously (Flask/WSGI) or with ``async for``
+(ASGI). See ``kd_ui_server.flask_ext.sse_response`` for the Flask endpoint.
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional
+
+POLICIES = ("coalesce", "drop_oldest", "drop_newest")
+
+HEARTBEAT = ": keep-alive\n\n"
+
+
+@dataclass(frozen=True)
+class Event:
+    """A published event."""
+
+    id: int
+    topic: str
+    data: Any
+    key: Optional[str] = None
+
+
+class Subscription:
+    """A client's bounded view of the bus.
+
+    Created by ``EventBus.subscribe``; iterate it (sync or async) to receive
+    events, and ``close()`` it when the client disconnects.
+    """
+
+    def __init__(self, bus, topics=None, maxsize=100, policy="coalesce"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.topics = set(topics) if topics else None
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+
+        self._bus = bus
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._waiters = []  # (loop, asyncio.Event) of async consumers
+
+    def wants(self, event):
+        return self.topics is None or event.topic in self.topics
+
+    def put(self, event):
+        """Buffer an event, applying the backpressure policy. Returns False if dropped."""
+        with self._cond:
+            if self.closed:
+                return False
+
+            if self.policy == "coalesce" and event.key is not None:
+                for i, pending in enumerate(self._buffer):
+                    if pending.key == event.key and pending.topic == event.topic:
+                        self._buffer[i] = event
+                        self.coalesced += 1
+                        return True
+
+            if len(self._buffer) >= self.maxsize:
+                self.dropped += 1
+                if self.policy == "drop_newest":
+                    return False
+                self._buffer.popleft()
+
+            self._buffer.append(event)
+            self._notify()
+            return True
+
+    def _notify(self):
+        # Caller holds the lock
+        self._cond.notify_all()
+        for loop, ready in self._waiters:
+            loop.call_soon_threadsafe(ready.set)
+
+    def get(self, timeout=None):
+        """Block until an event is available; None on timeout or close."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._buffer and not self.closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._buffer.popleft() if self._buffer else None
+
+    async def aget(self, timeout=None):
+        """Await the next event; None on timeout or close."""
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        waiter = (loop, ready)
+        with self._cond:
+            if self._buffer:
+                return self._buffer.popleft()
+            if self.closed:
+                return None
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._cond:
+                self._waiters.remove(waiter)
+        with self._cond:
+            return self._buffer.popleft() if self._buffer else None
+
+    def pending(self):
+        """Number of buffered events."""
+        with self._cond:
+            return len(self._buffer)
+
+    def close(self):
+        """Detach from the bus and wake any waiting consumer."""
+        with self._cond:
+            if self.closed:
+                return
+            self.closed = True
+            self._buffer.clear()
+            self._notify()
+        self._bus.unsubscribe(self)
+
+    def __iter__(self):
+        while not self.closed:
+            event = self.get()
+            if event is not None:
+                yield event
+
+    async def __aiter__(self):
+        while not self.closed:
+            event = await self.aget()
+            if event is not None:
+                yield event
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBus:
+    """Fan-out pub/sub bus with a bounded buffer per subscriber.
+
+    Args:
+        maxsize: Default per-subscriber buffer size
+        policy: Default backpressure policy:
+            "coalesce" — events with the same key replace the pending one,
+            then the oldest event is dropped when full
+            "drop_oldest" — drop the oldest pending event when full
+            "drop_newest" — discard the incoming event when full
+        history: Number of recent events kept for resuming clients (0: none)
+    """
+
+    def __init__(self, maxsize=100, policy="coalesce", history=100):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._subscribers = set()
+        self._history = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, topics=None, maxsize=None, policy=None, last_event_id=None):
+        """
+        Register a new subscriber.
+
+        Args:
+            topics: Topics to receive (default: all)
+            maxsize: Buffer size override
+            policy: Backpressure policy override
+            last_event_id: ``Last-Event-ID`` of a reconnecting client; later
+                events still in the history are buffered first
+
+        Returns:
+            Subscription
+        """
+        sub = Subscription(self, topics, maxsize or self.maxsize, policy or self.policy)
+        try:
+            last_event_id = int(last_event_id) if last_event_id is not None else None
+        except ValueError:
+            last_event_id = None
+        with self._lock:
+            # Under the lock, so every event is either replayed or delivered
+            # live, once and in order
+            self._subscribers.add(sub)
+            if last_event_id is not None:
+                for event in self._history:
+                    if event.id > last_event_id and sub.wants(event):
+                        sub.put(event)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def publish(self, topic, data, key=None):
+        """
+        Publish an event to every interested subscriber. Never blocks on slow
+        consumers.
+
+        Args:
+            topic: Event topic; also the SSE event name the client listens for
+            data: JSON-serializable payload
+            key: Coalescing key; a pending event with the same topic and key
+                is replaced rather than queued behind
+
+        Returns:
+            The published Event
+        """
+        with self._lock:
+            event = Event(next(self._ids), topic, data, key)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            if sub.wants(event):
+                sub.put(event)
+        return event
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+def format_sse(event, retry=None):
+    """
+    Encode an event in the ``text/event-stream`` wire format.
+
+    Args:
+        event: Event to encode (``data`` is JSON-encoded unless already a str)
+        retry: Optional client reconnection delay in ms
+
+    Returns:
+        SSE message string, terminated by a blank line
+    """
+    data = event.data if isinstance(event.data, str) else json.dumps(event.data)
+    lines = [f"id: {event.id}", f"event: {event.topic}"]
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_stream(sub, heartbeat=15.0, retry=3000):
+    """
+    Yield SSE messages for a subscription (WSGI). Sends a comment line every
+    ``heartbeat`` seconds of silence so proxies keep the connection open, and
+    closes the subscription when the client goes away.
+    """
+    try:
+        first = True
+        while not sub.closed:
+            event = sub.get(timeout=heartbeat)
+            if event is None:
+                yield HEARTBEAT
+                continue
+            yield format_sse(event, retry=retry if first else None)
+            first = False
+    finally:
+        sub.close()
+
+
+async def asse_stream(sub, heartbeat=15.0, retry=3000):
+    """Async version of ``sse_stream`` for ASGI frameworks."""
+    try:
+        first = True
+        while not sub.closed:
+            event = await sub.aget(timeout=heartbeat)
+            if event is None:
+                yield HEARTBEAT
+                continue
+            yield format_sse(event, retry=retry if first else None)
+            first = False
+    finally:
+        sub.close()
@@ -0,0 +1,80 @@
+"""Sample data for demos, the showcase app and ``demo_data`` templates.
+
+Generated templates take their data from the view (``stats``,
+``transactions``, ``revenue_chart``...). Pass these fixtures as that data to
+see a template filled in::
+
+    render_template("dashboard.html", **dashboard_context())
+
+Generating with ``demo_data`` embeds the same values in the template as the
+fallback shown when the view passes nothing. Production templates leave it
+off.
+"""
+
+# create_dashboard: one dict per stat card ({{ stat.title }} ...)
+DASHBOARD_STATS = [
+    {"title": "Total Revenue", "value": "$45,231", "icon": "dollar-sign",
+     "trend_color": "green", "trend_icon": "trending-up", "description": "+20.1% from last month"},
+    {"title": "New Users", "value": "1,234", "icon": "users",
+     "trend_color": "green", "trend_icon": "trending-up", "description": "+12.5% from last month"},
+    {"title": "Active Sessions", "value": "567", "icon": "activity",
+     "trend_color": "red", "trend_icon": "trending-down", "description": "-5.2% from last month"},
+    {"title": "Conversion Rate", "value": "3.2%", "icon": "percent",
+     "trend_color": "green", "trend_icon": "trending-up", "description": "+0.3% from last month"},
+]
+
+# create_dashboard: "Recent Orders" rows ({{ transaction.id }} ...)
+TRANSACTIONS = [
+    {"id": "#12345", "name": "John Doe", "amount": "234.50", "status": "Completed",
+     "status_color": "green", "date": "2024-02-10"},
+    {"id": "#12346", "name": "Jane Smith", "amount": "589.00", "status": "Processing",
+     "status_color": "yellow", "date": "2024-02-10"},
+    {"id": "#12347", "name": "Bob Johnson", "amount": "123.99", "status": "Completed",
+     "status_color": "green", "date": "2024-02-09"},
+]
+
+# Chart.js data objects, as built by kd_ui_server.downsample.to_chart_data
+REVENUE_CHART = {
+    "labels": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
+    "datasets": [{"label": "Revenue", "data": [12400, 15800, 14200, 18900, 21300, 24800],
+                  "borderColor": "rgb(37, 99, 235)", "tension": 0.3}],
+}
+USER_CHART = {
+    "labels": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
+    "datasets": [{"label": "New users", "data": [320, 410, 380, 520, 610, 740],
+                  "backgroundColor": "rgba(37, 99, 235, 0.7)"}],
+}
+# add_component("chart_container") without labels/datasets
+CHART_DATA = {
+    "labels": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
+    "datasets": [{"label": "Dataset", "data": [12, 19, 3, 5, 2, 3],
+                  "borderColor": "rgb(59, 130, 246)", "tension": 0.1}],
+}
+
+# create_table rows for a "Projects" table (name, status, updated columns)
+PROJECTS = [
+    {"name": "alpha-api", "status": "Active", "status_color": "success",
+     "updated": "2026-02-15"},
+    {"name": "beta-dashboard", "status": "Draft", "status_color": "warning",
+     "updated": "2026-02-12"},
+    {"name": "gamma-service", "status": "Archived", "status_color": "error",
+     "updated": "2026-01-30"},
+    {"name": "delta-worker", "status": "Active", "status_color": "success",
+     "updated": "2026-02-10"},
+    {"name": "epsilon-jobs", "status": "Draft", "status_color": "warning",
+     "updated": "2026-02-08"},
+    {"name": "zeta-gateway", "status": "Active", "status_color": "success",
+     "updated": "2026-02-05"},
+    {"name": "eta-scheduler", "status": "Archived", "status_color": "secondary",
+     "updated": "2026-01-28"},
+]
+
+
+def dashboard_context():
+    """Template variables for a ``create_dashboard`` template, filled with the samples above."""
+    return {
+        "stats": DASHBOARD_STATS,
+        "transactions": TRANSACTIONS,
+        "revenue_chart": REVENUE_CHART,
+        "user_chart": USER_CHART,
+    }
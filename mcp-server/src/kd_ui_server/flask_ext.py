@@ -0,0 +1,149 @@
+"""Flask helpers for generated templates.
+
+Flask is imported lazily so the MCP server itself never depends on it; these
+helpers are meant to be imported from the Flask app that renders the
+generated templates.
+"""
+
+import re
+
+from .events import sse_stream
+from .routes import resolve_active
+from .runtime import SIDEBAR_COOKIE_PREFIX
+
+_TOKEN_RE = re.compile(r"^[a-z0-9-]+$")
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop nginx from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_response(bus, topics=None, heartbeat=15.0, retry=3000, maxsize=None, policy=None):
+    """
+    Stream events from an ``EventBus`` to one client as Server-Sent Events.
+
+    Usage::
+
+        bus = EventBus()
+
+        @app.route("/events")
+        def events():
+            return sse_response(bus, topics=["notification"])
+
+        bus.publish("notification", {"type": "error", "message": "Job failed"}, key="job-42")
+
+    Each connection holds a worker thread for its lifetime, so run the app
+    with a threaded server (the Flask dev server, or gunicorn with gthread or
+    gevent workers). A reconnecting client's ``Last-Event-ID`` header is
+    passed to the bus, which replays the events it missed.
+
+    Args:
+        bus: EventBus to subscribe to
+        topics: Topics to forward (default: all)
+        heartbeat: Seconds of silence before a keep-alive comment is sent
+        retry: Client reconnection delay in ms
+        maxsize: Per-client buffer size (default: the bus default)
+        policy: Backpressure policy (default: the bus default)
+
+    Returns:
+        flask.Response with ``text/event-stream`` content
+    """
+    from flask import Response, request
+
+    sub = bus.subscribe(
+        topics, maxsize=maxsize, policy=policy, last_event_id=request.headers.get("Last-Event-ID")
+    )
+    return Response(
+        sse_stream(sub, heartbeat=heartbeat, retry=retry),
+        mimetype="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+def parse_sidebar_cookie(value):
+    """
+    Decode a ``kd_sidebar_<id>`` cookie value (``"c:reports.settings"``).
+
+    Returns:
+        ``{"collapsed": bool, "open": [submenu keys]}``
+    """
+    state, _, open_keys = (value or "").partition(":")
+    return {
+        "collapsed": state == "c",
+        "open": [key for key in open_keys.split(".") if _TOKEN_RE.match(key)],
+    }
+
+
+def sidebar_state(sidebar_id="sidebar", cookies=None):
+    """
+    Persisted state of one sidebar.
+
+    Args:
+        sidebar_id: The sidebar component's ``id``
+        cookies: Cookie mapping (default: ``flask.request.cookies``)
+
+    Returns:
+        ``{"collapsed": bool, "open": [submenu keys]}``
+    """
+    if cookies is None:
+        from flask import request
+        cookies = request.cookies
+    return parse_sidebar_cookie(cookies.get(SIDEBAR_COOKIE_PREFIX + sidebar_id))
+
+
+def sidebar_html_attrs(cookies):
+    """
+    Build the ``<html>`` attributes that apply every persisted sidebar state.
+
+    Rendering these server-side means the page is laid out correctly from
+    the first byte; the client-side snippet then has nothing left to do.
+
+    Args:
+        cookies: Cookie mapping
+
+    Returns:
+        Attribute string, e.g. `` data-kd-sidebar-collapsed="sidebar" data-kd-sidebar-open=""``
+    """
+    collapsed, open_tokens = [], []
+    for name, value in cookies.items():
+        if not name.startswith(SIDEBAR_COOKIE_PREFIX):
+            continue
+        sidebar_id = name[len(SIDEBAR_COOKIE_PREFIX):]
+        if not _TOKEN_RE.match(sidebar_id):
+            continue
+        state = parse_sidebar_cookie(value)
+        if state["collapsed"]:
+            collapsed.append(sidebar_id)
+        open_tokens.extend(f"{sidebar_id}/{key}" for key in state["open"])
+    return (
+        f' data-kd-sidebar-collapsed="{" ".join(collapsed)}"'
+        f' data-kd-sidebar-open="{" ".join(open_tokens)}"'
+    )
+
+
+def init_app(app):
+    """
+    Register the template helpers used by generated layouts.
+
+    Adds ``kd_sidebar_attrs()`` (server-rendered sidebar state for the
+    ``<html>`` tag of the base layout), ``kd_sidebar_state(id)`` and
+    ``kd_nav_active(path, urls)`` (trie-backed active-route lookup used by
+    navigation generated with ``active_mode: "route"``).
+    """
+    from flask import request
+    from markupsafe import Markup
+
+    app.jinja_env.globals["kd_nav_active"] = resolve_active
+
+    @app.context_processor
+    def kd_ui_helpers():
+        return {
+            "kd_sidebar_attrs": lambda: Markup(sidebar_html_attrs(request.cookies)),
+            "kd_sidebar_state": lambda sidebar_id="sidebar": sidebar_state(
+                sidebar_id, request.cookies
+            ),
+        }
+
+    return app
@@ -0,0 +1,151 @@
+"""Streamable HTTP transport: one long-lived server for many agent sessions.
+
+With stdio every agent spawns its own Python process and pays the full import
+and warm-up cost. ``kd-ui-server --transport http`` instead runs the same MCP
+server on uvicorn: it is warmed up once at startup (``server.warm_up``), and
+every session shares its caches.
+
+Endpoints:
+    /mcp      MCP streamable HTTP (POST requests, GET/SSE server stream)
+    /healthz  Liveness probe
+    /metrics  Prometheus text (see ``kd_ui_server.metrics``)
+
+Sessions live in the process that created them, so with more than one worker
+the transport runs stateless (every request is self-contained) and any worker
+can answer any request. ``pool`` instead keeps one front-end process and
+hands generation to pre-forked worker processes (see ``kd_ui_server.workers``).
+"""
+
+import contextlib
+import json
+import os
+
+HTTP_CONFIG_ENV = "KD_UI_HTTP_CONFIG"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class _MCPEndpoint:
+    """ASGI endpoint that hands requests to the session manager."""
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    async def __call__(self, scope, receive, send):
+        await self.manager.handle_request(scope, receive, send)
+
+
+def create_app(stateless=False, json_response=False, warm=True, max_sessions=None, pool=0):
+    """
+    Build the Starlette app serving the MCP server over streamable HTTP.
+
+    Args:
+        stateless: No session tracking; required with several workers
+        json_response: Answer with plain JSON instead of an SSE stream
+        warm: Run ``server.warm_up()`` before accepting requests
+        max_sessions: Cap on concurrent stateful sessions (newer ``mcp`` only)
+        pool: Generator worker processes behind this front end (0: generate
+            in-process)
+
+    Returns:
+        ASGI application
+    """
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+
+    from . import server
+    from .metrics import metrics
+
+    options = {"stateless": stateless, "json_response": json_response}
+    if max_sessions is not None:
+        options["max_sessions"] = max_sessions
+    manager = StreamableHTTPSessionManager(app=server.app, **options)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_app):
+        workers = None
+        if pool:
+            from .workers import start_pool
+
+            # Workers warm themselves; the front end only serves resources
+            workers = start_pool(pool)
+        elif warm:
+            server.warm_up()
+        try:
+            async with manager.run():
+                yield
+        finally:
+            if workers is not None:
+                workers.shutdown()
+
+    async def healthz(_request):
+        return PlainTextResponse("ok\n")
+
+    async def prometheus(_request):
+        return PlainTextResponse(
+            metrics.render_prometheus(), media_type="text/plain; version=0.0.4"
+        )
+
+    return Starlette(
+        routes=[
+            Route("/mcp", endpoint=_MCPEndpoint(manager), methods=["GET", "POST", "DELETE"]),
+            Route("/healthz", endpoint=healthz),
+            Route("/metrics", endpoint=prometheus),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def app_factory():
+    """uvicorn factory used by worker processes; options come from ``$KD_UI_HTTP_CONFIG``."""
+    return create_app(**json.loads(os.environ.get(HTTP_CONFIG_ENV, "{}")))
+
+
+def run(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=1, limit_concurrency=None,
+        max_sessions=None, backlog=2048, stateless=False, json_response=False, warm=True, pool=0,
+        log_level="info"):
+    """
+    Serve the MCP server over streamable HTTP with uvicorn.
+
+    Args:
+        host: Bind address
+        port: Bind port
+        workers: Worker processes; more than one forces ``stateless``
+        limit_concurrency: Maximum concurrent connections per worker before
+            uvicorn answers 503
+        max_sessions: Maximum concurrent MCP sessions (stateful mode)
+        backlog: Pending-connection queue size
+        stateless: No session tracking
+        json_response: Plain JSON responses instead of SSE streams
+        warm: Warm up caches before accepting requests
+        pool: Generator worker processes behind a single front end; use
+            instead of ``workers`` to keep stateful sessions
+        log_level: uvicorn log level
+    """
+    import uvicorn
+
+    if workers > 1 and pool:
+        raise ValueError("Use either several HTTP workers or a generator pool, not both")
+    if workers > 1:
+        stateless = True
+    config = {"stateless": stateless, "json_response": json_response, "warm": warm,
+              "max_sessions": max_sessions, "pool": pool}
+
+    options = {
+        "host": host,
+        "port": port,
+        "limit_concurrency": limit_concurrency,
+        "backlog": backlog,
+        "log_level": log_level,
+    }
+    if workers > 1:
+        # Workers are separate processes: pass the app by import string
+        os.environ[HTTP_CONFIG_ENV] = json.dumps(config)
+        uvicorn.run(
+            "kd_ui_server.http_server:app_factory", factory=True, workers=workers, **options
+        )
+    else:
+        uvicorn.run(create_app(**config), **options)
@@ -0,0 +1,264 @@
+"""Icon registry for KD UI components.
+
+Every SVG icon used by the generators is stored here exactly once. Generators
+reference icons by name and either inline the full ``<svg>`` or, in sprite
+mode, emit a tiny ``<svg><use href="#kd-i-name"/></svg>`` reference that points
+at a single ``<symbol>`` sprite included once per page.
+
+Lucide icons are resolved from a vendored subset (``data/lucide-icons.json``)
+under the ``lucide-`` namespace, so ``<i data-lucide="...">`` placeholders can
+be pre-rendered at generation time instead of by ``lucide.createIcons()``.
+"""
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+SPRITE_PREFIX = "kd-i-"
+LUCIDE_PREFIX = "lucide-"
+
+_LUCIDE_DATA = Path(__file__).parent / "data" / "lucide-icons.json"
+
+_STROKE_2 = (
+    'fill="none" stroke="currentColor" stroke-width="2" '
+    'stroke-linecap="round" stroke-linejoin="round"'
+)
+_STROKE_2_5 = _STROKE_2.replace('stroke-width="2"', 'stroke-width="2.5"')
+
+# name -> presentation attributes + inner markup (paths only, no wrapper)
+ICONS = {
+    # Trend arrows (stat cards)
+    "trending-up": {
+        "attrs": _STROKE_2_5,
+        "body": (
+            '<polyline points="22 7 13.5 15.5 8.5 10.5 2 17"/>'
+            '<polyline points="16 7 22 7 22 13"/>'
+        ),
+    },
+    "trending-down": {
+        "attrs": _STROKE_2_5,
+        "body": (
+            '<polyline points="22 17 13.5 8.5 8.5 13.5 2 7"/>'
+            '<polyline points="16 17 22 17 22 11"/>'
+        ),
+    },
+    # Alert / toast icons
+    "alert-info": {
+        "attrs": _STROKE_2,
+        "body": '<path d="M13 16h-1v-4h-1m1-4h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z"/>',
+    },
+    "alert-success": {
+        "attrs": _STROKE_2,
+        "body": '<path d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"/>',
+    },
+    "alert-warning": {
+        "attrs": _STROKE_2,
+        "body": (
+            '<path d="M12 9v2m0 4h.01m-6.938 4h13.856c1.54 0 2.502-1.667 1.732-3L13.732 4'
+            'c-.77-1.333-2.694-1.333-3.464 0L3.34 16c-.77 1.333.192 3 1.732 3z"/>'
+        ),
+    },
+    "alert-error": {
+        "attrs": _STROKE_2,
+        "body": '<path d="M10 14l2-2m0 0l2-2m-2 2l-2-2m2 2l2 2m7-2a9 9 0 11-18 0 9 9 0 0118 0z"/>',
+    },
+    # Top bar / table chrome
+    "search": {
+        "attrs": _STROKE_2,
+        "body": '<circle cx="11" cy="11" r="8"/><path d="m21 21-4.35-4.35"/>',
+    },
+    "menu": {
+        "attrs": _STROKE_2,
+        "body": '<path d="M4 6h16M4 12h16M4 18h16"/>',
+    },
+    "bell": {
+        "attrs": _STROKE_2,
+        "body": (
+            '<path d="M15 17h5l-1.405-1.405A2.032 2.032 0 0118 14.158V11a6.002 6.002 0 00-4-5.659'
+            "V5a2 2 0 10-4 0v.341C7.67 6.165 6 8.388 6 11v3.159c0 .538-.214 1.055-.595 1.436"
+            'L4 17h5m6 0v1a3 3 0 11-6 0v-1m6 0H9"/>'
+        ),
+    },
+}
+
+ICON_MODES = ("inline", "sprite")
+
+# Opening tag of every sprite ``render_sprite`` emits (lets page composition find them)
+SPRITE_OPEN = '<svg xmlns="http://www.w3.org/2000/svg" style="display:none" aria-hidden="true">'
+
+_USE_RE = re.compile(r'href="#' + SPRITE_PREFIX + r'([a-z0-9-]+)"')
+
+# <i data-lucide="name" class="..." [id="..."]></i> with a literal (non-Jinja) name
+_PLACEHOLDER_RE = re.compile(
+    r'<i data-lucide="([a-z0-9-]+)"((?:\s+(?:class|id)="[^"{}]*")*)\s*></i>'
+)
+_ATTR_RE = re.compile(r'(class|id)="([^"]*)"')
+
+# createIcons() bootstrap blocks, in the shapes the generators emit them
+_CREATE_ICONS_RE = re.compile(
+    r"\n?[ \t]*(?://[^\n]*\n[ \t]*)?if \(typeof lucide !== 'undefined'\) "
+    r"(?:\{\s*lucide\.createIcons\(\);\s*\}|lucide\.createIcons\(\);)"
+)
+_EMPTY_SCRIPT_RE = re.compile(r"\n?<script>\s*</script>\n?")
+
+
+# Set in pool workers (see workers.py) to the front end's SharedAssetCache,
+# which holds lucide_assets(); icons are then read from the shared segment
+# instead of every worker loading its own copy of the set
+shared_assets = None
+
+
+@lru_cache(maxsize=1)
+def _lucide_set():
+    """Load the vendored Lucide subset on first use."""
+    with open(_LUCIDE_DATA, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def lucide_assets():
+    """The vendored Lucide subset as ``{key: text}`` entries for a SharedAssetCache."""
+    data = _lucide_set()
+    items = {"lucide:attrs": data["attrs"]}
+    items.update((f"lucide:alias:{alias}", name) for alias, name in data["aliases"].items())
+    items.update((f"lucide:icon:{name}", body) for name, body in data["icons"].items())
+    return items
+
+
+def get_lucide_def(name):
+    """Return a registry-style entry for a vendored Lucide icon, or None."""
+    if shared_assets is not None:
+        name = shared_assets.get(f"lucide:alias:{name}") or name
+        body = shared_assets.get(f"lucide:icon:{name}")
+        if body is None:
+            return None
+        return {"attrs": shared_assets.get("lucide:attrs"), "body": body}
+    data = _lucide_set()
+    name = data["aliases"].get(name, name)
+    body = data["icons"].get(name)
+    if body is None:
+        return None
+    return {"attrs": data["attrs"], "body": body}
+
+
+def get_icon_def(name):
+    """Return the registry entry for an icon, or None if it is unknown."""
+    if name.startswith(LUCIDE_PREFIX):
+        return get_lucide_def(name[len(LUCIDE_PREFIX):])
+    return ICONS.get(name)
+
+
+def render_icon(name, mode="inline", size=None, cls="", style="", aria_hidden=True):
+    """
+    Render an icon by name.
+
+    Args:
+        name: Registered icon name (see ``ICONS``)
+        mode: "inline" for a full SVG, "sprite" for a ``<use>`` reference
+        size: Optional width/height in px
+        cls: Optional CSS class attribute value
+        style: Optional inline style attribute value
+        aria_hidden: Mark the icon as decorative
+
+    Returns:
+        SVG markup string (empty string for unknown icons)
+    """
+    icon = get_icon_def(name)
+    if icon is None:
+        return ""
+
+    attrs = 'xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24"'
+    if size:
+        attrs += f' width="{size}" height="{size}"'
+    if cls:
+        attrs += f' class="{cls}"'
+    if style:
+        attrs += f' style="{style}"'
+    if aria_hidden:
+        attrs += ' aria-hidden="true"'
+
+    if mode == "sprite":
+        return f'<svg {attrs}><use href="#{SPRITE_PREFIX}{name}"/></svg>'
+    return f'<svg {attrs} {icon["attrs"]}>{icon["body"]}</svg>'
+
+
+def render_sprite(names=None):
+    """
+    Render a hidden ``<svg>`` sprite holding one ``<symbol>`` per icon.
+
+    Args:
+        names: Icon names to include (default: every registered icon)
+
+    Returns:
+        Sprite markup to place once per page, before any ``<use>`` reference
+    """
+    if names is None:
+        names = list(ICONS)
+
+    symbols = []
+    seen = set()
+    for name in names:
+        icon = get_icon_def(name)
+        if icon is None or name in seen:
+            continue
+        seen.add(name)
+        symbols.append(
+            f'<symbol id="{SPRITE_PREFIX}{name}" viewBox="0 0 24 24" {icon["attrs"]}>'
+            f'{icon["body"]}</symbol>'
+        )
+
+    if not symbols:
+        return ""
+    return (
+        SPRITE_OPEN
+        + "".join(symbols)
+        + "</svg>\n"
+    )
+
+
+def icons_referenced(html):
+    """Return the icon names referenced via ``<use>`` in the given markup, in order."""
+    names = []
+    for name in _USE_RE.findall(html):
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def sprite_for(html):
+    """Build a sprite containing exactly the icons referenced by ``html``."""
+    return render_sprite(icons_referenced(html))
+
+
+def prerender_lucide(html, mode="inline"):
+    """
+    Replace ``<i data-lucide="...">`` placeholders with SVG at generation time.
+
+    Icons missing from the vendored set, and names bound at render time
+    (``{{ stat.icon }}``), are left as placeholders. The ``lucide.createIcons()``
+    bootstrap is stripped once no placeholder remains, so the page needs no
+    icon JS at all.
+
+    Args:
+        html: Generated markup
+        mode: "inline" for full SVGs, "sprite" for ``<use>`` references
+
+    Returns:
+        Markup with resolvable placeholders pre-rendered
+    """
+    def replace(match):
+        name = match.group(1)
+        if get_lucide_def(name) is None:
+            return match.group(0)
+        attrs = dict(_ATTR_RE.findall(match.group(2)))
+        cls = f"lucide lucide-{name} {attrs.get('class', '')}".strip()
+        svg = render_icon(LUCIDE_PREFIX + name, mode, size=24, cls=cls)
+        if "id" in attrs:
+            svg = svg.replace("<svg ", f'<svg id="{attrs["id"]}" ', 1)
+        return svg
+
+    html = _PLACEHOLDER_RE.sub(replace, html)
+    if "data-lucide" not in html:
+        html = _CREATE_ICONS_RE.sub("", html)
+        html = _EMPTY_SCRIPT_RE.sub("\n", html)
+    return html
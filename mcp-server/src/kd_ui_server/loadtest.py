@@ -0,0 +1,375 @@
+"""Record MCP traffic and replay it against a spawned stdio server.
+
+Recording: start the server with ``KD_UI_RECORD=/path/traffic.jsonl`` and
+every ``tools/call`` and ``resources/read`` it handles is appended to that
+file as one JSON-RPC message per line (``{"method", "params"}``).
+
+Replay: ``replay`` spawns the server as a subprocess, performs the MCP
+handshake over stdin/stdout and sends the recorded requests round-robin,
+with at most ``concurrency`` in flight and, optionally, an open-loop
+``rate`` of requests per second. It reports throughput, latency
+percentiles and the server's resident memory (sampled from ``/proc``), so
+the numbers can be compared across commits. Everything is local: no
+network access is needed.
+
+Start-up: ``measure_startup`` times a fresh server to its first
+``initialize``, ``tools/list`` and ``tools/call`` responses, and
+``import_times`` parses ``python -X importtime`` for the modules it loads.
+"""
+
+import asyncio
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+
+RECORD_ENV = "KD_UI_RECORD"
+
+PROTOCOL_VERSION = "2024-11-05"
+
+DEFAULT_SERVER_CMD = (sys.executable, "-m", "kd_ui_server.server")
+
+
+class Recorder:
+    """Append handled requests to a JSON Lines file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Recorder for ``$KD_UI_RECORD``, or None when recording is off."""
+        path = os.environ.get(RECORD_ENV)
+        return cls(path) if path else None
+
+    def record(self, method, params):
+        line = json.dumps({"method": method, "params": params}, separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def load_recording(path):
+    """
+    Read recorded requests.
+
+    Returns:
+        List of ``{"method", "params"}`` dicts (tools/call and resources/read only)
+    """
+    requests = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if message.get("method") in ("tools/call", "resources/read"):
+                requests.append({"method": message["method"], "params": message.get("params", {})})
+    return requests
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list (None if empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def read_rss(pid):
+    """Resident set size of a process in bytes (Linux ``/proc``), or None."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class StdioClient:
+    """Minimal JSON-RPC client for an MCP server on a subprocess' stdio."""
+
+    def __init__(self, process):
+        self.process = process
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._reader = None
+
+    @classmethod
+    async def spawn(cls, cmd=DEFAULT_SERVER_CMD, env=None):
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+            # Large generations arrive as single lines
+            limit=64 * 1024 * 1024,
+        )
+        client = cls(process)
+        client._reader = asyncio.create_task(client._read())
+        return client
+
+    async def _read(self):
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("server closed stdout"))
+
+    async def _send(self, message):
+        self.process.stdin.write(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+        await self.process.stdin.drain()
+
+    async def request(self, method, params=None):
+        """Send a request and wait for its response message."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        await self._send(
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+        )
+        return await future
+
+    async def notify(self, method, params=None):
+        await self._send({"jsonrpc": "2.0", "method": method, "params": params or {}})
+
+    async def initialize(self):
+        """MCP handshake; returns the initialize result."""
+        response = await self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "kd-ui-load", "version": "0.1.0"},
+        })
+        await self.notify("notifications/initialized")
+        return response.get("result")
+
+    async def close(self):
+        if self.process.stdin and not self.process.stdin.is_closing():
+            self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), 5)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        if self._reader:
+            self._reader.cancel()
+
+
+def _label(request):
+    """Report key: tool name (with component_type) or resource URI."""
+    params = request["params"]
+    if "uri" in params:
+        return params["uri"]
+    component = (params.get("arguments") or {}).get("component_type")
+    if component:
+        return f"{params.get('name')}({component})"
+    return params.get("name", request["method"])
+
+
+def _is_error(response):
+    return "error" in response or bool(response.get("result", {}).get("isError"))
+
+
+async def replay(requests, total=None, duration=None, concurrency=1, rate=None,
+                 server_cmd=DEFAULT_SERVER_CMD, env=None, warmup=None, rss_interval=0.1):
+    """
+    Replay recorded requests against a freshly spawned server.
+
+    Args:
+        requests: Output of ``load_recording``
+        total: Number of requests to send (default: one pass over ``requests``)
+        duration: Alternatively, keep sending for this many seconds
+        concurrency: Maximum requests in flight
+        rate: Target requests per second (open loop); None sends as fast as
+            ``concurrency`` allows
+        server_cmd: Command that starts the stdio server
+        env: Environment for the server process
+        warmup: Requests sent (and not measured) before the run; None
+            sends one of each distinct tool/resource in ``requests``, so the
+            lazy SDK and tool imports of a fresh server stay out of the report
+        rss_interval: Seconds between RSS samples
+
+    Returns:
+        Report dict: request and error counts, throughput, startup time,
+        latency percentiles (overall and per tool/resource) and server RSS
+    """
+    if not requests:
+        raise ValueError("No tools/call or resources/read requests to replay")
+    if total is None and duration is None:
+        total = len(requests)
+
+    if warmup is None:
+        warm = list({_label(request): request for request in requests}.values())
+    else:
+        warm = list(itertools.islice(itertools.cycle(requests), warmup))
+
+    spawned = time.perf_counter()
+    client = await StdioClient.spawn(server_cmd, _server_env(env))
+    sampler, tasks = None, []
+    try:
+        await client.initialize()
+        startup = time.perf_counter() - spawned
+        pid = client.process.pid
+        rss_start = read_rss(pid)
+
+        for request in warm:
+            await client.request(request["method"], request["params"])
+        source = itertools.cycle(requests)
+
+        latencies, errors, per_method = [], 0, {}
+        rss_peak = rss_start or 0
+        stop = asyncio.Event()
+
+        async def sample_rss():
+            nonlocal rss_peak
+            while not stop.is_set():
+                rss_peak = max(rss_peak, read_rss(pid) or 0)
+                try:
+                    await asyncio.wait_for(stop.wait(), rss_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+        async def one(request):
+            nonlocal errors
+            start = time.perf_counter()
+            response = await client.request(request["method"], request["params"])
+            elapsed = time.perf_counter() - start
+            latencies.append(elapsed)
+            key = _label(request)
+            per_method.setdefault(key, []).append(elapsed)
+            if _is_error(response):
+                errors += 1
+
+        sampler = asyncio.create_task(sample_rss())
+        slots = asyncio.Semaphore(concurrency)
+        began = time.perf_counter()
+        deadline = began + duration if duration else None
+
+        async def guarded(request):
+            try:
+                await one(request)
+            finally:
+                slots.release()
+
+        for i in itertools.count():
+            if total is not None and i >= total:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if rate:
+                # Open loop: request i is due at began + i / rate
+                delay = began + i / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await slots.acquire()
+            tasks.append(asyncio.create_task(guarded(next(source))))
+
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - began
+        stop.set()
+        await sampler
+        rss_end = read_rss(pid)
+    finally:
+        # A failed request leaves the sampler and other requests pending
+        for task in [*tasks, sampler]:
+            if task is not None and not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, *([sampler] if sampler else []), return_exceptions=True)
+        await client.close()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "warmup": len(warm),
+        "concurrency": concurrency,
+        "rate": rate,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "startup_s": startup,
+        "latency_ms": {
+            "p50": _ms(percentile(latencies, 0.50)),
+            "p95": _ms(percentile(latencies, 0.95)),
+            "p99": _ms(percentile(latencies, 0.99)),
+            "max": _ms(latencies[-1] if latencies else None),
+        },
+        "by_request": {
+            key: {"count": len(values), "p50_ms": _ms(percentile(sorted(values), 0.50)),
+                  "p95_ms": _ms(percentile(sorted(values), 0.95))}
+            for key, values in sorted(per_method.items())
+        },
+        "rss_bytes": {"start": rss_start, "peak": rss_peak or None, "end": rss_end},
+    }
+
+
+def _server_env(env=None):
+    """Child environment: never record, and make a source checkout importable."""
+    env = dict(os.environ if env is None else env)
+    env.pop(RECORD_ENV, None)
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    return env
+
+
+async def measure_startup(server_cmd=DEFAULT_SERVER_CMD, env=None,
+                          call=("add_component", {"component_type": "badge"})):
+    """
+    Time one cold start of the stdio server.
+
+    Returns:
+        Seconds from spawn to the ``initialize``, ``tools/list`` and first
+        ``tools/call`` (``call``) responses
+    """
+    spawned = time.perf_counter()
+    client = await StdioClient.spawn(server_cmd, _server_env(env))
+    try:
+        await client.initialize()
+        initialized = time.perf_counter() - spawned
+        await client.request("tools/list")
+        listed = time.perf_counter() - spawned
+        name, arguments = call
+        await client.request("tools/call", {"name": name, "arguments": arguments})
+        called = time.perf_counter() - spawned
+    finally:
+        await client.close()
+    return {"initialize_s": initialized, "tools_list_s": listed, "first_call_s": called}
+
+
+def import_times(statement="import kd_ui_server.server", python=sys.executable, env=None):
+    """
+    Run ``statement`` under ``python -X importtime``.
+
+    Returns:
+        List of ``{"module", "self_us", "cumulative_us", "depth"}`` in import
+        order (depth 0 is a top-level import)
+    """
+    result = subprocess.run([python, "-X", "importtime", "-c", statement], env=_server_env(env),
+                            capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+        })
+    return modules
+
+
+def _ms(seconds):
+    return None if seconds is None else round(1000 * seconds, 3)
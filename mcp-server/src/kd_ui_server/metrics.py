@@ -0,0 +1,287 @@
+"""Per-tool latency and output-size instrumentation.
+
+``call_tool`` and ``read_resource`` report every request here: a latency
+histogram, output byte and character counts and error counts per tool (and
+per ``component_type`` for ``add_component``), plus hit/miss counters for the
+server's caches. The ``metrics://server`` resource returns a JSON snapshot;
+with ``KD_UI_METRICS_FILE`` set, the same numbers are also written in the
+Prometheus text format (node_exporter textfile collector compatible).
+
+Recording is on by default and costs two clock reads and a few dict updates
+per request; ``KD_UI_METRICS=0`` turns it off entirely. Tool names, resource
+URIs and component types outside the catalog are counted under ``other``, so
+clients can't grow the label set.
+"""
+
+import atexit
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+METRICS_ENV = "KD_UI_METRICS"
+METRICS_FILE_ENV = "KD_UI_METRICS_FILE"
+METRICS_INTERVAL_ENV = "KD_UI_METRICS_INTERVAL"
+
+# Upper bounds in seconds; generation spans sub-millisecond snippets to
+# multi-hundred-millisecond full pages
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+DEFAULT_INTERVAL = 10.0
+
+# Label for names and component types the catalog doesn't define
+OTHER = "other"
+
+
+@lru_cache(maxsize=1)
+def _known_labels():
+    """``({kind: names}, component types)`` that get series of their own."""
+    from .catalog import ADD_COMPONENT_TYPES, RESOURCES, TOOLS
+
+    names = {
+        "tool": frozenset(tool["name"] for tool in TOOLS),
+        "resource": frozenset(resource["uri"] for resource in RESOURCES),
+    }
+    return names, frozenset(ADD_COMPONENT_TYPES)
+
+
+class _Series:
+    """Counters for one (kind, name, component) combination."""
+
+    __slots__ = ("calls", "errors", "seconds", "max_seconds", "buckets", "bytes", "chars")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.bytes = 0
+        self.chars = 0
+
+    def quantile(self, q):
+        """Estimate a latency quantile from the histogram: bucket upper bound, capped at the max."""
+        if not self.calls:
+            return None
+        rank, seen = q * self.calls, 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(BUCKETS[i], self.max_seconds) if i < len(BUCKETS) else self.max_seconds
+        return self.max_seconds
+
+
+class _Observation:
+    """Handle yielded by ``Metrics.observe``; report the output size on it."""
+
+    __slots__ = ("text",)
+
+    def __init__(self):
+        self.text = None
+
+    def output(self, text):
+        """Record the output: a string or a list of string chunks."""
+        self.text = text
+
+
+class Metrics:
+    """Thread-safe registry of request metrics.
+
+    Args:
+        enabled: Record anything at all
+        path: Optional file to write Prometheus text to
+        interval: Minimum seconds between file writes
+    """
+
+    def __init__(self, enabled=True, path=None, interval=DEFAULT_INTERVAL):
+        self.enabled = enabled
+        self.path = path
+        self.interval = interval
+        self.started = time.time()
+        self._series = {}
+        self._cache = {}  # cache name -> [hits, misses]
+        self._lock = threading.Lock()
+        self._written = 0.0
+
+    @classmethod
+    def from_env(cls):
+        """Configure from ``KD_UI_METRICS``, ``KD_UI_METRICS_FILE``, ``KD_UI_METRICS_INTERVAL``."""
+        enabled = os.environ.get(METRICS_ENV, "1").lower() not in ("0", "false", "no", "off")
+        try:
+            interval = float(os.environ.get(METRICS_INTERVAL_ENV, DEFAULT_INTERVAL))
+        except ValueError:
+            interval = DEFAULT_INTERVAL
+        return cls(enabled, os.environ.get(METRICS_FILE_ENV) or None, interval)
+
+    @contextmanager
+    def observe(self, kind, name, component=None):
+        """
+        Time a request and record its outcome.
+
+        Usage::
+
+            with metrics.observe("tool", "add_component", "sidebar") as obs:
+                text = add_component("sidebar")
+                obs.output(text)
+
+        Args:
+            kind: "tool" or "resource"
+            name: Tool name or resource URI
+            component: Optional sub-label (``component_type``)
+        """
+        obs = _Observation()
+        if not self.enabled:
+            yield obs
+            return
+
+        start = time.perf_counter()
+        try:
+            yield obs
+        except BaseException:
+            self._record(kind, name, component, time.perf_counter() - start, None, error=True)
+            raise
+        self._record(kind, name, component, time.perf_counter() - start, obs.text)
+
+    def _record(self, kind, name, component, seconds, text, error=False):
+        names, components = _known_labels()
+        if name not in names.get(kind, ()):
+            name = OTHER
+        if component and component not in components:
+            component = OTHER
+        key = (kind, name, component or "")
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.calls += 1
+            series.errors += error
+            series.seconds += seconds
+            series.max_seconds = max(series.max_seconds, seconds)
+            series.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+            if text is not None:
+                for chunk in [text] if isinstance(text, str) else text:
+                    series.chars += len(chunk)
+                    series.bytes += len(chunk.encode("utf-8"))
+        self._maybe_write()
+
+    def cache(self, name, hit):
+        """Count a hit or miss on one of the server's caches."""
+        if not self.enabled:
+            return
+        with self._lock:
+            counts = self._cache.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def snapshot(self):
+        """
+        Current metrics as a JSON-serializable dict.
+
+        Returns:
+            ``{"enabled", "uptime_seconds", "requests": [...], "caches": {...}}``
+        """
+        requests = []
+        with self._lock:
+            for (kind, name, component), s in sorted(self._series.items()):
+                requests.append({
+                    "kind": kind,
+                    "name": name,
+                    "component": component or None,
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "latency_ms": {
+                        "mean": round(1000 * s.seconds / s.calls, 3),
+                        "p50": _ms(s.quantile(0.5)),
+                        "p95": _ms(s.quantile(0.95)),
+                        "p99": _ms(s.quantile(0.99)),
+                        "max": _ms(s.max_seconds),
+                    },
+                    "output_bytes": s.bytes,
+                    "output_chars": s.chars,
+                    "output_bytes_mean": round(s.bytes / max(s.calls - s.errors, 1)),
+                })
+            caches = {
+                name: {"hits": h, "misses": m} for name, (h, m) in sorted(self._cache.items())
+            }
+        return {
+            "enabled": self.enabled,
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests": requests,
+            "caches": caches,
+        }
+
+    def render_prometheus(self):
+        """Current metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP kd_ui_request_duration_seconds Request latency by tool or resource.",
+            "# TYPE kd_ui_request_duration_seconds histogram",
+        ]
+        totals = []
+        with self._lock:
+            for (kind, name, component), s in sorted(self._series.items()):
+                labels = f'kind="{kind}",name="{_escape(name)}",component="{_escape(component)}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), s.buckets):
+                    cumulative += count
+                    lines.append(
+                        f'kd_ui_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(f"kd_ui_request_duration_seconds_sum{{{labels}}} {s.seconds:.6f}")
+                lines.append(f"kd_ui_request_duration_seconds_count{{{labels}}} {s.calls}")
+                totals.append((labels, s))
+
+            for metric, help_text, attr in (
+                ("kd_ui_request_errors_total", "Failed requests.", "errors"),
+                ("kd_ui_output_bytes_total", "UTF-8 bytes returned.", "bytes"),
+                ("kd_ui_output_chars_total", "Characters returned.", "chars"),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                lines.extend(f"{metric}{{{labels}}} {getattr(s, attr)}" for labels, s in totals)
+            caches = sorted(self._cache.items())
+
+        lines.append("# HELP kd_ui_cache_requests_total Cache lookups by result.")
+        lines.append("# TYPE kd_ui_cache_requests_total counter")
+        for name, (hits, misses) in caches:
+            cache = f'cache="{_escape(name)}"'
+            lines.append(f'kd_ui_cache_requests_total{{{cache},result="hit"}} {hits}')
+            lines.append(f'kd_ui_cache_requests_total{{{cache},result="miss"}} {misses}')
+        return "\n".join(lines) + "\n"
+
+    def _maybe_write(self):
+        if self.path is None:
+            return
+        now = time.monotonic()
+        if now - self._written >= self.interval:
+            self._written = now
+            self.write()
+
+    def write(self, path=None):
+        """Write Prometheus text atomically (temp file + rename)."""
+        path = path or self.path
+        if path is None:
+            return
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.render_prometheus())
+            os.replace(tmp, path)
+        except OSError:
+            # Metrics must never break request handling
+            pass
+
+
+def _ms(seconds):
+    return None if seconds is None else round(1000 * seconds, 3)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics.from_env()
+
+if metrics.path:
+    atexit.register(metrics.write)
@@ -0,0 +1,184 @@
+"""Tree-structured navigation from a flat adjacency list.
+
+Admin apps usually store navigation as rows ``(id, parent_id, label, url)``.
+``build_tree`` turns them into a tree in one pass, pruning nodes the current
+user may not see; ``render_nav_tree`` renders any depth as nested DaisyUI
+``menu`` lists with native ``<details>`` disclosure.
+
+Collapsed branches are emitted lazily: their children go into an inert
+``<template>`` (or, with ``subtree_url``, are not rendered at all and get
+fetched on first expand), so a 1,500-node tree costs the browser only the
+visible part. The ``navtree`` runtime module materializes them on toggle.
+
+Both functions are O(n) in the number of nodes and iterative, so depth is
+bounded by memory rather than the recursion limit; output is collected in
+one list and joined once.
+"""
+
+from html import escape
+
+
+def build_tree(nodes, can_view=None, id_key="id", parent_key="parent_id"):
+    """
+    Build a navigation tree from a flat list of nodes in linear time.
+
+    Nodes whose ``parent_id`` is None (or missing) are roots. A node the
+    ``can_view`` predicate rejects is pruned together with its whole subtree;
+    nodes whose parent is unknown, and cycles, are unreachable and dropped.
+    Each id appears at most once: a node whose id was already placed (a
+    duplicate, or a node parented to itself or to a descendant) is skipped.
+    Sibling order follows input order.
+
+    Args:
+        nodes: Iterable of dicts with at least ``id`` and ``parent_id``
+            (plus ``label``, ``url``, optional ``icon``, ``open``,
+            ``permission``)
+        can_view: Optional predicate ``node -> bool`` (e.g. a permission check)
+        id_key: Key holding the node id
+        parent_key: Key holding the parent id
+
+    Returns:
+        List of root nodes; each is a shallow copy with a ``children`` list
+    """
+    children = {}
+    for node in nodes:
+        children.setdefault(node.get(parent_key), []).append(node)
+
+    roots = []
+    placed = set()
+    # (source nodes, list to append copies to), walked iteratively
+    stack = [(children.get(None, []), roots)]
+    while stack:
+        source, target = stack.pop()
+        for node in source:
+            if node[id_key] in placed:
+                continue
+            if can_view is not None and not can_view(node):
+                continue
+            placed.add(node[id_key])
+            copy = dict(node, children=[])
+            target.append(copy)
+            kids = children.get(node[id_key])
+            if kids:
+                stack.append((kids, copy["children"]))
+    return roots
+
+
+def permission_predicate(allowed):
+    """Predicate for ``build_tree``: nodes without a ``permission`` are public."""
+    allowed = set(allowed or ())
+    return lambda node: node.get("permission") in (None, "") or node["permission"] in allowed
+
+
+def _active_path(roots, active, id_key="id"):
+    """Ids of the active node and all its ancestors (one DFS, then walk up)."""
+    if active is None:
+        return set()
+    parents = {}
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        if node[id_key] == active:
+            path = {active}
+            parent = parents.get(active)
+            while parent is not None:
+                path.add(parent)
+                parent = parents.get(parent)
+            return path
+        for child in node["children"]:
+            parents[child[id_key]] = node[id_key]
+            stack.append(child)
+    return set()
+
+
+def render_nav_tree(roots, active=None, lazy=True, subtree_url=None, menu_class="menu w-full",
+                    id_key="id", link_attrs=None):
+    """
+    Render a navigation tree of any depth.
+
+    Args:
+        roots: Output of ``build_tree`` (or a node's ``children``, to render a
+            subtree for a ``subtree_url`` endpoint)
+        active: Id of the active node; it is highlighted and its ancestors
+            are expanded
+        lazy: Put children of collapsed branches in a ``<template>``
+        subtree_url: Format string such as ``"/nav/{id}"``; when set,
+            collapsed branches are not rendered and their ``<li>`` items are
+            fetched from this URL on first expand
+        menu_class: Class of the outer ``<ul>``
+        id_key: Key holding the node id (as passed to ``build_tree``)
+        link_attrs: Optional ``node -> str`` of attributes for each leaf
+            link, replacing the ``active`` highlighting (e.g. active state
+            resolved per request in Jinja or in the browser)
+
+    Returns:
+        HTML string
+    """
+    expanded = _active_path(roots, active, id_key)
+    parts = [f'<ul class="{menu_class}">']
+    _render_items(parts, roots, active, expanded, lazy, subtree_url, id_key, link_attrs)
+    parts.append("</ul>")
+    return "".join(parts)
+
+
+def render_nav_items(nodes, active=None, lazy=True, subtree_url=None, id_key="id",
+                     link_attrs=None):
+    """Render only the ``<li>`` items of ``nodes`` (response body for ``subtree_url``)."""
+    parts = []
+    expanded = _active_path(nodes, active, id_key)
+    _render_items(parts, nodes, active, expanded, lazy, subtree_url, id_key, link_attrs)
+    return "".join(parts)
+
+
+def _label(node):
+    icon = node.get("icon")
+    icon_html = ""
+    if icon:
+        icon_html = f'<i data-lucide="{escape(icon)}" class="w-4 h-4 flex-shrink-0"></i>'
+    return f'{icon_html}<span>{escape(str(node.get("label", "")))}</span>'
+
+
+def _render_items(parts, nodes, active, expanded, lazy, subtree_url, id_key, link_attrs):
+    # Nodes still to render, interleaved with the closing markup of their
+    # branches (strings), last first
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            parts.append(node)
+            continue
+        node_id = node[id_key]
+
+        if not node["children"]:
+            url = escape(str(node.get("url") or "#"))
+            if link_attrs is not None:
+                attrs = link_attrs(node)
+            else:
+                attrs = ' class="active" aria-current="page"' if node_id == active else ""
+            parts.append(
+                f'<li data-kd-nav-id="{escape(str(node_id))}">'
+                f'<a href="{url}"{attrs}>{_label(node)}</a></li>'
+            )
+            continue
+
+        is_open = node.get("open", False) or node_id in expanded
+        parts.append(
+            f'<li data-kd-nav-id="{escape(str(node_id))}"><details{" open" if is_open else ""}>'
+            f'<summary>{_label(node)}</summary>'
+        )
+
+        if is_open or not lazy:
+            parts.append("<ul>")
+            stack.append("</ul></details></li>")
+        elif subtree_url:
+            src = escape(subtree_url.format(id=node_id))
+            parts.append(
+                f'<ul data-kd-lazy="pending" data-kd-src="{src}">'
+                '<li><span class="loading loading-dots loading-xs"></span></li></ul>'
+                "</details></li>"
+            )
+            continue
+        else:
+            parts.append('<ul data-kd-lazy="pending"><template>')
+            stack.append("</template></ul></details></li>")
+        stack.extend(reversed(node["children"]))
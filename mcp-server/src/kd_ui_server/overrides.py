@@ -0,0 +1,158 @@
+"""Local overrides for the design system and resource templates.
+
+Point ``KD_UI_OVERRIDES`` at a directory laid out like this::
+
+    design-system.json                   merged over config://design-system
+    templates/components/navbar.html     replaces template://components/navbar
+    templates/layouts/base.html          replaces template://layouts/base
+
+``OverrideWatcher`` polls those files, plus the vendored-asset manifest that
+``template://layouts/base`` is built from, so the server can drop cached
+resources and send ``resources/updated`` to subscribed clients when they
+change. Polling uses ``os.stat`` only: no extra dependency, and nothing to
+do when no overrides are configured.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from .assets import MANIFEST_ENV
+
+OVERRIDES_ENV = "KD_UI_OVERRIDES"
+WATCH_INTERVAL_ENV = "KD_UI_WATCH_INTERVAL"
+
+DESIGN_SYSTEM_FILE = "design-system.json"
+TEMPLATES_DIR = "templates"
+
+
+def overrides_dir():
+    """Override directory from ``$KD_UI_OVERRIDES``, or None."""
+    path = os.environ.get(OVERRIDES_ENV)
+    return Path(path) if path else None
+
+
+def merge(base, override):
+    """Recursively merge ``override`` into a copy of ``base``; non-dict values replace."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def design_system_override(directory=None):
+    """
+    Read ``design-system.json`` from the override directory.
+
+    Returns:
+        Dict to merge over the built-in design system ({} when absent)
+
+    Raises:
+        ValueError: The file exists but is not a JSON object
+    """
+    directory = directory or overrides_dir()
+    if directory is None:
+        return {}
+    path = Path(directory) / DESIGN_SYSTEM_FILE
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"Invalid design-system override {path}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid design-system override {path}: expected a JSON object")
+    return data
+
+
+def template_override(name, directory=None):
+    """Contents of ``templates/<name>.html`` in the override directory, or None."""
+    directory = directory or overrides_dir()
+    if directory is None:
+        return None
+    path = Path(directory) / TEMPLATES_DIR / f"{name}.html"
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def watched_files(directory=None, manifest=None):
+    """
+    Files that resources are built from.
+
+    Returns:
+        Dict of path to the resource URI it affects
+    """
+    directory = directory or overrides_dir()
+    manifest = manifest or os.environ.get(MANIFEST_ENV)
+    files = {}
+    if directory is not None:
+        directory = Path(directory)
+        files[directory / DESIGN_SYSTEM_FILE] = "config://design-system"
+        templates = directory / TEMPLATES_DIR
+        if templates.is_dir():
+            for path in templates.rglob("*.html"):
+                files[path] = "template://" + path.relative_to(templates).with_suffix("").as_posix()
+    if manifest:
+        files[Path(manifest)] = "template://layouts/base"
+    return files
+
+
+class OverrideWatcher:
+    """Detect changes to override files by polling their mtime and size.
+
+    Args:
+        interval: Minimum seconds between scans; 0 disables watching
+        directory: Override directory (default: ``$KD_UI_OVERRIDES``)
+        manifest: Asset manifest path (default: ``$KD_UI_ASSET_MANIFEST``)
+    """
+
+    def __init__(self, interval=1.0, directory=None, manifest=None):
+        self.interval = interval
+        self.directory = directory
+        self.manifest = manifest
+        self._scanned = time.monotonic()
+        self._signatures = self._scan() if interval else {}
+
+    @classmethod
+    def from_env(cls):
+        """Configure from ``KD_UI_WATCH_INTERVAL`` (seconds, default 1)."""
+        return cls(float(os.environ.get(WATCH_INTERVAL_ENV, "1")))
+
+    @property
+    def enabled(self):
+        return bool(self.interval)
+
+    def _scan(self):
+        signatures = {}
+        for path, uri in watched_files(self.directory, self.manifest).items():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            signatures.setdefault(uri, set()).add((str(path), stat.st_mtime_ns, stat.st_size))
+        return signatures
+
+    def poll(self, force=False):
+        """
+        Rescan if ``interval`` has passed (or ``force``).
+
+        Returns:
+            Set of resource URIs whose files were added, changed or removed
+        """
+        if not self.interval:
+            return set()
+        now = time.monotonic()
+        if not force and now - self._scanned < self.interval:
+            return set()
+        self._scanned = now
+        signatures = self._scan()
+        changed = {uri for uri in signatures.keys() | self._signatures.keys()
+                   if signatures.get(uri) != self._signatures.get(uri)}
+        self._signatures = signatures
+        return changed
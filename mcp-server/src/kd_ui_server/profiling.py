@@ -0,0 +1,204 @@
+"""Opt-in profiling of individual generator calls.
+
+Any tool call can carry ``"profile": true``; the server then runs it under a
+deterministic stack profiler, saves the profile as collapsed stacks (one
+``frame;frame;frame microseconds`` line per distinct stack, the input format
+of flamegraph.pl, speedscope and inferno) next to the request that produced
+it, and returns a short summary after the output. ``KD_UI_PROFILE=1``
+profiles every call and only saves the files. ``kd-ui-profile`` replays a
+saved (or recorded) request offline.
+
+The profiler hooks ``sys.setprofile`` for the duration of one call only, so
+unprofiled calls pay nothing.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+PROFILE_ENV = "KD_UI_PROFILE"
+PROFILE_DIR_ENV = "KD_UI_PROFILE_DIR"
+
+PROFILE_ALL = os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _builtin_name(func):
+    module = getattr(func, "__module__", None) or type(getattr(func, "__self__", None)).__name__
+    return f"{module}:{getattr(func, '__qualname__', repr(func))}"
+
+
+class StackProfiler:
+    """Deterministic profiler that records self time per call stack.
+
+    Usage::
+
+        profiler = StackProfiler()
+        with profiler:
+            add_component("sidebar")
+        print(profiler.collapsed())
+    """
+
+    def __init__(self):
+        self.stacks = Counter()  # tuple of frame names -> self time in ns
+        self.calls = 0
+        self._stack = []
+        self._last = 0
+
+    def _callback(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        if self._stack:
+            self.stacks[tuple(self._stack)] += now - self._last
+        if event == "call":
+            self._stack.append(_frame_name(frame))
+            self.calls += 1
+        elif event == "c_call":
+            self._stack.append(_builtin_name(arg))
+            self.calls += 1
+        elif self._stack:
+            # return, c_return, c_exception (the first one is __enter__'s own)
+            self._stack.pop()
+        self._last = time.perf_counter_ns()
+
+    def __enter__(self):
+        self._stack = []
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._callback)
+        return self
+
+    def __exit__(self, *exc):
+        sys.setprofile(None)
+        self._stack = []
+        # Drop the profiler's own teardown (this frame + the setprofile call)
+        own = _frame_name(sys._getframe())
+        for stack in [stack for stack in self.stacks if stack[0] == own]:
+            del self.stacks[stack]
+        self.calls -= 2
+        return False
+
+    @property
+    def total_ns(self):
+        return sum(self.stacks.values())
+
+    def collapsed(self):
+        """Collapsed stacks, one ``a;b;c <microseconds>`` line per stack."""
+        lines = []
+        for stack, ns in sorted(self.stacks.items()):
+            us = ns // 1000
+            if us:
+                lines.append(f"{';'.join(stack)} {us}")
+        return "\n".join(lines) + "\n"
+
+    def top(self, n=10):
+        """
+        Frames with the most self time.
+
+        Returns:
+            List of ``(frame, self_ns)``, largest first
+        """
+        self_time = Counter()
+        for stack, ns in self.stacks.items():
+            self_time[stack[-1]] += ns
+        return self_time.most_common(n)
+
+
+def profile_call(fn, *args, repeat=1, **kwargs):
+    """
+    Call ``fn`` under a ``StackProfiler``.
+
+    Args:
+        fn: Callable to profile
+        repeat: Number of calls, aggregated into one profile
+        *args, **kwargs: Passed to ``fn``
+
+    Returns:
+        ``(result of the last call, profiler)``
+    """
+    profiler = StackProfiler()
+    result = None
+    for _ in range(repeat):
+        with profiler:
+            result = fn(*args, **kwargs)
+    return result, profiler
+
+
+def profile_dir():
+    """Directory profiles are saved to (``$KD_UI_PROFILE_DIR`` or a temp folder)."""
+    path = Path(os.environ.get(PROFILE_DIR_ENV) or Path(tempfile.gettempdir()) / "kd-ui-profiles")
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def save_profile(profiler, name, arguments, directory=None):
+    """
+    Write ``<stem>.folded`` and the request that produced it, ``<stem>.request.json``.
+
+    Args:
+        profiler: Finished ``StackProfiler``
+        name: Tool name
+        arguments: Tool arguments (without the ``profile`` meta-argument)
+        directory: Target folder (default: ``profile_dir()``)
+
+    Returns:
+        Path of the ``.folded`` file
+    """
+    directory = Path(directory) if directory else profile_dir()
+    label = name
+    if arguments.get("component_type"):
+        label += f"-{arguments['component_type']}"
+    unique = f"{os.getpid()}-{time.perf_counter_ns() % 10**6:06d}"
+    stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{unique}-{label}"
+
+    folded = directory / f"{stem}.folded"
+    folded.write_text(profiler.collapsed(), encoding="utf-8")
+    request = {"name": name, "arguments": arguments}
+    (directory / f"{stem}.request.json").write_text(json.dumps(request, indent=2), encoding="utf-8")
+    return folded
+
+
+def profile_summary(profiler, path=None, n=10):
+    """Short text report: total time, call count and the top frames by self time."""
+    lines = [f"Profile: {profiler.total_ns / 1e6:.2f} ms in {profiler.calls} calls"]
+    if path is not None:
+        lines.append(f"Collapsed stacks: {path}")
+    lines.append("Top frames by self time:")
+    for frame, ns in profiler.top(n):
+        lines.append(f"  {ns / 1e6:9.3f} ms  {frame}")
+    return "\n".join(lines)
+
+
+def load_request(path, index=0):
+    """
+    Load a tool call to replay.
+
+    Accepts a saved ``.request.json`` (``{"name", "arguments"}``), a single
+    JSON-RPC ``tools/call`` message, or a JSON Lines recording, from which the
+    ``index``-th ``tools/call`` request is taken.
+
+    Returns:
+        ``(name, arguments)``
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    try:
+        messages = [json.loads(text)]
+    except ValueError:
+        messages = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    calls = []
+    for message in messages:
+        if message.get("method") == "tools/call":
+            message = message.get("params", {})
+        if "name" in message:
+            calls.append((message["name"], message.get("arguments") or {}))
+    if index >= len(calls):
+        raise ValueError(f"{path} holds {len(calls)} tool call(s); no index {index}")
+    return calls[index]
@@ -1,5 +1,8 @@
 """Resource templates and documentation for KD UI Framework."""
 
+from .assets import VENDOR_ASSETS, head_tags, load_manifest
+from .runtime import runtime_script, sidebar_state_script
+
 
 class ComponentTemplates:
     """Manage component templates and best practices."""
@@ -382,25 +385,37 @@ Next Section Title
 - Predictable navigation patterns
 """
     
-    def _get_base_layout(self):
-        """Base Flask layout template."""
+    def _get_base_layout(self, manifest=None):
+        """Base Flask layout template.
+
+        Uses the vendored, fingerprinted assets when a manifest is given or
+        configured (see ``kd-ui-assets``), otherwise the pinned CDN copies.
+        """
+        manifest = manifest or load_manifest()
+        if manifest:
+            vendor_head = head_tags(manifest)
+        else:
+            vendor_head = f'''    <!-- Chart.js is loaded on demand by chart components -->
+    
+    <!-- Font (Optional but recommended) -->
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="{VENDOR_ASSETS["inter"]["url"]}" rel="stylesheet">'''
+
         return '''<!DOCTYPE html>
-<html lang="en" data-theme="light">
+<html lang="en" data-theme="light"
+      {%- if kd_sidebar_attrs is defined %}{{ kd_sidebar_attrs() }}{% endif %}>
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <!-- Restore persisted sidebar state before first paint -->
+    ''' + sidebar_state_script() + '''
     <title>{% block title %}Dashboard{% endblock %}</title>
     
     <!-- Tailwind CSS + DaisyUI -->
     <link href="{{ url_for('static', filename='dist/output.css') }}" rel="stylesheet">
     
-    <!-- Chart.js for charts -->
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.js"></script>
-    
-    <!-- Font (Optional but recommended) -->
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
+''' + vendor_head + '''
     
     <style>
         body {
@@ -410,7 +425,7 @@ Next Section Title
     
     {% block extra_head %}{% endblock %}
 </head>
-<body class="bg-base-200">
+<body class="bg-base-200" data-active-path="{{ request.path }}">
     {% block content %}{% endblock %}
     
     <script src="{{ url_for('static', filename='js/main.js') }}"></script>
@@ -435,34 +450,26 @@ Next Section Title
     def _get_chart_container_template(self):
         """Chart container template."""
         return '''<!-- Chart Container Component -->
+<!-- Chart.js loads on demand; the chart initialises when scrolled into view -->
 <div class="card bg-base-100 shadow-xl">
   <div class="card-body">
     <h2 class="card-title">{{ chart_title }}</h2>
-    <canvas id="{{ chart_id }}"></canvas>
+    <canvas id="{{ chart_id }}" data-kd-chart="{{ chart_id }}-config"></canvas>
   </div>
 </div>
 
-<script>
-document.addEventListener('DOMContentLoaded', function() {
-    const ctx = document.getElementById('{{ chart_id }}');
-    if (ctx) {
-        new Chart(ctx, {
-            type: '{{ chart_type|default("line") }}',
-            data: {{ chart_data|tojson|safe }},
-            options: {
-                responsive: true,
-                maintainAspectRatio: true,
-                plugins: {
-                    legend: {
-                        position: 'top',
-                    }
-                }
-            }
-        });
-    }
-});
+<script type="application/json" id="{{ chart_id }}-config">
+{
+  "type": {{ chart_type|default("line")|tojson }},
+  "data": {{ chart_data|tojson }},
+  "options": {
+    "responsive": true,
+    "maintainAspectRatio": true,
+    "plugins": { "legend": { "position": "top" } }
+  }
+}
 </script>
-'''
+''' + runtime_script("charts")
     
     def _get_sidebar_template(self):
         """Sidebar template."""
@@ -0,0 +1,87 @@
+"""Active-route resolution for navigation components.
+
+Navigation generated with ``active_mode: "route"`` does not hard-code which
+item is active. The template asks ``kd_nav_active(request.path, urls)`` once
+per render; the answer comes from a prefix trie over the nav's item URLs,
+built once per distinct URL set and cached for the life of the process. A
+lookup walks the request path segment by segment, so it costs O(path length)
+however many items the navigation has, and the generated fragment is the
+same for every page and user.
+
+Matching is by longest segment prefix: ``/reports/sales/2024`` activates the
+``/reports/sales`` item. The root URL ``/`` only matches itself.
+"""
+
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+_END = object()
+
+
+def _segments(url):
+    return [segment for segment in urlsplit(url).path.split("/") if segment]
+
+
+def is_routable(url):
+    """Whether a nav URL takes part in matching (site-relative paths only)."""
+    return bool(url) and url.startswith("/") and not url.startswith("//")
+
+
+class RouteTrie:
+    """Prefix trie over URL path segments."""
+
+    def __init__(self, urls=()):
+        self._root = {}
+        for url in urls:
+            self.add(url)
+
+    def add(self, url, value=None):
+        """Register a URL; ``value`` (default: the URL) is returned on match."""
+        if not is_routable(url):
+            return
+        node = self._root
+        for segment in _segments(url):
+            node = node.setdefault(segment, {})
+        node[_END] = url if value is None else value
+
+    def match(self, path):
+        """
+        Resolve a request path to the most specific registered URL.
+
+        Args:
+            path: Request path, e.g. ``request.path``
+
+        Returns:
+            The matched URL (or value), or None
+        """
+        segments = _segments(path or "/")
+        if not segments:
+            return self._root.get(_END)
+
+        node, best = self._root, None
+        for segment in segments:
+            node = node.get(segment)
+            if node is None:
+                break
+            best = node.get(_END, best)
+        return best
+
+
+@lru_cache(maxsize=128)
+def route_trie(urls):
+    """Return the (cached) trie for a tuple of URLs."""
+    return RouteTrie(urls)
+
+
+def resolve_active(path, urls):
+    """
+    Jinja global ``kd_nav_active``: the nav URL that is active for ``path``.
+
+    Args:
+        path: Request path
+        urls: Item URLs of one navigation component
+
+    Returns:
+        Matched URL, or None
+    """
+    return route_trie(tuple(urls)).match(path)
@@ -0,0 +1,843 @@
+"""Shared client-side runtime for KD UI components.
+
+Interactive components used to inline their own bootstrap JavaScript in every
+instance. Instead, each behaviour lives here once as a runtime module, emitted
+as ``<script data-kd-runtime="name">``. Components include the module they need
+(unless ``include_runtime`` is false) and every module guards itself against
+double initialisation, so repeated fragments are harmless; page composition
+can drop duplicates by the ``data-kd-runtime`` marker.
+"""
+
+import json
+
+from .assets import CHARTJS_VERSION
+from .icons import render_icon
+
+CHARTJS_ESM_URL = f"https://cdn.jsdelivr.net/npm/chart.js@{CHARTJS_VERSION}/+esm"
+
+SIDEBAR_COOKIE_PREFIX = "kd_sidebar_"
+
+# Copies persisted sidebar state from cookies onto <html> before first paint.
+# Must run in <head> (or right before the sidebar); a no-op when the server
+# already rendered the attributes.
+_SIDEBAR_STATE_JS = (
+    "(function(){var d=document.documentElement;"
+    "if(d.hasAttribute('data-kd-sidebar-open'))return;var c=[],o=[];"
+    "document.cookie.split('; ').forEach(function(p){"
+    "if(p.indexOf('%(prefix)s'))return;var i=p.indexOf('='),id=p.slice(%(n)d,i),"
+    "v=decodeURIComponent(p.slice(i+1)).split(':');if(v[0]==='c')c.push(id);"
+    "(v[1]||'').split('.').forEach(function(k){if(k)o.push(id+'/'+k)})});"
+    "d.setAttribute('data-kd-sidebar-collapsed',c.join(' '));"
+    "d.setAttribute('data-kd-sidebar-open',o.join(' '))})();"
+) % {"prefix": SIDEBAR_COOKIE_PREFIX, "n": len(SIDEBAR_COOKIE_PREFIX)}
+
+# Lazy Chart.js: one shared loader promise, charts initialised when scrolled into view
+_CHARTS_JS = """(function() {
+  if (window.kdCharts) return;
+
+  var loader = null;
+
+  // Vendored UMD build with its manifest hash: a classic script, the only
+  // way a lazy load can carry an integrity check. It registers window.Chart.
+  function script(src, integrity) {
+    return new Promise(function(resolve, reject) {
+      var el = document.createElement('script');
+      el.src = src;
+      el.integrity = integrity;
+      el.crossOrigin = 'anonymous';
+      el.onload = function() {
+        window.Chart ? resolve(window.Chart) : reject(new Error('Chart.js did not register'));
+      };
+      el.onerror = function() {
+        el.remove();
+        reject(new Error('Chart.js failed to load or to verify: ' + src));
+      };
+      document.head.appendChild(el);
+    });
+  }
+
+  // Download Chart.js once, on first demand. window.KD_CHART_SRC may point at
+  // a vendored copy (see assets.head_tags); otherwise the ESM build is imported.
+  function load() {
+    if (window.Chart) return Promise.resolve(window.Chart);
+    if (!loader) {
+      loader = (window.KD_CHART_SRC && window.KD_CHART_INTEGRITY
+        ? script(window.KD_CHART_SRC, window.KD_CHART_INTEGRITY)
+        : import(window.KD_CHART_SRC || '%(esm_url)s').then(function(m) {
+            var Chart = (m && m.Chart) || window.Chart;
+            if (m && m.registerables) Chart.register.apply(Chart, m.registerables);
+            return Chart;
+          })
+      ).catch(function(err) {
+        loader = null;  // let the next chart retry
+        throw err;
+      });
+    }
+    return loader;
+  }
+
+  // Library or data failed to load: say so in place of the chart
+  function fail(canvas, err) {
+    if (window.console) console.error('kdCharts:', err);
+    var box = document.createElement('div');
+    box.className = 'flex items-center justify-center h-full text-sm text-error';
+    box.setAttribute('role', 'alert');
+    box.textContent = 'Chart could not be loaded.';
+    canvas.style.display = 'none';
+    canvas.parentNode.insertBefore(box, canvas.nextSibling);
+  }
+
+  function init(canvas) {
+    if (canvas.dataset.kdChartReady) return;
+    canvas.dataset.kdChartReady = '1';
+    var source = document.getElementById(canvas.dataset.kdChart);
+    if (!source) return;
+    var config = JSON.parse(source.textContent);
+
+    // Data endpoint (data-kd-chart-src) is fetched in parallel with the library
+    var src = canvas.dataset.kdChartSrc;
+    var data = src
+      ? fetch(src, { credentials: 'same-origin', headers: { 'Accept': 'application/json' } })
+          .then(function(r) {
+            if (!r.ok) throw new Error(src + ': HTTP ' + r.status);
+            return r.json();
+          })
+      : Promise.resolve(null);
+
+    Promise.all([load(), data]).then(function(res) {
+      if (res[1]) config.data = res[1];
+      canvas.kdChart = new res[0](canvas, config);
+    }).catch(function(err) { fail(canvas, err); });
+  }
+
+  var observer = ('IntersectionObserver' in window) ? new IntersectionObserver(function(entries) {
+    entries.forEach(function(entry) {
+      if (!entry.isIntersecting) return;
+      observer.unobserve(entry.target);
+      init(entry.target);
+    });
+  }, { rootMargin: '200px' }) : null;
+
+  function scan(root) {
+    (root || document).querySelectorAll('canvas[data-kd-chart]').forEach(function(canvas) {
+      if (canvas.dataset.kdChartSeen) return;
+      canvas.dataset.kdChartSeen = '1';
+      observer ? observer.observe(canvas) : init(canvas);
+    });
+  }
+
+  window.kdCharts = { load: load, init: init, scan: scan };
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', function() { scan(); });
+  } else {
+    scan();
+  }
+})();""" % {"esm_url": CHARTJS_ESM_URL}
+
+# HTML fragments fetched once per URL and mounted into placeholders (used by
+# lazy tabs and modals)
+_FRAGMENTS_JS = """(function() {
+  if (window.kdFragments) return;
+
+  // One request per URL for the life of the page, shared by every consumer;
+  // failures are evicted so the next attempt retries
+  var cache = {};
+
+  function load(url) {
+    if (!cache[url]) {
+      cache[url] = fetch(url, { credentials: 'same-origin', headers: { 'Accept': 'text/html' } })
+        .then(function(r) {
+          if (!r.ok) throw new Error(r.status);
+          return r.text();
+        })
+        .catch(function(err) { delete cache[url]; throw err; });
+    }
+    return cache[url];
+  }
+
+  // Parsed scripts are marked "already started" and never run, even when
+  // cloned, so each is recreated before insertion; the fragment's runtimes,
+  // chart setup and table scripts then run in document order
+  function mount(el, html) {
+    var tpl = document.createElement('template');
+    tpl.innerHTML = html;
+    tpl.content.querySelectorAll('script').forEach(function(old) {
+      var script = document.createElement('script');
+      for (var i = 0; i < old.attributes.length; i++) {
+        script.setAttribute(old.attributes[i].name, old.attributes[i].value);
+      }
+      if (old.src) script.async = false;
+      script.text = old.textContent;
+      old.replaceWith(script);
+    });
+    el.replaceChildren(tpl.content);
+    el.dataset.kdLazy = 'loaded';
+    if (window.kdCharts) window.kdCharts.scan(el);
+    if (window.htmx) window.htmx.process(el);
+    if (typeof lucide !== 'undefined') lucide.createIcons();
+  }
+
+  // Materialize a data-kd-lazy="pending" element from its <template> or data-kd-src
+  function activate(el) {
+    if (!el || el.dataset.kdLazy !== 'pending') return;
+    el.dataset.kdLazy = 'loading';
+
+    var tpl = el.querySelector('template');
+    if (tpl) {
+      mount(el, tpl.innerHTML);
+      return;
+    }
+    load(el.dataset.kdSrc).then(function(html) {
+      mount(el, html);
+    }, function() {
+      el.dataset.kdLazy = 'pending';
+    });
+  }
+
+  window.kdFragments = { load: load, mount: mount, activate: activate };
+})();"""
+
+# Lazy tab panels: materialized on first activation
+_TABS_JS = """(function() {
+  if (window.kdTabs) return;
+
+  // Each radio tab is immediately followed by its panel
+  document.addEventListener('change', function(e) {
+    var tab = e.target;
+    if (tab.matches && tab.matches('input[data-kd-tab]') && tab.checked) {
+      window.kdFragments.activate(tab.nextElementSibling);
+    }
+  });
+
+  window.kdTabs = { activate: function(panel) { window.kdFragments.activate(panel); } };
+})();"""
+
+# Fetch-on-open modals, with optional preload when the trigger is hovered
+_MODALS_JS = """(function() {
+  if (window.kdModals) return;
+
+  function body(id) {
+    return document.querySelector('[data-kd-modal-body="' + id + '"]');
+  }
+
+  document.addEventListener('change', function(e) {
+    var toggle = e.target;
+    if (toggle.matches && toggle.matches('input[data-kd-modal]') && toggle.checked) {
+      window.kdFragments.activate(body(toggle.id));
+    }
+  });
+
+  // Warm the fragment cache on hover/focus; mounting still waits for open
+  function preload(e) {
+    var trigger = e.target.closest && e.target.closest('[data-kd-preload]');
+    if (trigger && !trigger.dataset.kdPreloaded) {
+      trigger.dataset.kdPreloaded = '1';
+      window.kdFragments.load(trigger.dataset.kdPreload).catch(function() {
+        delete trigger.dataset.kdPreloaded;
+      });
+    }
+  }
+  document.addEventListener('mouseover', preload, { passive: true });
+  document.addEventListener('focusin', preload);
+
+  window.kdModals = { open: function(id) {
+    var toggle = document.getElementById(id);
+    if (!toggle) return;
+    toggle.checked = true;
+    window.kdFragments.activate(body(id));
+  } };
+})();"""
+
+# Toast manager: bounded queue, max visible per stack, identical messages
+# coalesced into a counter, and one shared timer for every expiry
+_TOASTS_JS = """(function() {
+  if (window.kdToast) return;
+
+  var config = { maxVisible: 5, maxQueue: 20 };
+  var LEAVE_MS = 300;
+
+  var posStyles = {
+    'top-right':    'top:16px; right:16px;',
+    'top-left':     'top:16px; left:16px;',
+    'top-center':   'top:16px; left:0; right:0; margin:0 auto; max-width:400px;',
+    'bottom-right': 'bottom:16px; right:16px;',
+    'bottom-left':  'bottom:16px; left:16px;',
+    'bottom-center':'bottom:16px; left:0; right:0; margin:0 auto; max-width:400px;'
+  };
+
+  // type -> [inline svg, sprite <use> reference]
+  var icons = %(icons)s;
+
+  var stacks = {};     // position -> { el, visible: [], queue: [] }
+  var leaving = [];    // toasts fading out, removed by the timer
+  var entering = [];   // toasts waiting for the next animation frame
+  var timer = null;
+
+  function stack(position) {
+    if (!posStyles[position]) position = 'top-right';
+    if (!stacks[position]) {
+      var el = document.createElement('div');
+      el.id = 'kd-toast-container-' + position;
+      el.style.cssText = 'position:fixed; z-index:9999; pointer-events:none; display:flex; '
+        + 'flex-direction:column; gap:8px; width:360px; ' + posStyles[position];
+      document.body.appendChild(el);
+      stacks[position] = { el: el, visible: [], queue: [] };
+    }
+    return stacks[position];
+  }
+
+  function find(list, key) {
+    for (var i = 0; i < list.length; i++) {
+      if (list[i].key === key) return list[i];
+    }
+    return null;
+  }
+
+  // One timeout, armed for the earliest pending expiry or removal
+  function schedule() {
+    var next = Infinity;
+    Object.keys(stacks).forEach(function(pos) {
+      stacks[pos].visible.forEach(function(t) {
+        if (t.expires && t.expires < next) next = t.expires;
+      });
+    });
+    leaving.forEach(function(t) { if (t.removeAt < next) next = t.removeAt; });
+
+    if (timer) clearTimeout(timer);
+    timer = (next === Infinity) ? null : setTimeout(tick, Math.max(0, next - Date.now()));
+  }
+
+  function tick() {
+    timer = null;
+    var now = Date.now();
+    leaving = leaving.filter(function(t) {
+      if (t.removeAt > now) return true;
+      t.el.remove();
+      return false;
+    });
+    Object.keys(stacks).forEach(function(pos) {
+      stacks[pos].visible.slice().forEach(function(t) {
+        if (t.expires && t.expires <= now) close(t, true);
+      });
+    });
+    schedule();
+  }
+
+  // Entrance transitions for everything mounted in the same frame
+  function flushEntering() {
+    entering.forEach(function(el) {
+      el.style.opacity = '1';
+      el.style.transform = 'translateX(0)';
+    });
+    entering = [];
+  }
+
+  function mount(s, t) {
+    var el = document.createElement('div');
+    el.className = 'alert alert-' + t.type + ' shadow-lg';
+    el.style.cssText = 'pointer-events:auto; opacity:0; transform:translateX(20px); '
+      + 'transition:opacity 300ms ease, transform 300ms ease; border-radius:6px;';
+
+    var icon = (icons[t.type] || icons.info)[t.sprite ? 1 : 0];
+    var closeBtn = t.dismissable
+      ? '<button onclick="kdToast.dismiss(this)" style="margin-left:auto; background:none; '
+        + 'border:none; cursor:pointer; padding:0; line-height:1; font-size:1.25rem; opacity:0.7;" '
+        + 'aria-label="Close">&times;</button>'
+      : '';
+    // Only the trusted icon and button markup go through innerHTML; the
+    // message (possibly server-sent, see notifications) is always text
+    el.innerHTML = icon + '<span style="flex:1" data-kd-toast-message></span>'
+      + '<span class="badge badge-sm" data-kd-toast-count hidden></span>' + closeBtn;
+    el.querySelector('[data-kd-toast-message]').textContent = t.message;
+
+    el.kdToast = t;
+    t.el = el;
+    t.stack = s;
+    if (t.duration > 0) t.expires = Date.now() + t.duration;
+    s.visible.push(t);
+    s.el.appendChild(el);
+    if (t.count > 1) counter(t);
+
+    entering.push(el);
+    if (entering.length === 1) {
+      requestAnimationFrame(function() { requestAnimationFrame(flushEntering); });
+    }
+  }
+
+  function counter(t) {
+    var badge = t.el.querySelector('[data-kd-toast-count]');
+    badge.textContent = '\\u00d7' + t.count;
+    badge.hidden = false;
+  }
+
+  function close(t, fromTimer) {
+    if (t.removeAt) return;
+    var s = t.stack;
+    s.visible.splice(s.visible.indexOf(t), 1);
+    t.removeAt = Date.now() + LEAVE_MS;
+    t.el.style.opacity = '0';
+    t.el.style.transform = 'translateX(20px)';
+    leaving.push(t);
+    if (s.queue.length) mount(s, s.queue.shift());
+    if (!fromTimer) schedule();
+  }
+
+  function show(type, message, opts) {
+    opts = opts || {};
+    var s = stack(opts.position || 'top-right');
+    var key = type + '|' + message;
+
+    var same = find(s.visible, key) || find(s.queue, key);
+    if (same) {
+      same.count++;
+      if (same.el) {
+        counter(same);
+        if (same.duration > 0) same.expires = Date.now() + same.duration;
+        schedule();
+      }
+      return;
+    }
+
+    var t = {
+      key: key,
+      type: type,
+      message: message,
+      duration: (opts.duration !== undefined) ? opts.duration : 4000,
+      dismissable: (opts.dismissable !== undefined) ? opts.dismissable : true,
+      sprite: !!opts.sprite,
+      count: 1
+    };
+    if (s.visible.length < config.maxVisible) {
+      mount(s, t);
+      schedule();
+    } else {
+      // Bounded backlog: the oldest waiting toast is dropped first
+      s.queue.push(t);
+      if (s.queue.length > config.maxQueue) s.queue.shift();
+    }
+  }
+
+  function dismiss(target) {
+    var el = target && target.closest ? target.closest('.alert') : target;
+    if (el && el.kdToast) close(el.kdToast);
+  }
+
+  window.kdToast = {
+    show: show,
+    dismiss: dismiss,
+    configure: function(opts) {
+      for (var k in opts) config[k] = opts[k];
+    }
+  };
+  // Names used by earlier generated templates
+  window.kdShowAlert = show;
+  window.kdDismissAlert = dismiss;
+
+  // Toasts requested before this module loaded
+  function drain() {
+    var pending = window.kdToastQueue || [];
+    window.kdToastQueue = null;
+    pending.forEach(function(args) { show.apply(null, args); });
+  }
+  if (document.body) {
+    drain();
+  } else {
+    document.addEventListener('DOMContentLoaded', drain);
+  }
+})();""" % {"icons": json.dumps({
+    kind: [
+        render_icon(f"alert-{kind}", mode, cls="stroke-current shrink-0 w-6 h-6")
+        for mode in ("inline", "sprite")
+    ]
+    for kind in ("info", "success", "warning", "error")
+})}
+
+# Live toasts from a Server-Sent Events stream (one EventSource per URL)
+_NOTIFICATIONS_JS = """(function() {
+  if (window.kdFeeds) return;
+
+  var sources = {};    // url -> EventSource, shared by every feed on the page
+  var listening = {};  // url#topic -> true
+
+  function toast(e, position) {
+    var msg;
+    try { msg = JSON.parse(e.data); } catch (err) { msg = { message: e.data }; }
+    window.kdToast.show(msg.type || 'info', msg.message || '', {
+      duration: msg.duration,
+      position: position
+    });
+  }
+
+  function connect(el) {
+    if (el.dataset.kdFeedReady) return;
+    el.dataset.kdFeedReady = '1';
+    var url = el.dataset.kdFeed;
+    var position = el.dataset.kdFeedPosition || 'top-right';
+    // EventSource reconnects on its own and sends Last-Event-ID; the bus
+    // replays what was missed (events.EventBus history)
+    var source = sources[url] || (sources[url] = new EventSource(url, { withCredentials: true }));
+
+    (el.dataset.kdFeedTopics || 'notification').split(',').forEach(function(topic) {
+      if (listening[url + '#' + topic]) return;
+      listening[url + '#' + topic] = true;
+      source.addEventListener(topic, function(e) { toast(e, position); });
+    });
+  }
+
+  function scan(root) {
+    (root || document).querySelectorAll('[data-kd-feed]').forEach(connect);
+  }
+
+  // Release the server-side connection as soon as the page goes away
+  window.addEventListener('pagehide', function() {
+    Object.keys(sources).forEach(function(url) { sources[url].close(); });
+    sources = {};
+    listening = {};
+  });
+
+  window.kdFeeds = { connect: connect, scan: scan };
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', function() { scan(); });
+  } else {
+    scan();
+  }
+})();"""
+
+# One controller for every [data-kd-dropdown] trigger on the page
+_DROPDOWNS_JS = """(function() {
+  if (window.kdDropdowns) return;
+
+  var current = null;  // { trigger, menu } of the open dropdown
+  var menus = new WeakMap();
+  var frame = 0;
+
+  // The menu follows its trigger in the markup, so dropdowns repeated in a
+  // template loop still pair up even if their ids collide
+  function menuFor(trigger) {
+    var menu = menus.get(trigger);
+    if (!menu) {
+      var next = trigger.nextElementSibling;
+      menu = (next && next.getAttribute('role') === 'menu')
+        ? next : document.getElementById(trigger.getAttribute('aria-controls'));
+      if (!menu) return null;
+      // Move to body on first use so overflow/stacking contexts can't clip it
+      document.body.appendChild(menu);
+      menus.set(trigger, menu);
+    }
+    return menu;
+  }
+
+  // Measure and place in one animation frame; repeated requests (scroll,
+  // resize) within a frame collapse into a single read/write pass
+  function position() {
+    if (frame) return;
+    frame = requestAnimationFrame(function() {
+      frame = 0;
+      if (!current) return;
+      var trigger = current.trigger, menu = current.menu;
+      var rect = trigger.getBoundingClientRect();
+      if (rect.bottom < 0 || rect.top > window.innerHeight) {
+        close();
+        return;
+      }
+      var menuW = menu.offsetWidth, menuH = menu.offsetHeight;
+      var align = trigger.dataset.kdAlign || 'end';
+      var left = align === 'start' ? rect.left
+        : align === 'center' ? rect.left + rect.width / 2 - menuW / 2
+        : rect.right - menuW;
+      var spaceBelow = window.innerHeight - rect.bottom;
+
+      menu.style.top = (spaceBelow > menuH + 8 ? rect.bottom + 4 : rect.top - menuH - 4) + 'px';
+      menu.style.left = Math.max(8, Math.min(left, window.innerWidth - menuW - 8)) + 'px';
+      menu.style.visibility = 'visible';
+    });
+  }
+
+  function open(trigger) {
+    var menu = menuFor(trigger);
+    if (!menu) return;
+    if (current) close();
+    current = { trigger: trigger, menu: menu };
+    menu.style.visibility = 'hidden';
+    menu.hidden = false;
+    trigger.setAttribute('aria-expanded', 'true');
+    if (!menu.dataset.kdIcons && typeof lucide !== 'undefined') {
+      menu.dataset.kdIcons = '1';
+      lucide.createIcons();
+    }
+    position();
+  }
+
+  function close() {
+    if (!current) return;
+    current.menu.hidden = true;
+    current.trigger.setAttribute('aria-expanded', 'false');
+    current = null;
+  }
+
+  document.addEventListener('click', function(e) {
+    var trigger = e.target.closest && e.target.closest('[data-kd-dropdown]');
+    if (trigger) {
+      var same = current && current.trigger === trigger;
+      close();
+      if (!same) open(trigger);
+    } else if (current && !current.menu.contains(e.target)) {
+      close();
+    }
+  });
+
+  document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape' && current) {
+      var trigger = current.trigger;
+      close();
+      trigger.focus();
+    }
+  });
+
+  // Capture phase so scrolling inside any container also repositions
+  document.addEventListener('scroll', function() { if (current) position(); },
+    { capture: true, passive: true });
+  window.addEventListener('resize', function() { if (current) position(); }, { passive: true });
+
+  window.kdDropdowns = { open: open, close: close };
+})();"""
+
+# Collapsible sidebar: state lives in <html> attributes driven by CSS, and is
+# persisted in a kd_sidebar_<id> cookie so the server can render it too
+_SIDEBAR_JS = """(function() {
+  if (window.kdSidebar) return;
+
+  var root = document.documentElement;
+
+  function tokens(attr) {
+    return (root.getAttribute(attr) || '').split(' ').filter(Boolean);
+  }
+
+  function toggle(attr, token) {
+    var list = tokens(attr), i = list.indexOf(token);
+    if (i < 0) list.push(token); else list.splice(i, 1);
+    root.setAttribute(attr, list.join(' '));
+    return i < 0;
+  }
+
+  function save(id) {
+    var prefix = id + '/';
+    var open = tokens('data-kd-sidebar-open')
+      .filter(function(t) { return t.indexOf(prefix) === 0; })
+      .map(function(t) { return t.slice(prefix.length); });
+    var collapsed = tokens('data-kd-sidebar-collapsed').indexOf(id) >= 0;
+    document.cookie = '%(prefix)s' + id + '=' + (collapsed ? 'c' : 'e') + ':' + open.join('.')
+      + '; path=/; max-age=31536000; SameSite=Lax';
+  }
+
+  document.addEventListener('click', function(e) {
+    var el = e.target.closest && e.target.closest('[data-kd-sidebar-toggle], [data-kd-submenu]');
+    var sidebar = el && el.closest('[data-kd-sidebar]');
+    if (!sidebar) return;
+
+    if (el.hasAttribute('data-kd-sidebar-toggle')) {
+      toggle('data-kd-sidebar-collapsed', sidebar.id);
+    } else {
+      e.preventDefault();
+      var open = toggle('data-kd-sidebar-open', sidebar.id + '/' + el.dataset.kdSubmenu);
+      el.setAttribute('aria-expanded', open ? 'true' : 'false');
+    }
+    save(sidebar.id);
+  });
+
+  window.kdSidebar = { save: save };
+})();""" % {"prefix": SIDEBAR_COOKIE_PREFIX}
+
+# Nested <details> navigation: collapsed branches materialized on first expand
+_NAVTREE_JS = """(function() {
+  if (window.kdNavTree) return;
+
+  // toggle does not bubble; listen in the capture phase instead
+  document.addEventListener('toggle', function(e) {
+    var details = e.target;
+    if (details.tagName !== 'DETAILS' || !details.open) return;
+    var pending = details.querySelector(':scope > [data-kd-lazy="pending"]');
+    if (pending) window.kdFragments.activate(pending);
+  }, true);
+
+  window.kdNavTree = {};
+})();"""
+
+# Per-request active overlay: nav markup is page-independent (cacheable) and
+# the active item is marked here from <body data-active-path>. Matching
+# mirrors kd_ui_server.routes: longest segment prefix wins, '/' only itself.
+_NAVACTIVE_JS = """(function() {
+  if (window.kdNavActive) return;
+
+  function segments(url) {
+    return url.split(/[?#]/)[0].split('/').filter(Boolean);
+  }
+
+  function resolve(path, urls) {
+    var want = segments(path), best = null, bestLen = -1;
+    urls.forEach(function(url) {
+      var segs = segments(url);
+      if (segs.length > want.length || segs.length <= bestLen) return;
+      if (!segs.length && want.length) return;
+      for (var i = 0; i < segs.length; i++) {
+        if (segs[i] !== want[i]) return;
+      }
+      best = url;
+      bestLen = segs.length;
+    });
+    return best;
+  }
+
+  function swap(el, on) {
+    var add = (on ? el.dataset.kdOn : el.dataset.kdOff) || '';
+    var remove = (on ? el.dataset.kdOff : el.dataset.kdOn) || '';
+    remove.split(' ').forEach(function(c) { if (c) el.classList.remove(c); });
+    add.split(' ').forEach(function(c) { if (c) el.classList.add(c); });
+    if (el.tagName === 'A') {
+      if (on) el.setAttribute('aria-current', 'page');
+      else el.removeAttribute('aria-current');
+    }
+  }
+
+  function apply(path) {
+    var body = document.body;
+    path = path || (body && body.dataset.activePath) || location.pathname;
+    var items = document.querySelectorAll('[data-kd-nav]'), urls = [];
+    items.forEach(function(el) {
+      el.dataset.kdNav.split(' ').forEach(function(url) {
+        if (url && urls.indexOf(url) < 0) urls.push(url);
+      });
+    });
+    var active = resolve(path, urls);
+    items.forEach(function(el) {
+      swap(el, active !== null && el.dataset.kdNav.split(' ').indexOf(active) >= 0);
+    });
+    return active;
+  }
+
+  window.kdNavActive = { apply: apply, resolve: resolve };
+  // Mark the navs already in the document now: the module follows its nav,
+  // so this runs before first paint, and it also covers modules injected
+  // after parsing (fragments, compose_page hoisting). Still parsing: once
+  // more when the rest of the page is in.
+  apply();
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', function() { apply(); });
+  }
+})();"""
+
+RUNTIME_MODULES = {
+    "charts": _CHARTS_JS,
+    "fragments": _FRAGMENTS_JS,
+    "tabs": _TABS_JS,
+    "modals": _MODALS_JS,
+    "toasts": _TOASTS_JS,
+    "notifications": _NOTIFICATIONS_JS,
+    "dropdowns": _DROPDOWNS_JS,
+    "sidebar": _SIDEBAR_JS,
+    "navtree": _NAVTREE_JS,
+    "navactive": _NAVACTIVE_JS,
+}
+
+# Modules that must be on the page first
+RUNTIME_DEPENDENCIES = {
+    "tabs": ("fragments",),
+    "modals": ("fragments",),
+    "notifications": ("toasts",),
+    "navtree": ("fragments",),
+}
+
+
+def runtime_script(name):
+    """
+    Return the ``<script>`` block for one runtime module and its dependencies.
+
+    Args:
+        name: Module name (see ``RUNTIME_MODULES``)
+
+    Returns:
+        Script markup tagged with ``data-kd-runtime`` for de-duplication
+    """
+    return runtime_bundle([name])
+
+
+def _resolve(names):
+    """Expand dependencies, in load order, without duplicates."""
+    ordered = []
+    for name in names:
+        for dep in RUNTIME_DEPENDENCIES.get(name, ()):
+            if dep not in ordered:
+                ordered.append(dep)
+        if name not in ordered:
+            ordered.append(name)
+    return ordered
+
+
+def runtime_bundle(names=None):
+    """Return the script blocks for several runtime modules (default: all)."""
+    return "".join(
+        f'<script data-kd-runtime="{name}">\n{RUNTIME_MODULES[name]}\n</script>\n'
+        for name in _resolve(names or RUNTIME_MODULES)
+    )
+
+
+def json_script(element_id, data):
+    """
+    Embed data as a non-executing JSON ``<script>`` block.
+
+    ``</`` is escaped so the payload can never close the script element.
+    """
+    payload = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+    return f'<script type="application/json" id="{element_id}">{payload}</script>'
+
+
+def chart_canvas(chart_id, chart_config, data_source=None, fallback=None, attrs=""):
+    """
+    Render a lazily initialised chart: ``<canvas>`` plus its JSON config.
+
+    Args:
+        chart_id: Canvas element id
+        chart_config: Chart.js config dict (``type``, ``data``, ``options``)
+        data_source: Where ``data`` comes from at render/run time:
+            ``{"variable": "name"}`` — a Jinja variable holding a Chart.js
+            ``data`` object, serialized with ``|tojson``
+            ``{"url": "/api/series"}`` — a JSON endpoint fetched on init
+            None — use ``chart_config["data"]`` as-is
+        fallback: With a variable source, Chart.js ``data`` used when the
+            variable is undefined or empty (e.g. demo data)
+        attrs: Extra attributes for the canvas element
+
+    Returns:
+        HTML string (canvas + config block; the charts runtime is not included)
+    """
+    config_id = f"{chart_id}-config"
+    canvas_attrs = f'id="{chart_id}" data-kd-chart="{config_id}"'
+    data_source = data_source or {}
+
+    if "url" in data_source:
+        canvas_attrs += f' data-kd-chart-src="{data_source["url"]}"'
+        chart_config = dict(chart_config, data={"labels": [], "datasets": []})
+        config_block = json_script(config_id, chart_config)
+    elif "variable" in data_source:
+        name = data_source["variable"]
+        placeholder = "__kd_chart_data__"
+        # ``none`` keeps an undefined variable from failing ``tojson``
+        bound = f"{{{{ ({name} or none)|tojson }}}}"
+        if fallback is not None:
+            fallback_json = json.dumps(fallback, separators=(",", ":")).replace("</", "<\\/")
+            bound = f"{{% if {name} %}}{bound}{{% else %}}{fallback_json}{{% endif %}}"
+        config_block = json_script(config_id, dict(chart_config, data=placeholder))
+        config_block = config_block.replace(f'"{placeholder}"', bound)
+    else:
+        config_block = json_script(config_id, chart_config)
+
+    if attrs:
+        canvas_attrs += f" {attrs}"
+    return f"<canvas {canvas_attrs}></canvas>\n{config_block}"
+
+
+def sidebar_state_script():
+    """Return the tiny blocking ``<script>`` that restores sidebar state before paint."""
+    return f"<script>{_SIDEBAR_STATE_JS}</script>"
@@ -1,405 +1,408 @@
 """Main MCP Server implementation for KD UI Framework."""
 
+if __name__ == "__main__":
+    # Answer the handshake before the mcp SDK below is even imported
+    from kd_ui_server.bootstrap import run
+
+    run()
+    raise SystemExit
+
+import asyncio
 import json
+import sys
+import time
+import weakref
 from typing import Any
 from mcp.server import Server
-from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
+from mcp.types import Tool, TextContent
 from pydantic import AnyUrl
 
-from .tools.dashboard import create_dashboard
-from .tools.form import create_form
-from .tools.table import create_table
-from .tools.component import add_component
-from .resources import component_templates
-from .design_system import get_design_system
+from .catalog import ADD_COMPONENT_TYPES, RESOURCES, RESOURCE_URIS, SERVER_NAME, TOOLS
+from .compact import compact_chunks, estimate_tokens, fragment_label, fragment_report
+from .metrics import metrics
+from .loadtest import Recorder
+from .overrides import OverrideWatcher, design_system_override, merge, template_override
+from .profiling import PROFILE_ALL, profile_call, profile_summary, save_profile
+
+
+class KDServer(Server):
+    """Server that advertises resource subscriptions.
+
+    The SDK reports ``subscribe: false`` even when a subscribe handler is
+    registered.
+    """
+
+    def get_capabilities(self, notification_options, experimental_capabilities):
+        capabilities = super().get_capabilities(notification_options, experimental_capabilities)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
 
 # Initialize MCP Server
-app = Server("kd-ui-server")
+app = KDServer(SERVER_NAME)
+
+# Appends handled requests to $KD_UI_RECORD for replay (see loadtest)
+recorder = Recorder.from_env()
+
+# uri -> serialized resource content (bounded: unknown template URIs are cached too)
+_resource_cache = {}
+_RESOURCE_CACHE_SIZE = 64
+
+# Set by workers.start_pool (kd-ui-server --pool N): call_tool hands
+# generation to the pool; read_resource serves from the shared asset cache
+worker_pool = None
+shared_assets = None
+
+# Polls $KD_UI_OVERRIDES and the asset manifest (see overrides)
+watcher = OverrideWatcher.from_env()
+
+# uri -> sessions subscribed to it; URIs changed since startup no longer
+# match the shared asset cache
+_subscriptions = {}
+_stale = set()
+_watch_task = None
 
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """List all available tools for generating Flask UI components."""
-    return [
-        Tool(
-            name="create_dashboard",
-            description="""Create a complete Flask dashboard template with DaisyUI components.
-            
-            This tool generates a responsive dashboard layout with:
-            - Sidebar navigation or top navigation
-            - Stats cards for key metrics
-            - Chart containers
-            - Data tables
-            - Responsive grid layout
-            
-            Perfect for: Admin dashboards, analytics pages, data visualization pages
-            
-            Parameters:
-            - layout: "sidebar" (default) or "topnav" - Navigation style
-            - title: Dashboard title (default: "Dashboard")
-            - theme: "light" (default), "dark", or "auto" - Color theme
-            - components: List of components to include: ["stats", "charts", "table", "filters"]
-            
-            Returns: Complete Jinja2 template ready for Flask
-            """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "layout": {
-                        "type": "string",
-                        "enum": ["sidebar", "topnav"],
-                        "default": "sidebar",
-                        "description": "Navigation layout style"
-                    },
-                    "title": {
-                        "type": "string",
-                        "default": "Dashboard",
-                        "description": "Dashboard page title"
-                    },
-                    "theme": {
-                        "type": "string",
-                        "enum": ["light", "dark", "auto"],
-                        "default": "light",
-                        "description": "Color theme"
-                    },
-                    "components": {
-                        "type": "array",
-                        "items": {
-                            "type": "string",
-                            "enum": ["stats", "charts", "table", "filters"]
-                        },
-                        "default": ["stats", "charts"],
-                        "description": "Components to include in dashboard"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="create_form",
-            description="""Create a beautiful form template with validation and DaisyUI styling.
-            
-            This tool generates forms with:
-            - Input fields with proper labels and validation
-            - Select dropdowns, checkboxes, radio buttons
-            - File upload components
-            - Submit and cancel buttons
-            - Error message displays
-            - Responsive layout
-            
-            Perfect for: Login forms, registration, data entry, settings pages
-            
-            Parameters:
-            - form_type: "login", "register", "contact", "settings", or "custom"
-            - fields: List of field configurations
-            - method: "POST" (default) or "GET"
-            - action: Form submission URL
-            - inline: true/false - Display fields inline or stacked
-            
-            Returns: Form template with proper Flask-WTF integration
-            """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "form_type": {
-                        "type": "string",
-                        "enum": ["login", "register", "contact", "settings", "custom"],
-                        "default": "custom",
-                        "description": "Predefined form type or custom"
-                    },
-                    "fields": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "name": {"type": "string"},
-                                "type": {"type": "string", "enum": ["text", "email", "password", "number", "textarea", "select", "checkbox", "radio", "file"]},
-                                "label": {"type": "string"},
-                                "placeholder": {"type": "string"},
-                                "required": {"type": "boolean", "default": False},
-                                "options": {"type": "array", "items": {"type": "string"}}
-                            },
-                            "required": ["name", "type", "label"]
-                        },
-                        "description": "Form field configurations"
-                    },
-                    "method": {
-                        "type": "string",
-                        "enum": ["POST", "GET"],
-                        "default": "POST"
-                    },
-                    "action": {
-                        "type": "string",
-                        "default": "",
-                        "description": "Form submission URL"
-                    },
-                    "inline": {
-                        "type": "boolean",
-                        "default": False,
-                        "description": "Display fields inline"
-                    }
-                },
-                "required": ["fields"]
-            }
-        ),
-        Tool(
-            name="create_table",
-            description="""Create a data table with sorting, filtering, and pagination.
-            
-            This tool generates tables with:
-            - Sortable columns
-            - Search/filter functionality
-            - Pagination controls
-            - Row actions (edit, delete, view)
-            - Responsive design (cards on mobile)
-            - Loading states
-            
-            Perfect for: User lists, product catalogs, transaction history, any data display
-            
-            Parameters:
-            - columns: List of column definitions (name, label, sortable, type)
-            - features: ["search", "sort", "pagination", "actions"]
-            - rows_per_page: Number of rows per page (default: 10)
-            - striped: Alternating row colors (default: true)
-            - hoverable: Highlight row on hover (default: true)
-            
-            Returns: Table template with JavaScript for interactivity
-            """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "columns": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "name": {"type": "string"},
-                                "label": {"type": "string"},
-                                "sortable": {"type": "boolean", "default": True},
-                                "type": {"type": "string", "enum": ["text", "number", "date", "badge", "avatar"], "default": "text"}
-                            },
-                            "required": ["name", "label"]
-                        },
-                        "description": "Table column definitions"
-                    },
-                    "features": {
-                        "type": "array",
-                        "items": {
-                            "type": "string",
-                            "enum": ["search", "sort", "pagination", "actions"]
-                        },
-                        "default": ["search", "sort", "pagination"],
-                        "description": "Table features to enable"
-                    },
-                    "rows_per_page": {
-                        "type": "integer",
-                        "default": 10,
-                        "description": "Rows per page for pagination"
-                    },
-                    "striped": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "Alternating row colors"
-                    },
-                    "hoverable": {
-                        "type": "boolean",
-                        "default": True,
-                        "description": "Highlight row on hover"
-                    }
-                },
-                "required": ["columns"]
-            }
-        ),
-        Tool(
-            name="add_component",
-            description="""Add individual UI components to your Flask templates.
-
-            Available components:
-            - stat_card: Metric display card with value, title, and trend
-            - alert: Toast flash notification (fixed overlay, auto-dismisses). Supports type, duration, position, dismissable
-            - badge: Status indicators and labels
-            - button: Various button styles (primary, secondary, ghost, etc.)
-            - card: Content container with optional header and footer
-            - modal: Dialog/popup overlay
-            - navbar: Top navigation bar
-            - sidebar: Side navigation menu
-            - navigation_menu: Navigation menu component
-            - breadcrumb: Navigation breadcrumb trail
-            - tabs: Tabbed content sections
-            - progress: Progress bars and loading indicators
-            - skeleton: Loading skeleton placeholders
-            - typography: Typography and text components
-            - dropdown_menu: Dropdown menu with items, icons, separators, and variants
-            - chart_container: Container for Chart.js charts
-            - theme_toggle: Light/dark theme toggle button
-
-            Landing page sections:
-            - hero: Hero/banner section
-            - features: Features showcase section
-            - testimonials: Testimonials/reviews section
-            - pricing: Pricing plans section
-            - cta: Call-to-action section
-            - footer: Page footer section
-
-            Parameters:
-            - component_type: Type of component to generate
-            - config: Component-specific configuration
-
-            Returns: Component template snippet
-            """,
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "component_type": {
-                        "type": "string",
-                        "enum": [
-                            "stat_card", "alert", "badge", "button", "card",
-                            "modal", "navbar", "sidebar", "navigation_menu",
-                            "breadcrumb", "tabs", "progress", "skeleton",
-                            "typography", "dropdown_menu", "chart_container",
-                            "theme_toggle", "hero", "features", "testimonials",
-                            "pricing", "cta", "footer"
-                        ],
-                        "description": "Type of component to generate"
-                    },
-                    "config": {
-                        "type": "object",
-                        "description": "Component-specific configuration",
-                        "additionalProperties": True
-                    }
-                },
-                "required": ["component_type"]
-            }
-        )
-    ]
+    return [Tool(**tool) for tool in TOOLS]
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls to generate UI components."""
-    
+    if recorder:
+        recorder.record("tools/call", {"name": name, "arguments": arguments})
+    # "profile" is a meta-argument accepted by every tool
+    requested = False
+    if "profile" in arguments:
+        arguments = dict(arguments)
+        requested = bool(arguments.pop("profile"))
+    profile = requested or PROFILE_ALL
+
+    # So are "compact" and "max_output_tokens" (see compact); compact also
+    # turns off create_dashboard's demo_data
+    compact = bool(arguments.get("compact", False))
+    budget = arguments.get("max_output_tokens")
+
+    component = arguments.get("component_type") if name == "add_component" else None
+    with metrics.observe("tool", name, component) as obs:
+        chunks, profiler = await _run(name, arguments, profile)
+        if budget and not compact and sum(map(estimate_tokens, chunks)) > budget:
+            compact = True
+            arguments = dict(arguments, compact=True)
+            chunks, profiler = await _run(name, arguments, profile)
+        if compact or budget:
+            labels = [fragment_label(chunk, index) for index, chunk in enumerate(chunks)]
+        if compact:
+            chunks = compact_chunks(chunks)
+        obs.output(chunks)
+
+    blocks = _blocks([chunk for chunk in chunks if chunk])
+    result = [TextContent(type="text", text=block) for block in blocks]
+    if compact or budget:
+        _, report = fragment_report(labels, chunks, budget)
+        note = "\n(compact mode)" if compact else ""
+        result.append(TextContent(type="text", text=report + note))
+    if profile:
+        # The template exists either way; a profile that can't be written
+        # (read-only directory, full disk) is only reported
+        try:
+            path, note = save_profile(profiler, name, arguments), ""
+        except OSError as e:
+            path, note = None, f"\nSaving the profile failed: {e}"
+            if not requested:
+                sys.stderr.write(f"kd-ui-server: saving the {name} profile failed: {e}\n")
+        if requested:
+            result.append(TextContent(type="text", text=profile_summary(profiler, path) + note))
+    return result
+
+
+async def _run(name: str, arguments: Any, profile: bool):
+    """
+    Generate a tool's output chunks where the configuration says to.
+
+    Returns:
+        ``(chunks, profiler)``; the profiler is None unless ``profile``
+    """
+    if profile:
+        # Profiled calls always run here so the profiler sees them
+        return profile_call(_generate_chunks, name, arguments)
+    if worker_pool is not None:
+        # Workers can't reach the session: report start and end from here
+        progress = _progress()
+        if progress is not None:
+            await progress(0, message=f"{name}: started")
+        chunks = await worker_pool.generate(name, arguments)
+        if progress is not None:
+            chars = sum(map(len, chunks))
+            await progress(len(chunks), len(chunks), message=f"{name}: done, {chars} characters")
+        return chunks, None
+    return await _stream(name, arguments), None
+
+
+def _progress():
+    """
+    ``send(progress, total=None, message=None)`` for this request.
+
+    Returns None when the request carries no ``progressToken``.
+    """
+    meta = app.request_context.meta
+    token = meta.progressToken if meta is not None else None
+    if token is None:
+        return None
+    session = app.request_context.session
+
+    async def send(progress, total=None, message=None):
+        await session.send_progress_notification(token, progress, total, message=message)
+
+    return send
+
+
+# Outputs longer than this come back as several text blocks, split between
+# fragments; progress notifications go out at most this often
+_BLOCK_CHARS = 64 * 1024
+_PROGRESS_INTERVAL = 0.05
+
+
+def _tool_kwargs(name: str, arguments: Any) -> dict:
+    """Keyword arguments for the generator behind a tool, defaults filled in."""
     if name == "create_dashboard":
-        template = create_dashboard(
+        return dict(
             layout=arguments.get("layout", "sidebar"),
             title=arguments.get("title", "Dashboard"),
             theme=arguments.get("theme", "light"),
-            components=arguments.get("components", ["stats", "charts"])
+            components=arguments.get("components", ["stats", "charts"]),
+            icon_mode=arguments.get("icon_mode", "inline"),
+            prerender_icons=arguments.get("prerender_icons", False),
+            demo_data=arguments.get("demo_data", False) and not arguments.get("compact", False)
         )
-        return [TextContent(type="text", text=template)]
-    
     elif name == "create_form":
-        template = create_form(
+        return dict(
             form_type=arguments.get("form_type", "custom"),
             fields=arguments.get("fields", []),
             method=arguments.get("method", "POST"),
             action=arguments.get("action", ""),
             inline=arguments.get("inline", False)
         )
-        return [TextContent(type="text", text=template)]
-    
     elif name == "create_table":
-        template = create_table(
+        return dict(
             columns=arguments.get("columns", []),
             features=arguments.get("features", ["search", "sort", "pagination"]),
             rows_per_page=arguments.get("rows_per_page", 10),
             striped=arguments.get("striped", True),
-            hoverable=arguments.get("hoverable", True)
+            hoverable=arguments.get("hoverable", True),
+            icon_mode=arguments.get("icon_mode", "inline")
         )
-        return [TextContent(type="text", text=template)]
-    
     elif name == "add_component":
-        template = add_component(
+        return dict(
             component_type=arguments.get("component_type"),
             config=arguments.get("config", {})
         )
-        return [TextContent(type="text", text=template)]
-    
+    elif name == "compose_page":
+        return dict(
+            sections=arguments.get("sections", []),
+            layout=arguments.get("layout", "standalone"),
+            title=arguments.get("title", "Page"),
+            theme=arguments.get("theme", "light"),
+            icon_mode=arguments.get("icon_mode", "inline"),
+            prerender_icons=arguments.get("prerender_icons", False),
+            critical_css=arguments.get("critical_css", "")
+        )
     else:
         raise ValueError(f"Unknown tool: {name}")
 
 
+def _iter_generate(name: str, arguments: Any):
+    """Generate a tool's output as ordered chunks.
+
+    ``create_form`` yields one chunk per field, ``compose_page`` one per
+    section and ``create_dashboard`` one per component; other tools yield
+    their whole template at once.
+    """
+    if name == "create_dashboard":
+        from .tools.dashboard import iter_dashboard
+
+        return iter_dashboard(**_tool_kwargs(name, arguments))
+    elif name == "create_form":
+        from .tools.form import iter_form
+
+        return iter_form(**_tool_kwargs(name, arguments))
+    elif name == "compose_page":
+        from .tools.page import iter_page
+
+        return iter_page(**_tool_kwargs(name, arguments))
+    return iter([_generate(name, arguments)])
+
+
+def _generate_chunks(name: str, arguments: Any) -> list[str]:
+    """All of a tool's output chunks (picklable, for worker processes)."""
+    return [chunk for chunk in _iter_generate(name, arguments) if chunk]
+
+
+async def _stream(name: str, arguments: Any) -> list[str]:
+    """
+    Generate chunk by chunk, sending ``notifications/progress`` as fragments
+    finish when the client passed a ``progressToken``.
+
+    Returns:
+        Ordered output chunks
+    """
+    progress = _progress()
+    if progress is None:
+        return _generate_chunks(name, arguments)
+
+    await progress(0, message=f"{name}: started")
+    chunks, chars, fragments = [], 0, 0
+    reported = time.monotonic()
+    for chunk in _iter_generate(name, arguments):
+        fragments += 1
+        if chunk:
+            chunks.append(chunk)
+            chars += len(chunk)
+        if time.monotonic() - reported >= _PROGRESS_INTERVAL:
+            reported = time.monotonic()
+            await progress(fragments, message=f"{name}: {fragments} fragments, {chars} characters")
+    await progress(fragments, fragments, message=f"{name}: done, {chars} characters")
+    return chunks
+
+
+def _blocks(chunks: list[str]) -> list[str]:
+    """Join chunks into text blocks of at most ``_BLOCK_CHARS`` (one block per oversized chunk)."""
+    blocks, current, size = [], [], 0
+    for chunk in chunks:
+        if current and size + len(chunk) > _BLOCK_CHARS:
+            blocks.append("".join(current))
+            current, size = [], 0
+        current.append(chunk)
+        size += len(chunk)
+    if current or not blocks:
+        blocks.append("".join(current))
+    return blocks
+
+
+def _generate(name: str, arguments: Any) -> str:
+    """Run the generator behind a tool and return its template.
+
+    Tool modules are imported on first use so startup only pays for the ones
+    a session actually calls.
+    """
+    kwargs = _tool_kwargs(name, arguments)
+    if name == "create_dashboard":
+        from .tools.dashboard import create_dashboard
+
+        return create_dashboard(**kwargs)
+    elif name == "create_form":
+        from .tools.form import create_form
+
+        return create_form(**kwargs)
+    elif name == "create_table":
+        from .tools.table import create_table
+
+        return create_table(**kwargs)
+    elif name == "add_component":
+        from .tools.component import add_component
+
+        return add_component(**kwargs)
+    else:
+        from .tools.page import compose_page
+
+        return compose_page(**kwargs)
+
+
 @app.list_resources()
 async def list_resources() -> list[Any]:
     """List available component templates and design system resources."""
-    return [
-        {
-            "uri": "template://components/stat_card",
-            "name": "Stat Card Component",
-            "mimeType": "text/html",
-            "description": "Reusable stat card template for displaying metrics"
-        },
-        {
-            "uri": "template://components/chart_container",
-            "name": "Chart Container Component",
-            "mimeType": "text/html",
-            "description": "Container for Chart.js charts with responsive sizing"
-        },
-        {
-            "uri": "template://components/sidebar",
-            "name": "Sidebar Navigation Component",
-            "mimeType": "text/html",
-            "description": "Responsive sidebar navigation menu"
-        },
-        {
-            "uri": "template://components/navbar",
-            "name": "Top Navigation Component",
-            "mimeType": "text/html",
-            "description": "Top navigation bar with logo and menu"
-        },
-        {
-            "uri": "template://layouts/base",
-            "name": "Base Layout Template",
-            "mimeType": "text/html",
-            "description": "Base Flask template with DaisyUI setup"
-        },
-        {
-            "uri": "config://design-system",
-            "name": "Design System Configuration",
-            "mimeType": "application/json",
-            "description": "Color palette, typography, spacing, and component styles"
-        },
-        {
-            "uri": "docs://best-practices",
-            "name": "UI Best Practices Guide",
-            "mimeType": "text/markdown",
-            "description": "Guidelines for creating beautiful, accessible dashboards"
-        },
-        {
-            "uri": "docs://uiux-design-rules",
-            "name": "UI/UX Design Rules & Standards",
-            "mimeType": "text/markdown",
-            "description": "Comprehensive UI/UX design rules, constraints, and anti-patterns from expert sources"
-        },
-        {
-            "uri": "docs://dashboard-architecture",
-            "name": "Dashboard Architecture Guide",
-            "mimeType": "text/markdown",
-            "description": "Navigation models, information density, and layout logic for dashboards"
-        },
-        {
-            "uri": "docs://visual-style-system",
-            "name": "Visual Style System",
-            "mimeType": "text/markdown",
-            "description": "Typography, spacing, color, and visual polish guidelines"
-        },
-        {
-            "uri": "docs://anti-patterns",
-            "name": "UI Anti-Patterns to Avoid",
-            "mimeType": "text/markdown",
-            "description": "Common UI/UX mistakes and how to avoid them"
-        }
-    ]
+    return RESOURCES
 
 
 @app.read_resource()
 async def read_resource(uri: AnyUrl) -> str:
     """Read component templates and design system resources."""
     uri_str = str(uri)
-    
+    if recorder:
+        recorder.record("resources/read", {"uri": uri_str})
+    with metrics.observe("resource", uri_str) as obs:
+        if uri_str == "metrics://server":
+            text = json.dumps(metrics.snapshot(), indent=2)
+        else:
+            # Resources only depend on the package and its configuration, so
+            # each is built and serialized once per process (or once per pool,
+            # see workers.SharedAssetCache) until an override changes
+            await _refresh()
+            text = None
+            if shared_assets is not None and uri_str not in _stale:
+                text = shared_assets.get(uri_str)
+            if text is None:
+                text = _resource_cache.get(uri_str)
+            metrics.cache("resources", text is not None)
+            if text is None:
+                text = _build_resource(uri_str)
+                if len(_resource_cache) < _RESOURCE_CACHE_SIZE:
+                    _resource_cache[uri_str] = text
+        obs.output(text)
+    return text
+
+
+@app.subscribe_resource()
+async def subscribe_resource(uri: AnyUrl) -> None:
+    """Send ``resources/updated`` to this session whenever ``uri`` changes."""
+    global _watch_task
+    session = app.request_context.session
+    _subscriptions.setdefault(str(uri), weakref.WeakSet()).add(session)
+    if watcher.enabled and (_watch_task is None or _watch_task.done()):
+        _watch_task = asyncio.get_running_loop().create_task(_watch())
+
+
+@app.unsubscribe_resource()
+async def unsubscribe_resource(uri: AnyUrl) -> None:
+    """Stop notifying this session about ``uri``."""
+    sessions = _subscriptions.get(str(uri))
+    if sessions is not None:
+        sessions.discard(app.request_context.session)
+
+
+async def _refresh(force=False):
+    """Invalidate resources whose override files changed and notify subscribers."""
+    changed = watcher.poll(force)
+    for uri in changed:
+        _resource_cache.pop(uri, None)
+        _stale.add(uri)
+        for session in list(_subscriptions.get(uri, ())):
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+            except Exception:
+                # Closed session (stateless HTTP requests end right away)
+                _subscriptions[uri].discard(session)
+    return changed
+
+
+async def _watch():
+    """Poll for override changes while any session is subscribed."""
+    while any(_subscriptions.values()):
+        await asyncio.sleep(watcher.interval)
+        try:
+            await _refresh(force=True)
+        except OSError:
+            # Override directory changing under the scan; retry next round
+            pass
+
+
+def _build_resource(uri_str: str) -> str:
+    """Build the content of a resource."""
+    from .design_system import get_design_system
+    from .resources import component_templates
+
     if uri_str == "config://design-system":
-        return json.dumps(get_design_system(), indent=2)
+        return json.dumps(merge(get_design_system(), design_system_override()), indent=2)
     
     elif uri_str.startswith("template://"):
         template_name = uri_str.replace("template://", "")
+        override = template_override(template_name)
+        if override is not None:
+            return override
         return component_templates.get_template(template_name)
     
     elif uri_str == "docs://best-practices":
@@ -418,7 +421,41 @@ async def read_resource(uri: AnyUrl) -> str:
         return component_templates.get_anti_patterns()
     
     else:
-        raise ValueError(f"Unknown resource: {uri}")
+        raise ValueError(f"Unknown resource: {uri_str}")
+
+
+# One representative call per tool; see warm_up
+_WARM_UP_CALLS = [
+    ("create_dashboard", {"components": ["stats", "charts", "table", "filters"]}),
+    ("create_form", {"form_type": "login", "fields": []}),
+    ("create_table", {"columns": [{"name": "name", "label": "Name"}]}),
+    ("compose_page", {"sections": [{"component": "navbar"}, {"component": "hero"}]}),
+]
+
+
+def warm_up(resources=True):
+    """
+    Generate every tool and resource once.
+
+    Long-lived servers (HTTP transport, worker pools) call this at startup so
+    imports, regexes, icon data and the resource cache are hot before the
+    first client request arrives.
+
+    Args:
+        resources: Also fill the resource cache (pool workers skip it; the
+            front end serves resources from the shared asset cache)
+    """
+    calls = _WARM_UP_CALLS + [
+        ("add_component", {"component_type": component_type})
+        for component_type in ADD_COMPONENT_TYPES
+    ]
+    for name, arguments in calls:
+        _generate(name, arguments)
+    if not resources:
+        return
+    for uri in RESOURCE_URIS:
+        if uri not in _resource_cache and not (shared_assets is not None and uri in shared_assets):
+            _resource_cache[uri] = _build_resource(uri)
 
 
 async def main():
@@ -431,8 +468,3 @@ async def main():
             write_stream,
             app.create_initialization_options()
         )
-
-
-if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
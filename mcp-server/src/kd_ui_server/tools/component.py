@@ -1,5 +1,21 @@
 """Component generation tool for individual UI elements."""
 
+import json
+import re
+import uuid
+
+from ..fixtures import CHART_DATA
+from ..icons import prerender_lucide, render_icon, render_sprite
+from ..nav_tree import build_tree, permission_predicate, render_nav_tree
+from ..routes import is_routable
+from ..runtime import (
+    RUNTIME_MODULES,
+    chart_canvas,
+    runtime_bundle,
+    runtime_script,
+    sidebar_state_script,
+)
+
 
 def add_component(component_type, config=None):
     """
@@ -7,7 +23,12 @@ def add_component(component_type, config=None):
     
     Args:
         component_type: Type of component to generate
-        config: Component-specific configuration
+        config: Component-specific configuration. Shared keys:
+            icon_mode: "inline" (default) or "sprite"
+            prerender_icons: Resolve Lucide icons to SVG at generation time
+                instead of shipping <i data-lucide> placeholders + createIcons()
+            include_runtime: Emit the shared JS runtime module the component
+                needs (default True); set False when the page includes it once
     
     Returns:
         Component template string
@@ -18,6 +39,7 @@ def add_component(component_type, config=None):
     components = {
         "stat_card": _generate_stat_card,
         "alert": _generate_alert,
+        "notifications_feed": _generate_notifications_feed,
         "badge": _generate_badge,
         "button": _generate_button,
         "card": _generate_card,
@@ -25,6 +47,7 @@ def add_component(component_type, config=None):
         "navbar": _generate_navbar,
         "sidebar": _generate_sidebar,
         "navigation_menu": _generate_navigation_menu,
+        "nav_tree": _generate_nav_tree,
         "breadcrumb": _generate_breadcrumb,
         "tabs": _generate_tabs,
         "progress": _generate_progress,
@@ -41,14 +64,97 @@ def add_component(component_type, config=None):
         "footer": _generate_footer,
         # Theme toggle
         "theme_toggle": _generate_theme_toggle,
+        # Shared icon sprite (pair with icon_mode="sprite")
+        "icon_sprite": _generate_icon_sprite,
+        # Shared client runtime (pair with include_runtime=False)
+        "runtime": _generate_runtime,
     }
     
     if component_type in components:
-        return components[component_type](config)
+        html = components[component_type](config)
+        if config.get("prerender_icons", False):
+            html = prerender_lucide(html, config.get("icon_mode", "inline"))
+        return html
     else:
         return f"<!-- Unknown component type: {component_type} -->"
 
 
+def _slug(text):
+    """Lowercase, dash-separated identifier safe for ids, cookies and CSS."""
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-") or "item"
+
+
+def _route_setup(active_mode, urls):
+    """Jinja preamble that resolves the active nav URL once per render.
+
+    Used with ``active_mode: "route"``; see ``kd_ui_server.routes``. Without
+    the ``kd_nav_active`` helper (``flask_ext.init_app``) it falls back to an
+    exact match on ``request.path``.
+    """
+    if active_mode != "route":
+        return ""
+    urls = json.dumps([url for url in urls if is_routable(url)], ensure_ascii=False)
+    return (
+        f"{{% set kd_active = kd_nav_active(request.path, {urls}) "
+        f"if kd_nav_active is defined else request.path %}}\n"
+    )
+
+
+def _active_switch(active_mode, urls, static_active, active_value, inactive_value):
+    """Pick the active or inactive markup: from ``active`` flags, or in Jinja.
+
+    In "overlay" mode the markup is always the inactive one; ``_nav_attrs``
+    lets the ``navactive`` runtime swap it in the browser.
+    """
+    if active_mode == "overlay":
+        return inactive_value
+    if active_mode != "route":
+        return active_value if static_active else inactive_value
+    urls = [url for url in urls if is_routable(url)]
+    if not urls:
+        return inactive_value
+    if len(urls) == 1:
+        test = f"kd_active == {json.dumps(urls[0], ensure_ascii=False)}"
+    else:
+        test = f"kd_active in {json.dumps(urls, ensure_ascii=False)}"
+    return f"{{% if {test} %}}{active_value}{{% else %}}{inactive_value}{{% endif %}}"
+
+
+def _nav_attrs(active_mode, urls, active_classes, inactive_classes):
+    """Attributes for the per-request active overlay (``active_mode: "overlay"``).
+
+    The item carries its URLs and both class sets; the ``navactive`` runtime
+    matches them against ``<body data-active-path>`` and swaps classes, so
+    the nav markup itself is identical on every page and can be cached.
+    """
+    if active_mode != "overlay":
+        return ""
+    urls = " ".join(url for url in urls if is_routable(url))
+    if not urls:
+        return ""
+    return f' data-kd-nav="{urls}" data-kd-on="{active_classes}" data-kd-off="{inactive_classes}"'
+
+
+def _tree_link_attrs(active_mode):
+    """``render_nav_tree`` ``link_attrs`` for ``active_mode``; None for static ``active`` ids."""
+    if active_mode not in ("route", "overlay"):
+        return None
+    active = ' class="active" aria-current="page"'
+    return lambda node: (_active_switch(active_mode, [node.get("url") or ""], False, active, "")
+                         + _nav_attrs(active_mode, [node.get("url") or ""], "active", ""))
+
+
+def _nav_overlay_script(active_mode, include_runtime):
+    """``navactive`` runtime emitted after a nav in overlay mode.
+
+    The module marks the navs already parsed when it loads, so following its
+    nav it runs before paint; it needs no per-nav apply call.
+    """
+    if active_mode != "overlay" or not include_runtime:
+        return ""
+    return runtime_script("navactive")
+
+
 def _generate_stat_card(config):
     """Generate a stat card component."""
     title = config.get("title", "Stat Title")
@@ -56,8 +162,10 @@ def _generate_stat_card(config):
     description = config.get("description", "")
     trend = config.get("trend", "")  # e.g. "+20.1%" or "-1.3%"
 
-    icon_up = '<svg xmlns="http://www.w3.org/2000/svg" width="13" height="13" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round"><polyline points="22 7 13.5 15.5 8.5 10.5 2 17"/><polyline points="16 7 22 7 22 13"/></svg>'
-    icon_down = '<svg xmlns="http://www.w3.org/2000/svg" width="13" height="13" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round"><polyline points="22 17 13.5 8.5 8.5 13.5 2 7"/><polyline points="16 17 22 17 22 11"/></svg>'
+    icon_mode = config.get("icon_mode", "inline")  # inline, sprite
+
+    icon_up = render_icon("trending-up", icon_mode, size=13)
+    icon_down = render_icon("trending-down", icon_mode, size=13)
 
     trend_html = ""
     if trend:
@@ -82,112 +190,52 @@ def _generate_stat_card(config):
 
 
 def _generate_alert(config):
-    """Generate a toast flash notification component."""
-    import uuid
+    """Generate a toast flash notification component.
+
+    The toast manager (queueing, coalescing of repeated messages, timers) is
+    the shared ``toasts`` runtime; each alert only emits a one-line call.
+    Calls made before the runtime loads are queued and shown once it does.
+    """
     message = config.get("message", "This is an alert message")
     alert_type = config.get("type", "info")  # info, success, warning, error
     duration = config.get("duration", 4000)   # ms, 0 = persistent
     position = config.get("position", "top-right")
     dismissable = config.get("dismissable", True)
+    icon_mode = config.get("icon_mode", "inline")  # inline, sprite
+    include_runtime = config.get("include_runtime", True)
 
-    alert_id = f"kd-alert-{uuid.uuid4().hex[:8]}"
+    opts = {"duration": duration, "position": position, "dismissable": dismissable}
+    if icon_mode == "sprite":
+        opts["sprite"] = True
+    args = json.dumps([alert_type, message, opts]).replace("</", "<\\/")
 
-    position_styles = {
-        "top-right":    "top:16px; right:16px;",
-        "top-left":     "top:16px; left:16px;",
-        "top-center":   "top:16px; left:0; right:0; margin:0 auto; max-width:400px;",
-        "bottom-right": "bottom:16px; right:16px;",
-        "bottom-left":  "bottom:16px; left:16px;",
-        "bottom-center":"bottom:16px; left:0; right:0; margin:0 auto; max-width:400px;",
-    }
-    pos_style = position_styles.get(position, position_styles["top-right"])
-    container_id = f"kd-toast-container-{position}"
-
-    icons = {
-        "info":    '<svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" class="stroke-current shrink-0 w-6 h-6"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M13 16h-1v-4h-1m1-4h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>',
-        "success": '<svg xmlns="http://www.w3.org/2000/svg" class="stroke-current shrink-0 h-6 w-6" fill="none" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z" /></svg>',
-        "warning": '<svg xmlns="http://www.w3.org/2000/svg" class="stroke-current shrink-0 h-6 w-6" fill="none" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 9v2m0 4h.01m-6.938 4h13.856c1.54 0 2.502-1.667 1.732-3L13.732 4c-.77-1.333-2.694-1.333-3.464 0L3.34 16c-.77 1.333.192 3 1.732 3z" /></svg>',
-        "error":   '<svg xmlns="http://www.w3.org/2000/svg" class="stroke-current shrink-0 h-6 w-6" fill="none" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 14l2-2m0 0l2-2m-2 2l-2-2m2 2l2 2m7-2a9 9 0 11-18 0 9 9 0 0118 0z" /></svg>',
-    }
+    runtime = runtime_script("toasts") if include_runtime else ""
 
-    return f'''<div id="{alert_id}" style="display:none" aria-hidden="true"></div>
-<script>
-(function() {{
-  // Register global helpers only once
-  if (!window.kdDismissAlert) {{
-    window.kdDismissAlert = function(el) {{
-      el.style.opacity = '0';
-      el.style.transform = 'translateX(20px)';
-      setTimeout(function() {{ el.remove(); }}, 300);
-    }};
-  }}
+    return f'''{runtime}<script>
+(function(args) {{
+  if (window.kdToast) window.kdToast.show.apply(null, args);
+  else (window.kdToastQueue = window.kdToastQueue || []).push(args);
+}})({args});
+</script>'''
 
-  if (!window.kdShowAlert) {{
-    window.kdShowAlert = function(type, message, opts) {{
-      opts = opts || {{}};
-      var duration   = (opts.duration !== undefined) ? opts.duration : 4000;
-      var position   = opts.position || 'top-right';
-      var dismissable = (opts.dismissable !== undefined) ? opts.dismissable : true;
-
-      var posStyles = {{
-        'top-right':    'top:16px; right:16px;',
-        'top-left':     'top:16px; left:16px;',
-        'top-center':   'top:16px; left:0; right:0; margin:0 auto; max-width:400px;',
-        'bottom-right': 'bottom:16px; right:16px;',
-        'bottom-left':  'bottom:16px; left:16px;',
-        'bottom-center':'bottom:16px; left:0; right:0; margin:0 auto; max-width:400px;'
-      }};
-
-      var icons = {{
-        'info':    '<svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" class="stroke-current shrink-0 w-6 h-6"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M13 16h-1v-4h-1m1-4h.01M21 12a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>',
-        'success': '<svg xmlns="http://www.w3.org/2000/svg" class="stroke-current shrink-0 h-6 w-6" fill="none" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z" /></svg>',
-        'warning': '<svg xmlns="http://www.w3.org/2000/svg" class="stroke-current shrink-0 h-6 w-6" fill="none" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 9v2m0 4h.01m-6.938 4h13.856c1.54 0 2.502-1.667 1.732-3L13.732 4c-.77-1.333-2.694-1.333-3.464 0L3.34 16c-.77 1.333.192 3 1.732 3z" /></svg>',
-        'error':   '<svg xmlns="http://www.w3.org/2000/svg" class="stroke-current shrink-0 h-6 w-6" fill="none" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 14l2-2m0 0l2-2m-2 2l-2-2m2 2l2 2m7-2a9 9 0 11-18 0 9 9 0 0118 0z" /></svg>'
-      }};
-
-      var containerId = 'kd-toast-container-' + position;
-      var container = document.getElementById(containerId);
-      if (!container) {{
-        container = document.createElement('div');
-        container.id = containerId;
-        container.style.cssText = 'position:fixed; z-index:9999; pointer-events:none; display:flex; flex-direction:column; gap:8px; width:360px; ' + (posStyles[position] || posStyles['top-right']);
-        document.body.appendChild(container);
-      }}
-
-      var alert = document.createElement('div');
-      alert.className = 'alert alert-' + type + ' shadow-lg';
-      alert.style.cssText = 'pointer-events:auto; opacity:0; transform:translateX(20px); transition:opacity 300ms ease, transform 300ms ease; border-radius:6px;';
-
-      var icon = icons[type] || icons['info'];
-      var closeBtn = dismissable
-        ? '<button onclick="kdDismissAlert(this.closest(\\'.alert\\'))" style="margin-left:auto; background:none; border:none; cursor:pointer; padding:0; line-height:1; font-size:1.25rem; opacity:0.7;" aria-label="Close">&times;</button>'
-        : '';
-      alert.innerHTML = icon + '<span style="flex:1">' + message + '</span>' + closeBtn;
-
-      container.appendChild(alert);
-
-      // Animate in
-      requestAnimationFrame(function() {{
-        requestAnimationFrame(function() {{
-          alert.style.opacity = '1';
-          alert.style.transform = 'translateX(0)';
-        }});
-      }});
-
-      if (duration > 0) {{
-        setTimeout(function() {{ window.kdDismissAlert(alert); }}, duration);
-      }}
-    }};
-  }}
 
-  // Show this alert immediately
-  window.kdShowAlert('{alert_type}', '{message}', {{
-    duration: {duration},
-    position: '{position}',
-    dismissable: {'true' if dismissable else 'false'}
-  }});
-}})();
-</script>'''
+def _generate_notifications_feed(config):
+    """Generate a live notifications feed: toasts pushed over Server-Sent Events.
+
+    Subscribes to ``url`` (see ``kd_ui_server.flask_ext.sse_response``) and
+    shows every event of the listed ``topics`` as a toast. Event data is JSON
+    ``{"type": "error", "message": "...", "duration": 0}``.
+    """
+    url = config.get("url", "/events")
+    topics = config.get("topics", ["notification"])
+    position = config.get("position", "top-right")
+    include_runtime = config.get("include_runtime", True)
+
+    runtime = runtime_script("notifications") if include_runtime else ""
+
+    feed_attrs = f'data-kd-feed-topics="{",".join(topics)}" data-kd-feed-position="{position}"'
+    return f'''<div data-kd-feed="{url}" {feed_attrs} hidden></div>
+{runtime}'''
 
 
 def _generate_badge(config):
@@ -277,37 +325,81 @@ def _generate_card(config):
     return card_html
 
 
+_MODAL_TRIGGER_STYLE = (
+    "height:36px; min-height:0; padding:0 16px; font-size:0.875rem; border-radius:4px; "
+    "font-weight:500; background:#2563EB; color:#fff; border:1px solid #2563EB; white-space:nowrap;"
+)
+
+
 def _generate_modal(config):
-    """Generate a modal component."""
+    """Generate a modal component.
+
+    With ``url`` set, the body is not inlined: it is fetched as an HTML
+    fragment the first time the modal opens (cached per URL for the life of
+    the page), with a skeleton shown meanwhile. ``preload: True`` starts the
+    request when the trigger is hovered or focused.
+    """
     modal_id = config.get("id", "my_modal")
     title = config.get("title", "Modal Title")
     content = config.get("content", "Modal content goes here")
-    
+    url = config.get("url")
+    preload = config.get("preload", False)
+    include_runtime = config.get("include_runtime", True)
+
+    toggle_attrs = ""
+    trigger_attrs = ""
+    runtime = ""
+    if url:
+        skeleton = _generate_skeleton(config.get("skeleton", {"type": "text", "count": 3}))
+        body = (
+            f'<div class="py-4" data-kd-modal-body="{modal_id}" data-kd-lazy="pending" '
+            f'data-kd-src="{url}">{skeleton}</div>'
+        )
+        toggle_attrs = " data-kd-modal"
+        if preload:
+            trigger_attrs = f' data-kd-preload="{url}"'
+        if include_runtime:
+            runtime = runtime_script("modals")
+    else:
+        body = f'<p class="py-4">{content}</p>'
+
     return f'''
 <!-- Modal trigger button -->
-<label for="{modal_id}" class="btn" style="height:36px; min-height:0; padding:0 16px; font-size:0.875rem; border-radius:4px; font-weight:500; background:#2563EB; color:#fff; border:1px solid #2563EB; white-space:nowrap;">Open Modal</label>
+<label for="{modal_id}"{trigger_attrs} class="btn" style="{_MODAL_TRIGGER_STYLE}">Open Modal</label>
 
 <!-- Modal -->
-<input type="checkbox" id="{modal_id}" class="modal-toggle" />
+<input type="checkbox" id="{modal_id}" class="modal-toggle"{toggle_attrs} />
 <div class="modal">
   <div class="modal-box" style="border-radius:8px;">
     <h3 class="font-bold text-lg">{title}</h3>
-    <p class="py-4">{content}</p>
+    {body}
     <div class="modal-action">
       <label for="{modal_id}" class="btn" style="height:36px; min-height:0; padding:0 16px; font-size:0.875rem; border-radius:4px; font-weight:500; background:transparent; color:#374151; border:1px solid #D1D5DB; white-space:nowrap;" onmouseover="this.style.background='#F3F4F6'" onmouseout="this.style.background='transparent'">Close</label>
     </div>
   </div>
 </div>
-'''
+{runtime}'''
 
 
 def _generate_navbar(config):
-    """Generate a navbar component."""
+    """Generate a navbar component.
+
+    Items are labels or ``{"label", "url", "active"}`` dicts. With
+    ``active_mode: "route"`` the active item is resolved from
+    ``request.path`` at render time instead of the ``active`` flags; with
+    "overlay" the markup is page-independent (cacheable) and the active item
+    is marked in the browser from ``<body data-active-path>``.
+    """
     brand = config.get("brand", "Brand")
     items = config.get("items", ["Home", "About", "Contact"])
     theme_toggle = config.get("theme_toggle", True)  # Include theme toggle by default
-    
-    nav_html = '''
+    active_mode = config.get("active_mode", "static")  # static, route, overlay
+    include_runtime = config.get("include_runtime", True)
+
+    items = [item if isinstance(item, dict) else {"label": item} for item in items]
+    urls = [item.get("url", "") for item in items]
+
+    nav_html = _route_setup(active_mode, urls) + '''
 <div class="navbar bg-base-200 shadow-md">
   <div class="flex-1">
     <a class="btn btn-ghost text-xl">''' + brand + '''</a>
@@ -317,7 +409,11 @@ def _generate_navbar(config):
 '''
     
     for item in items:
-        nav_html += f'      <li><a>{item}</a></li>\n'
+        href = f' href="{item["url"]}"' if item.get("url") else ""
+        active = _active_switch(active_mode, [item.get("url", "")], item.get("active", False),
+                                ' class="active" aria-current="page"', "")
+        overlay = _nav_attrs(active_mode, [item.get("url", "")], "active", "")
+        nav_html += f'      <li><a{href}{active}{overlay}>{item.get("label", "")}</a></li>\n'
     
     nav_html += '''    </ul>
 '''
@@ -333,9 +429,21 @@ def _generate_navbar(config):
     nav_html += '''  </div>
 </div>
 '''
+    nav_html += _nav_overlay_script(active_mode, include_runtime)
     return nav_html
 
 
+_SIDEBAR_CLASS = (
+    "relative flex h-screen w-64 flex-col border-r border-base-300 bg-base-100 "
+    "transition-all duration-300 ease-in-out"
+)
+_COLLAPSE_BUTTON_ATTRS = (
+    'aria-label="Toggle sidebar" class="absolute top-4 -right-3 z-10 flex h-6 w-6 items-center '
+    "justify-center rounded-full border border-base-300 bg-base-100 shadow-md hover:bg-base-200 "
+    'transition-colors"'
+)
+
+
 def _generate_sidebar(config):
     """Generate an enhanced Shadcn-style sidebar component.
     
@@ -343,9 +451,22 @@ def _generate_sidebar(config):
     - Collapsible sidebar
     - Icons for menu items (Lucide icons)
     - Nested menu items (submenu support)
-    - Active state highlighting
+    - Active state highlighting (``active`` flags; ``active_mode: "route"``
+      to resolve it from ``request.path`` at render time; or "overlay" for
+      page-independent, cacheable markup marked from ``<body data-active-path>``)
     - Smooth animations
     - Theme-aware styling
+    - Deep trees: pass ``nodes`` (flat id/parent_id list, see ``nav_tree``)
+      instead of ``items`` for arbitrarily nested, permission-pruned menus;
+      ``active_mode`` applies to their links as to ``items``
+    - Collapsed state and open submenus persisted in a ``kd_sidebar_<id>``
+      cookie and restored before first paint (no layout shift on navigation)
+
+    State is expressed as attributes on ``<html>`` that the sidebar's CSS
+    reacts to. A blocking snippet emitted right before the sidebar (and in
+    the base layout's ``<head>``) copies the cookie onto ``<html>``; with
+    ``kd_ui_server.flask_ext.init_app`` the server renders them directly.
+    Keep ``id`` stable across pages so the state carries over.
     """
     items = config.get("items", [
         {"icon": "layout-dashboard", "label": "Dashboard", "url": "/dashboard", "active": True},
@@ -356,12 +477,37 @@ def _generate_sidebar(config):
     brand = config.get("brand", "App")
     brand_icon = config.get("brand_icon", "box")
     
-    # Generate unique ID for this sidebar
-    import random
-    sidebar_id = f"sidebar-{random.randint(1000, 9999)}"
+    include_runtime = config.get("include_runtime", True)
+    active_mode = config.get("active_mode", "static")  # static, route, overlay
+
+    # Stable ids: persisted state is keyed by sidebar id and submenu key
+    sidebar_id = _slug(config.get("id", "sidebar"))
+    state_css = []
     
     # Build menu items
     menu_items_html = ""
+    route_urls = []
+    nodes = config.get("nodes")
+    if nodes is not None:
+        permissions = config.get("permissions")
+        can_view = permission_predicate(permissions) if permissions is not None else None
+        tree = build_tree(nodes, can_view)
+        menu_items_html = render_nav_tree(
+            tree,
+            active=config.get("active"),
+            lazy=config.get("lazy", True),
+            subtree_url=config.get("subtree_url"),
+            menu_class="menu w-full p-0",
+            link_attrs=_tree_link_attrs(active_mode),
+        )
+        if active_mode == "route":
+            stack = list(tree)
+            while stack:
+                node = stack.pop()
+                route_urls.append(node.get("url", ""))
+                stack.extend(node["children"])
+        items = []
+
     for item in items:
         icon = item.get("icon", "circle")
         label = item.get("label", "Menu Item")
@@ -370,8 +516,11 @@ def _generate_sidebar(config):
         badge = item.get("badge", None)
         submenu = item.get("submenu", [])
         
-        # Active state styling
-        active_class = "bg-base-200 text-primary" if active else "text-base-content hover:bg-base-200"
+        # Active state styling (a submenu parent is active with any child)
+        item_urls = [url] + [sub.get("url", "") for sub in submenu]
+        on, off = "bg-base-200 text-primary", "text-base-content hover:bg-base-200"
+        active_class = _active_switch(active_mode, item_urls, active, on, off)
+        nav_attrs = _nav_attrs(active_mode, item_urls, on, off)
         
         # Badge HTML if present
         badge_html = ""
@@ -389,10 +538,19 @@ def _generate_sidebar(config):
         
         if submenu:
             # Menu item with submenu
-            submenu_id = f"submenu-{random.randint(1000, 9999)}"
+            key = _slug(item.get("key", label))
+            submenu_id = f"{sidebar_id}-{key}"
+            open_rule = f'html[data-kd-sidebar-open~="{sidebar_id}/{key}"]'
+            state_css.append(f"{open_rule} #{submenu_id}-content {{ display: block; }}")
+            state_css.append(f"{open_rule} #{submenu_id}-chevron {{ transform: rotate(180deg); }}")
+            submenu_attrs = (
+                f'data-kd-submenu="{key}" aria-expanded="false" '
+                f'aria-controls="{submenu_id}-content" class="flex w-full items-center gap-3 '
+                f'rounded-md px-3 py-2 text-sm font-medium {active_class} transition-colors"'
+            )
             menu_items_html += f'''
     <div class="mb-1">
-      <button id="{submenu_id}-trigger" class="flex w-full items-center gap-3 rounded-md px-3 py-2 text-sm font-medium {active_class} transition-colors">
+      <button id="{submenu_id}-trigger"{nav_attrs} {submenu_attrs}>
         <i data-lucide="{icon}" class="w-5 h-5 flex-shrink-0"></i>
         <span class="sidebar-label">{label}</span>
         <i data-lucide="chevron-down" class="w-4 h-4 ml-auto sidebar-label transition-transform" id="{submenu_id}-chevron"></i>
@@ -403,10 +561,17 @@ def _generate_sidebar(config):
                 sub_label = sub_item.get("label", "Submenu")
                 sub_url = sub_item.get("url", "#")
                 sub_active = sub_item.get("active", False)
-                sub_active_class = "text-primary font-medium" if sub_active else "text-base-content/60 hover:text-base-content"
+                sub_on = "text-primary font-medium"
+                sub_off = "text-base-content/60 hover:text-base-content"
+                sub_active_class = _active_switch(active_mode, [sub_url], sub_active,
+                                                  sub_on, sub_off)
+                sub_nav_attrs = _nav_attrs(active_mode, [sub_url], sub_on, sub_off)
+                sub_link_class = (
+                    f"block rounded-md px-3 py-2 text-sm {sub_active_class} transition-colors"
+                )
                 
                 menu_items_html += f'''
-        <a href="{sub_url}" class="block rounded-md px-3 py-2 text-sm {sub_active_class} transition-colors">
+        <a href="{sub_url}"{sub_nav_attrs} class="{sub_link_class}">
           {sub_label}
         </a>
 '''
@@ -416,8 +581,12 @@ def _generate_sidebar(config):
 '''
         else:
             # Regular menu item
+            link_class = (
+                "flex items-center gap-3 rounded-md px-3 py-2 text-sm font-medium "
+                f"{active_class} transition-colors mb-1"
+            )
             menu_items_html += f'''
-    <a href="{url}" class="flex items-center gap-3 rounded-md px-3 py-2 text-sm font-medium {active_class} transition-colors mb-1">
+    <a href="{url}"{nav_attrs} class="{link_class}">
       <i data-lucide="{icon}" class="w-5 h-5 flex-shrink-0"></i>
       <span class="sidebar-label">{label}</span>
       {badge_html}
@@ -428,14 +597,34 @@ def _generate_sidebar(config):
     collapse_button = ""
     if collapsible:
         collapse_button = f'''
-    <button id="{sidebar_id}-toggle" class="absolute top-4 -right-3 z-10 flex h-6 w-6 items-center justify-center rounded-full border border-base-300 bg-base-100 shadow-md hover:bg-base-200 transition-colors">
+    <button id="{sidebar_id}-toggle" data-kd-sidebar-toggle {_COLLAPSE_BUTTON_ATTRS}>
       <i data-lucide="chevron-left" class="w-4 h-4 text-base-content/60" id="{sidebar_id}-chevron"></i>
     </button>
 '''
     
-    sidebar_html = f'''
+    collapsed_rule = f'html[data-kd-sidebar-collapsed~="{sidebar_id}"]'
+    state_css = [
+        f"{collapsed_rule} #{sidebar_id} {{ width: 4rem; }}",
+        f"{collapsed_rule} #{sidebar_id} .sidebar-label {{ display: none; }}",
+        f"{collapsed_rule} #{sidebar_id}-chevron {{ transform: rotate(180deg); }}",
+    ] + state_css
+    state_css_html = "\n".join(state_css)
+    runtime = ""
+    if include_runtime:
+        runtime = runtime_bundle(["sidebar", "navtree"] if nodes is not None else ["sidebar"])
+    runtime += _nav_overlay_script(active_mode, include_runtime)
+
+    for item in items:
+        route_urls.append(item.get("url", ""))
+        route_urls.extend(sub.get("url", "") for sub in item.get("submenu", []))
+
+    sidebar_html = _route_setup(active_mode, route_urls) + f'''
 <!-- Enhanced Sidebar -->
-<aside id="{sidebar_id}" class="relative flex h-screen w-64 flex-col border-r border-base-300 bg-base-100 transition-all duration-300 ease-in-out">
+<style>
+{state_css_html}
+</style>
+{sidebar_state_script()}
+<aside id="{sidebar_id}" data-kd-sidebar class="{_SIDEBAR_CLASS}">
   {collapse_button}
 
   <!-- Brand -->
@@ -465,57 +654,54 @@ def _generate_sidebar(config):
   </div>
 </aside>
 
-<script>
-(function() {{
-  const sidebar = document.getElementById('{sidebar_id}');
-  const toggleBtn = document.getElementById('{sidebar_id}-toggle');
-  const chevron = document.getElementById('{sidebar_id}-chevron');
-  
-  // Collapse/expand functionality
-  if (toggleBtn && sidebar && chevron) {{
-    toggleBtn.addEventListener('click', function() {{
-      sidebar.classList.toggle('w-64');
-      sidebar.classList.toggle('w-16');
-      
-      // Hide/show labels
-      const labels = sidebar.querySelectorAll('.sidebar-label');
-      labels.forEach(label => {{
-        label.classList.toggle('hidden');
-      }});
-      
-      // Rotate chevron
-      chevron.classList.toggle('rotate-180');
-    }});
-  }}
-  
-  // Submenu toggle functionality
-  document.querySelectorAll('[id$="-trigger"]').forEach(trigger => {{
-    const triggerId = trigger.id;
-    const submenuId = triggerId.replace('-trigger', '-content');
-    const chevronId = triggerId.replace('-trigger', '-chevron');
-    const submenu = document.getElementById(submenuId);
-    const chevron = document.getElementById(chevronId);
-    
-    if (trigger && submenu && chevron) {{
-      trigger.addEventListener('click', function(e) {{
-        e.preventDefault();
-        submenu.classList.toggle('hidden');
-        chevron.classList.toggle('rotate-180');
-      }});
-    }}
-  }});
-  
-  // Initialize Lucide icons
+{runtime}<script>
   if (typeof lucide !== 'undefined') {{
     lucide.createIcons();
   }}
-}})();
 </script>
 '''
     
     return sidebar_html
 
 
+def _generate_nav_tree(config):
+    """Generate a navigation tree of any depth from a flat node list.
+
+    ``nodes`` is an adjacency list of ``{"id", "parent_id", "label", "url",
+    "icon", "permission"}`` dicts. With ``permissions`` set, nodes requiring a
+    permission outside that list are pruned with their subtrees. Collapsed
+    branches are deferred (see ``kd_ui_server.nav_tree``).
+    """
+    nodes = config.get("nodes", [
+        {"id": "dashboard", "parent_id": None, "label": "Dashboard", "url": "/",
+         "icon": "layout-dashboard"},
+        {"id": "reports", "parent_id": None, "label": "Reports", "icon": "bar-chart-3"},
+        {"id": "sales", "parent_id": "reports", "label": "Sales", "url": "/reports/sales"},
+        {"id": "traffic", "parent_id": "reports", "label": "Traffic", "url": "/reports/traffic"},
+        {"id": "admin", "parent_id": None, "label": "Admin", "icon": "shield",
+         "permission": "admin"},
+        {"id": "users", "parent_id": "admin", "label": "Users", "url": "/admin/users"},
+    ])
+    permissions = config.get("permissions")
+    include_runtime = config.get("include_runtime", True)
+
+    can_view = permission_predicate(permissions) if permissions is not None else None
+    tree = render_nav_tree(
+        build_tree(nodes, can_view),
+        active=config.get("active"),
+        lazy=config.get("lazy", True),
+        subtree_url=config.get("subtree_url"),
+        menu_class=config.get("menu_class", "menu w-full"),
+    )
+    runtime = runtime_script("navtree") if include_runtime else ""
+
+    return f'''<!-- Navigation Tree -->
+<nav aria-label="{config.get("label", "Main")}">
+{tree}
+</nav>
+{runtime}'''
+
+
 def _generate_navigation_menu(config):
     """Generate a Shadcn-style horizontal navigation menu component.
     
@@ -523,7 +709,9 @@ def _generate_navigation_menu(config):
     - Horizontal navigation bar with dropdown menus
     - Multi-level navigation support
     - Icons for menu items (Lucide icons)
-    - Active state highlighting
+    - Active state highlighting (``active`` flags; ``active_mode: "route"``
+      to resolve it from ``request.path`` at render time; or "overlay" for
+      page-independent, cacheable markup marked from ``<body data-active-path>``)
     - Hover dropdowns with smooth animations
     - Theme-aware styling
     - Mobile responsive (optional)
@@ -541,10 +729,11 @@ def _generate_navigation_menu(config):
     brand = config.get("brand", "Brand")
     brand_icon = config.get("brand_icon", "box")
     show_icons = config.get("show_icons", True)
+    active_mode = config.get("active_mode", "static")  # static, route, overlay
+    include_runtime = config.get("include_runtime", True)
     
-    # Generate unique ID for this nav menu
-    import random
-    nav_id = f"nav-menu-{random.randint(1000, 9999)}"
+    # Stable ids keep the markup identical across renders (cacheable)
+    nav_id = _slug(config.get("id", "nav-menu"))
     
     # Build navigation items
     nav_items_html = ""
@@ -556,17 +745,24 @@ def _generate_navigation_menu(config):
         subitems = item.get("items", [])
         
         # Active state styling
-        active_class = "text-primary font-semibold" if active else "text-base-content hover:text-primary"
+        item_urls = [url] + [sub.get("url", "") for sub in subitems]
+        on, off = "text-primary font-semibold", "text-base-content hover:text-primary"
+        active_class = _active_switch(active_mode, item_urls, active, on, off)
+        nav_attrs = _nav_attrs(active_mode, item_urls, on, off)
+        link_class = (
+            "flex items-center gap-2 px-4 py-2 text-sm font-medium "
+            f"{active_class} transition-colors rounded-md hover:bg-base-200"
+        )
         
         # Icon HTML if present
         icon_html = f'<i data-lucide="{icon}" class="w-4 h-4"></i>' if icon and show_icons else ""
         
         if subitems:
             # Navigation item with dropdown
-            dropdown_id = f"nav-dropdown-{random.randint(1000, 9999)}"
+            dropdown_id = f"{nav_id}-{_slug(label)}"
             nav_items_html += f'''
       <div class="relative group">
-        <button id="{dropdown_id}-trigger" class="flex items-center gap-2 px-4 py-2 text-sm font-medium {active_class} transition-colors rounded-md hover:bg-base-200">
+        <button id="{dropdown_id}-trigger"{nav_attrs} class="{link_class}">
           {icon_html}
           <span>{label}</span>
           <i data-lucide="chevron-down" class="w-4 h-4 transition-transform group-hover:rotate-180"></i>
@@ -583,13 +779,24 @@ def _generate_navigation_menu(config):
                 sub_description = subitem.get("description", "")
                 sub_active = subitem.get("active", False)
                 
-                sub_active_class = "bg-base-200 text-primary" if sub_active else "hover:bg-base-200"
-                sub_icon_html = f'<i data-lucide="{sub_icon}" class="w-4 h-4 text-base-content/50"></i>' if sub_icon and show_icons else ""
+                sub_on, sub_off = "bg-base-200 text-primary", "hover:bg-base-200"
+                sub_active_class = _active_switch(active_mode, [sub_url], sub_active,
+                                                  sub_on, sub_off)
+                sub_nav_attrs = _nav_attrs(active_mode, [sub_url], sub_on, sub_off)
+                sub_icon_html = ""
+                if sub_icon and show_icons:
+                    sub_icon_html = (
+                        f'<i data-lucide="{sub_icon}" class="w-4 h-4 text-base-content/50"></i>'
+                    )
                 
                 if sub_description:
                     # Item with description
+                    sub_link_class = (
+                        "flex items-start gap-3 rounded-md px-3 py-2 text-sm "
+                        f"{sub_active_class} transition-colors"
+                    )
                     nav_items_html += f'''
-            <a href="{sub_url}" class="flex items-start gap-3 rounded-md px-3 py-2 text-sm {sub_active_class} transition-colors">
+            <a href="{sub_url}"{sub_nav_attrs} class="{sub_link_class}">
               {sub_icon_html}
               <div class="flex-1">
                 <div class="font-medium text-base-content">{sub_label}</div>
@@ -599,8 +806,12 @@ def _generate_navigation_menu(config):
 '''
                 else:
                     # Simple item
+                    sub_link_class = (
+                        "flex items-center gap-2 rounded-md px-3 py-2 text-sm text-base-content "
+                        f"{sub_active_class} transition-colors"
+                    )
                     nav_items_html += f'''
-            <a href="{sub_url}" class="flex items-center gap-2 rounded-md px-3 py-2 text-sm text-base-content {sub_active_class} transition-colors">
+            <a href="{sub_url}"{sub_nav_attrs} class="{sub_link_class}">
               {sub_icon_html}
               <span>{sub_label}</span>
             </a>
@@ -614,13 +825,18 @@ def _generate_navigation_menu(config):
         else:
             # Simple navigation link
             nav_items_html += f'''
-      <a href="{url}" class="flex items-center gap-2 px-4 py-2 text-sm font-medium {active_class} transition-colors rounded-md hover:bg-base-200">
+      <a href="{url}"{nav_attrs} class="{link_class}">
         {icon_html}
         <span>{label}</span>
       </a>
 '''
     
-    return f'''
+    route_urls = []
+    for item in items:
+        route_urls.append(item.get("url", ""))
+        route_urls.extend(sub.get("url", "") for sub in item.get("items", []))
+
+    return _route_setup(active_mode, route_urls) + f'''
 <!-- Shadcn-style Navigation Menu -->
 <nav id="{nav_id}" class="border-b border-base-300 bg-base-100">
   <div class="mx-auto max-w-7xl px-4 sm:px-6 lg:px-8">
@@ -671,7 +887,7 @@ def _generate_navigation_menu(config):
   }}
 }})();
 </script>
-'''
+''' + _nav_overlay_script(active_mode, include_runtime)
 
 
 def _generate_breadcrumb(config):
@@ -700,26 +916,63 @@ def _generate_breadcrumb(config):
 
 
 def _generate_tabs(config):
-    """Generate tabs component."""
+    """Generate tabs component.
+
+    With ``lazy: True`` only the active panel is rendered into the DOM.
+    Inactive panels keep their ``content`` in an inert ``<template>``, or load
+    it from the tab's ``url`` (an HTML fragment), and are materialized by the
+    shared ``tabs`` runtime the first time they are selected.
+    """
     tabs = config.get("tabs", [
         {"id": "tab1", "label": "Tab 1", "content": "Content 1", "active": True},
         {"id": "tab2", "label": "Tab 2", "content": "Content 2"},
         {"id": "tab3", "label": "Tab 3", "content": "Content 3"},
     ])
-    
+    name = config.get("name", "my_tabs")
+    lazy = config.get("lazy", False)
+    include_runtime = config.get("include_runtime", True)
+
     tabs_html = '''
 <div role="tablist" class="tabs tabs-lifted">
 '''
-    
+
+    panel = (
+        '<div role="tabpanel" class="tab-content bg-base-100 border-base-300 p-6" '
+        'style="border-radius:0 0 8px 8px;"'
+    )
     for tab in tabs:
-        checked = "checked" if tab.get("active", False) else ""
-        tabs_html += f'''  <input type="radio" name="my_tabs" role="tab" class="tab" aria-label="{tab['label']}" {checked} />
-  <div role="tabpanel" class="tab-content bg-base-100 border-base-300 p-6" style="border-radius:0 0 8px 8px;">
-    {tab['content']}
+        active = tab.get("active", False)
+        checked = "checked" if active else ""
+        content = tab.get("content", "")
+        radio = (
+            f'<input type="radio" name="{name}" role="tab" class="tab" aria-label="{tab["label"]}"'
+        )
+
+        if lazy and not active:
+            if tab.get("url"):
+                inner = (
+                    '<span class="loading loading-spinner loading-md text-base-content/40"></span>'
+                )
+                lazy_attrs = f' data-kd-lazy="pending" data-kd-src="{tab["url"]}"'
+            else:
+                inner = f"<template>{content}</template>"
+                lazy_attrs = ' data-kd-lazy="pending"'
+            tabs_html += f'''  {radio} data-kd-tab {checked} />
+  {panel}{lazy_attrs}>
+    {inner}
   </div>
 '''
-    
+        else:
+            tab_attr = " data-kd-tab" if lazy else ""
+            tabs_html += f'''  {radio}{tab_attr} {checked} />
+  {panel}>
+    {content}
+  </div>
+'''
+
     tabs_html += '</div>\n'
+    if lazy and include_runtime:
+        tabs_html += runtime_script("tabs")
     return tabs_html
 
 
@@ -866,16 +1119,22 @@ def _generate_typography(config):
 def _generate_dropdown_menu(config):
     """Generate a dropdown menu component.
 
-    The menu is rendered at document.body level with position:fixed so it
-    escapes any overflow container, stacking context, or scroll wrapper —
-    works correctly inside tables, modals, sidebars, and drawers.
+    The menu is moved to document.body level on first open with
+    position:fixed so it escapes any overflow container, stacking context, or
+    scroll wrapper — works correctly inside tables, modals, sidebars, and
+    drawers.
+
+    Behaviour lives in the shared ``dropdowns`` runtime: one delegated click
+    and key listener plus one passive scroll listener serve every dropdown on
+    the page, however many table rows carry one.
 
     Features:
-    - position:fixed via getBoundingClientRect() — never clipped
+    - position:fixed via getBoundingClientRect(), batched per animation frame
     - Auto-flips upward when near the bottom of the viewport
+    - Follows the trigger on scroll/resize; closes once it leaves the viewport
     - whitespace-nowrap on all items — no unexpected line wraps
     - DaisyUI-compatible color tokens (text-error, bg-base-200, etc.)
-    - Closes on click-outside, Escape key, and window scroll
+    - Closes on click-outside and Escape key
     """
     trigger_text = config.get("trigger_text", "Open Menu")
     trigger_icon = config.get("trigger_icon", "chevron-down")
@@ -889,9 +1148,9 @@ def _generate_dropdown_menu(config):
     ])
     align = config.get("align", "end")  # start | center | end
     menu_width = config.get("width", 220)  # px
+    include_runtime = config.get("include_runtime", True)
 
-    import random
-    dropdown_id = f"dropdown-{random.randint(1000, 9999)}"
+    dropdown_id = config.get("id") or f"dropdown-{uuid.uuid4().hex[:8]}"
 
     # Trigger button styles
     button_variants = {
@@ -901,13 +1160,6 @@ def _generate_dropdown_menu(config):
     }
     button_class = button_variants.get(trigger_variant, button_variants["outline"])
 
-    # Horizontal alignment JS expression (evaluated at open time)
-    align_js = {
-        "start":  "rect.left",
-        "center": "rect.left + rect.width / 2 - menuWidth / 2",
-        "end":    "rect.right - menuWidth",
-    }.get(align, "rect.right - menuWidth")
-
     # Build menu items HTML
     menu_items_html = ""
     for item in items:
@@ -944,112 +1196,75 @@ def _generate_dropdown_menu(config):
                 f'{icon_html}<span>{text}</span>{shortcut_html}</button>\n'
             )
 
+    runtime = runtime_script("dropdowns") if include_runtime else ""
+    trigger_attrs = (
+        f'data-kd-dropdown data-kd-align="{align}" aria-controls="{dropdown_id}-menu" '
+        'aria-expanded="false" aria-haspopup="true"'
+    )
+    menu_attrs = (
+        'class="rounded-md border border-base-300 bg-base-100 p-1 shadow-lg" role="menu" '
+        f'style="position:fixed; z-index:9999; width:{menu_width}px;"'
+    )
+
     return f'''<!-- Dropdown Menu -->
 <div class="inline-block">
-  <button id="{dropdown_id}-trigger" class="{button_class}" aria-expanded="false" aria-haspopup="true">
+  <button id="{dropdown_id}-trigger" class="{button_class}" {trigger_attrs}>
     <span>{trigger_text}</span>
     <i data-lucide="{trigger_icon}" class="w-4 h-4"></i>
   </button>
+  <div id="{dropdown_id}-menu" {menu_attrs} hidden>
+{menu_items_html}  </div>
 </div>
-
-<script>
-(function() {{
-  const trigger = document.getElementById('{dropdown_id}-trigger');
-  if (!trigger) return;
-
-  const menuWidth = {menu_width};
-
-  // Render menu at body level — escapes all overflow/stacking contexts
-  const menu = document.createElement('div');
-  menu.id = '{dropdown_id}-menu';
-  menu.style.cssText = 'position:fixed;z-index:9999;display:none;width:' + menuWidth + 'px;';
-  menu.className = 'rounded-md border border-base-300 bg-base-100 p-1 shadow-lg';
-  menu.setAttribute('role', 'menu');
-  menu.innerHTML = `{menu_items_html}`;
-  document.body.appendChild(menu);
-
-  let isOpen = false;
-
-  function openMenu() {{
-    const rect      = trigger.getBoundingClientRect();
-    const menuH     = menu.scrollHeight || 120;
-    const spaceBelow = window.innerHeight - rect.bottom;
-    const top  = spaceBelow > menuH + 8 ? rect.bottom + 4 : rect.top - menuH - 4;
-    const left = Math.max(8, Math.min({align_js}, window.innerWidth - menuWidth - 8));
-    menu.style.top     = top + 'px';
-    menu.style.left    = left + 'px';
-    menu.style.display = 'block';
-    trigger.setAttribute('aria-expanded', 'true');
-    isOpen = true;
-    if (typeof lucide !== 'undefined') lucide.createIcons();
-  }}
-
-  function closeMenu() {{
-    menu.style.display = 'none';
-    trigger.setAttribute('aria-expanded', 'false');
-    isOpen = false;
-  }}
-
-  trigger.addEventListener('click', function() {{
-    isOpen ? closeMenu() : openMenu();
-  }});
-
-  document.addEventListener('click', function(e) {{
-    if (!trigger.contains(e.target) && !menu.contains(e.target)) closeMenu();
-  }});
-
-  document.addEventListener('keydown', function(e) {{
-    if (e.key === 'Escape') closeMenu();
-  }});
-
-  // Close on page scroll (not inner element scroll)
-  window.addEventListener('scroll', closeMenu);
-}})();
-</script>
-'''
+{runtime}'''
 
 
 def _generate_chart_container(config):
-    """Generate a container for Chart.js charts."""
+    """Generate a container for Chart.js charts.
+
+    Chart.js is loaded on demand by the shared ``charts`` runtime and the chart
+    is only initialised once the canvas scrolls into view. Data comes from
+    ``data_source``: ``{"variable": "sales_chart"}`` binds a Jinja variable
+    holding a Chart.js data object (see ``kd_ui_server.downsample``), and
+    ``{"url": "/api/sales"}`` fetches it from a JSON endpoint on init. Without
+    a data source, ``labels``/``datasets`` are embedded; ``demo_data`` fills
+    in sample ones (``kd_ui_server.fixtures.CHART_DATA``) instead of an empty
+    chart.
+    """
     chart_id = config.get("id", "myChart")
     title = config.get("title", "Chart")
     height = config.get("height", "400px")
-    
+    chart_type = config.get("type", "line")
+    data_source = config.get("data_source")
+    include_runtime = config.get("include_runtime", True)
+
+    sample = CHART_DATA if config.get("demo_data", False) else {"labels": [], "datasets": []}
+    data = {
+        "labels": config.get("labels", sample["labels"]),
+        "datasets": config.get("datasets", sample["datasets"]),
+    }
+    chart_config = {
+        "type": chart_type,
+        "data": data,
+        "options": {
+            "responsive": True,
+            "maintainAspectRatio": False,
+        },
+    }
+
+    canvas = chart_canvas(chart_id, chart_config, data_source=data_source,
+                          fallback=config.get("fallback"))
+    runtime = runtime_script("charts") if include_runtime else ""
+
     return f'''
 <div class="card bg-base-100 shadow-xl">
   <div class="card-body">
     <h2 class="card-title">{title}</h2>
     <div style="height: {height};">
-      <canvas id="{chart_id}"></canvas>
+      {canvas}
     </div>
   </div>
 </div>
-
-<script>
-  // Initialize chart when document is ready
-  document.addEventListener('DOMContentLoaded', function() {{
-    const ctx = document.getElementById('{chart_id}');
-    if (ctx) {{
-      new Chart(ctx, {{
-        type: 'line',
-        data: {{
-          labels: ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun'],
-          datasets: [{{
-            label: 'Dataset',
-            data: [12, 19, 3, 5, 2, 3],
-            borderColor: 'rgb(59, 130, 246)',
-            tension: 0.1
-          }}]
-        }},
-        options: {{
-          responsive: true,
-          maintainAspectRatio: false
-        }}
-      }});
-    }}
-  }});
-</script>
-'''
+{runtime}'''
 
 
 def _generate_hero(config):
@@ -1480,3 +1695,20 @@ def _generate_theme_toggle(config):
   <i data-lucide="moon" class="w-5 h-5 block dark:hidden"></i>
 </button>
 '''
+
+
+def _generate_icon_sprite(config):
+    """Generate the hidden SVG sprite referenced by icon_mode="sprite" components.
+
+    Include it once per page (e.g. at the top of the body block).
+    """
+    return render_sprite(config.get("icons"))
+
+
+def _generate_runtime(config):
+    """Generate the shared client runtime once for a page.
+
+    Use with ``include_runtime: False`` on individual components.
+    """
+    modules = config.get("modules") or list(RUNTIME_MODULES)
+    return runtime_bundle(modules)
@@ -1,7 +1,15 @@
 """Dashboard generation tool for Flask templates with DaisyUI."""
 
+from ..fixtures import DASHBOARD_STATS, REVENUE_CHART, TRANSACTIONS, USER_CHART
+from ..icons import prerender_lucide, render_icon, sprite_for
+from ..runtime import chart_canvas, runtime_script
 
-def create_dashboard(layout="sidebar", title="Dashboard", theme="light", components=None):
+# Chart data when the view passes none and demo_data is off
+_NO_DATA = {"labels": [], "datasets": []}
+
+
+def create_dashboard(layout="sidebar", title="Dashboard", theme="light", components=None,
+                     icon_mode="inline", prerender_icons=False, demo_data=False):
     """
     Generate a complete Flask dashboard template.
     
@@ -10,15 +18,44 @@ def create_dashboard(layout="sidebar", title="Dashboard", theme="light", compone
         title: Dashboard page title
         theme: "light", "dark", or "auto"
         components: List of components to include
+        icon_mode: "inline" (full SVGs) or "sprite" (one <symbol> sprite + <use> refs)
+        prerender_icons: Resolve Lucide icons at generation time (no createIcons() scan)
+        demo_data: Show sample stats, transactions and charts (from
+            ``kd_ui_server.fixtures``) when the view passes none
     
     Returns:
         Complete Jinja2 template string
     """
+    return "".join(
+        iter_dashboard(layout, title, theme, components, icon_mode, prerender_icons, demo_data)
+    )
+
+
+_LUCIDE_INIT = '''
+<script>
+  // Initialize Lucide icons
+  if (typeof lucide !== 'undefined') {
+    lucide.createIcons();
+  }
+</script>
+'''
+
+
+def iter_dashboard(layout="sidebar", title="Dashboard", theme="light", components=None,
+                   icon_mode="inline", prerender_icons=False, demo_data=False):
+    """
+    ``create_dashboard`` as an iterator of ordered chunks: the template head
+    (with the icon sprite), the top bar, one chunk per component, the
+    sidebar, then the closing markup.
+
+    Yields:
+        Output chunks (str)
+    """
     if components is None:
         components = ["stats", "charts"]
     
     # Base template structure
-    template = f'''{{%extends "base.html" %}}
+    head = f'''{{%extends "base.html" %}}
 
 {{% block title %}}{title}{{% endblock %}}
 
@@ -26,26 +63,57 @@ def create_dashboard(layout="sidebar", title="Dashboard", theme="light", compone
 '''
     
     if layout == "sidebar":
-        template += _generate_sidebar_layout(title, components, theme)
+        parts = _sidebar_layout_parts(title, components, theme, icon_mode, demo_data)
     else:
-        template += _generate_topnav_layout(title, components, theme)
-    
-    template += '''
-<script>
-  // Initialize Lucide icons
-  if (typeof lucide !== 'undefined') {
-    lucide.createIcons();
-  }
-</script>
-{% endblock %}
-'''
-    
-    return template
+        parts = [_generate_topnav_layout(title, components, theme)]
+    parts.append(_LUCIDE_INIT)
+
+    if prerender_icons:
+        # The createIcons() bootstrap can only go once no placeholder is left
+        # anywhere, so the body is pre-rendered as a whole
+        parts = [prerender_lucide("".join(parts), icon_mode)]
+
+    if icon_mode == "sprite":
+        head += sprite_for("".join(parts))
+    yield head
+    yield from parts
+    yield '{% endblock %}\n'
+
+
+_SIDEBAR_LINKS = (
+    ("/dashboard", "layout-dashboard", "Dashboard"),
+    ("/analytics", "bar-chart-3", "Analytics"),
+    ("/users", "users", "Users"),
+    ("/settings", "settings", "Settings"),
+)
+_NAV_ON = "text-primary bg-primary/10"
+_NAV_OFF = "text-base-content/70 hover:bg-base-300"
+_NAV_LINK_ATTRS = (
+    f'data-kd-on="{_NAV_ON}" data-kd-off="{_NAV_OFF}" class="flex items-center gap-3 px-3 py-2 '
+    f'text-sm font-medium {_NAV_OFF} rounded-md transition-colors duration-200"'
+)
 
 
-def _generate_sidebar_layout(title, components, theme):
-    """Generate sidebar layout."""
-    layout = '''
+def _sidebar_layout_parts(title, components, theme, icon_mode="inline", demo_data=False):
+    """Generate sidebar layout: top bar, one part per component, sidebar."""
+    menu_icon = render_icon("menu", icon_mode, cls="inline-block w-5 h-5 stroke-current")
+    search_icon = render_icon(
+        "search", icon_mode,
+        cls="absolute left-3 top-1/2 -translate-y-1/2 w-4 h-4 text-base-content/40",
+    )
+    bell_icon = render_icon("bell", icon_mode, cls="h-5 w-5")
+
+    # Same markup on every page; the navactive runtime highlights the link
+    # matching <body data-active-path>, so the layout can be cached as-is
+    nav_links = ""
+    for url, icon, label in _SIDEBAR_LINKS:
+        nav_links += f'''          <a href="{url}" data-kd-nav="{url}" {_NAV_LINK_ATTRS}>
+            <i data-lucide="{icon}" class="w-5 h-5"></i>
+            <span>{label}</span>
+          </a>
+'''
+
+    parts = ['''
 <div class="drawer lg:drawer-open">
   <input id="main-drawer" type="checkbox" class="drawer-toggle" />
   
@@ -55,24 +123,18 @@ def _generate_sidebar_layout(title, components, theme):
     <div class="navbar bg-base-100 border-b border-base-200 px-4 gap-4 min-h-[56px]">
       <div class="flex-none lg:hidden">
         <label for="main-drawer" class="btn btn-square btn-ghost btn-sm">
-          <svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" class="inline-block w-5 h-5 stroke-current">
-            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h16M4 18h16"></path>
-          </svg>
+          ''' + menu_icon + '''
         </label>
       </div>
       <div class="flex-1 max-w-xs">
         <div class="relative w-full">
-          <svg class="absolute left-3 top-1/2 -translate-y-1/2 w-4 h-4 text-base-content/40" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke="currentColor">
-            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M21 21l-4.35-4.35M17 11A6 6 0 1 1 5 11a6 6 0 0 1 12 0z" />
-          </svg>
+          ''' + search_icon + '''
           <input type="text" placeholder="Search..." class="input input-sm w-full pl-9 bg-base-200/60 border-base-300 focus:bg-base-100" style="border-radius:6px;" />
         </div>
       </div>
       <div class="flex-none flex items-center gap-1">
         <button class="btn btn-ghost btn-sm btn-circle" title="Notifications">
-          <svg xmlns="http://www.w3.org/2000/svg" class="h-5 w-5" fill="none" viewBox="0 0 24 24" stroke="currentColor">
-            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M15 17h5l-1.405-1.405A2.032 2.032 0 0118 14.158V11a6.002 6.002 0 00-4-5.659V5a2 2 0 10-4 0v.341C7.67 6.165 6 8.388 6 11v3.159c0 .538-.214 1.055-.595 1.436L4 17h5m6 0v1a3 3 0 11-6 0v-1m6 0H9" />
-          </svg>
+          ''' + bell_icon + '''
         </button>
         <div class="w-8 h-8 rounded-full bg-primary/10 flex items-center justify-center cursor-pointer ml-1" title="User">
           <span class="text-xs font-semibold text-primary">U</span>
@@ -82,78 +144,37 @@ def _generate_sidebar_layout(title, components, theme):
 
     <!-- Page content -->
     <div class="p-6 bg-base-100">
-'''
+''']
     
     # Add components
     if "stats" in components:
-        layout += '''
+        stats = ("\n          {% for stat in stats %}\n"
+                 + _stat_card("{{ stat.title }}", "{{ stat.value }}", "{{ stat.icon }}",
+                              "{{ stat.trend_color }}", "{{ stat.trend_icon }}",
+                              "{{ stat.description }}")
+                 + "          {% endfor %}\n")
+        if demo_data:
+            stats = ("\n        {% if stats %}" + stats + "        {% else %}\n"
+                     + "".join(_stat_card(**stat) for stat in DASHBOARD_STATS)
+                     + "        {% endif %}\n")
+        parts.append('''
       <!-- Stats Grid -->
-      <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6 mb-6">
-        {% if stats %}
-          {% for stat in stats %}
-          <div class="bg-base-100 border border-base-300 rounded-lg p-6 shadow-sm">
-            <div class="flex items-center justify-between mb-1">
-              <p class="text-sm text-base-content/60">{{ stat.title }}</p>
-              <i data-lucide="{{ stat.icon }}" class="w-5 h-5 text-blue-600"></i>
-            </div>
-            <p class="text-2xl font-bold text-base-content">{{ stat.value }}</p>
-            <p class="text-xs text-{{ stat.trend_color }}-600 flex items-center gap-1 mt-2">
-              <i data-lucide="{{ stat.trend_icon }}" class="w-3 h-3"></i>
-              <span>{{ stat.description }}</span>
-            </p>
-          </div>
-          {% endfor %}
-        {% else %}
-          <div class="bg-base-100 border border-base-300 rounded-lg p-6 shadow-sm">
-            <div class="flex items-center justify-between mb-1">
-              <p class="text-sm text-base-content/60">Total Revenue</p>
-              <i data-lucide="dollar-sign" class="w-5 h-5 text-blue-600"></i>
-            </div>
-            <p class="text-2xl font-bold text-base-content">$45,231</p>
-            <p class="text-xs text-green-600 flex items-center gap-1 mt-2">
-              <i data-lucide="trending-up" class="w-3 h-3"></i>
-              <span>+20.1% from last month</span>
-            </p>
-          </div>
-          <div class="bg-base-100 border border-base-300 rounded-lg p-6 shadow-sm">
-            <div class="flex items-center justify-between mb-1">
-              <p class="text-sm text-base-content/60">New Users</p>
-              <i data-lucide="users" class="w-5 h-5 text-blue-600"></i>
-            </div>
-            <p class="text-2xl font-bold text-base-content">1,234</p>
-            <p class="text-xs text-green-600 flex items-center gap-1 mt-2">
-              <i data-lucide="trending-up" class="w-3 h-3"></i>
-              <span>+12.5% from last month</span>
-            </p>
-          </div>
-          <div class="bg-base-100 border border-base-300 rounded-lg p-6 shadow-sm">
-            <div class="flex items-center justify-between mb-1">
-              <p class="text-sm text-base-content/60">Active Sessions</p>
-              <i data-lucide="activity" class="w-5 h-5 text-blue-600"></i>
-            </div>
-            <p class="text-2xl font-bold text-base-content">567</p>
-            <p class="text-xs text-red-600 flex items-center gap-1 mt-2">
-              <i data-lucide="trending-down" class="w-3 h-3"></i>
-              <span>-5.2% from last month</span>
-            </p>
-          </div>
-          <div class="bg-base-100 border border-base-300 rounded-lg p-6 shadow-sm">
-            <div class="flex items-center justify-between mb-1">
-              <p class="text-sm text-base-content/60">Conversion Rate</p>
-              <i data-lucide="percent" class="w-5 h-5 text-blue-600"></i>
-            </div>
-            <p class="text-2xl font-bold text-base-content">3.2%</p>
-            <p class="text-xs text-green-600 flex items-center gap-1 mt-2">
-              <i data-lucide="trending-up" class="w-3 h-3"></i>
-              <span>+0.3% from last month</span>
-            </p>
-          </div>
-        {% endif %}
-      </div>
-'''
+      <div class="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6 mb-6">'''
+            + stats + '''      </div>
+''')
     
     if "charts" in components:
-        layout += '''
+        options = {"responsive": True, "maintainAspectRatio": False}
+        revenue_chart = chart_canvas(
+            "revenueChart", {"type": "line", "options": options},
+            data_source={"variable": "revenue_chart"},
+            fallback=REVENUE_CHART if demo_data else _NO_DATA,
+        )
+        user_chart = chart_canvas(
+            "userChart", {"type": "bar", "options": options},
+            data_source={"variable": "user_chart"}, fallback=USER_CHART if demo_data else _NO_DATA,
+        )
+        parts.append('''
       <!-- Charts -->
       <div class="grid grid-cols-1 lg:grid-cols-2 gap-6 mb-6">
         <div class="bg-base-100 border border-base-300 rounded-lg p-6 shadow-sm">
@@ -161,20 +182,33 @@ def _generate_sidebar_layout(title, components, theme):
             <i data-lucide="line-chart" class="w-5 h-5 text-blue-600"></i>
             <span>Revenue Trend</span>
           </h3>
-          <canvas id="revenueChart"></canvas>
+          <div style="height: 300px;">
+            ''' + revenue_chart + '''
+          </div>
         </div>
         <div class="bg-base-100 border border-base-300 rounded-lg p-6 shadow-sm">
           <h3 class="text-base font-semibold text-base-content mb-4 flex items-center gap-2">
             <i data-lucide="bar-chart-3" class="w-5 h-5 text-blue-600"></i>
             <span>User Growth</span>
           </h3>
-          <canvas id="userChart"></canvas>
+          <div style="height: 300px;">
+            ''' + user_chart + '''
+          </div>
         </div>
       </div>
-'''
+''' + runtime_script("charts"))
     
     if "table" in components:
-        layout += '''
+        rows = ("\n                {% for transaction in transactions %}\n"
+                + _transaction_row("{{ transaction.id }}", "{{ transaction.name }}",
+                                   "{{ transaction.amount }}", "{{ transaction.status }}", "green",
+                                   "{{ transaction.date }}")
+                + "                {% endfor %}\n")
+        if demo_data:
+            rows = ("\n              {% if transactions %}" + rows + "              {% else %}\n"
+                    + "".join(_transaction_row(**row) for row in TRANSACTIONS)
+                    + "              {% endif %}\n")
+        parts.append('''
       <!-- Data Table -->
       <div class="bg-base-100 border border-base-300 rounded-lg p-6 shadow-sm">
         <h3 class="text-base font-semibold text-base-content mb-4">Recent Orders</h3>
@@ -189,55 +223,13 @@ def _generate_sidebar_layout(title, components, theme):
                 <th class="py-3 px-4 text-left text-sm font-medium text-base-content/70">Date</th>
               </tr>
             </thead>
-            <tbody>
-              {% if transactions %}
-                {% for transaction in transactions %}
-                <tr class="border-b border-base-300 hover:bg-base-200 transition-colors duration-200">
-                  <td class="py-4 px-4 text-sm text-base-content">{{ transaction.id }}</td>
-                  <td class="py-4 px-4 text-sm text-base-content">{{ transaction.name }}</td>
-                  <td class="py-4 px-4 text-sm text-base-content">${{ transaction.amount }}</td>
-                  <td class="py-4 px-4 text-sm">
-                    <span class="px-2 py-1 text-xs font-medium text-green-700 bg-green-100 rounded-md">{{ transaction.status }}</span>
-                  </td>
-                  <td class="py-4 px-4 text-sm text-base-content/60">{{ transaction.date }}</td>
-                </tr>
-                {% endfor %}
-              {% else %}
-                <tr class="border-b border-base-300 hover:bg-base-200 transition-colors duration-200">
-                  <td class="py-4 px-4 text-sm text-base-content">#12345</td>
-                  <td class="py-4 px-4 text-sm text-base-content">John Doe</td>
-                  <td class="py-4 px-4 text-sm text-base-content">$234.50</td>
-                  <td class="py-4 px-4 text-sm">
-                    <span class="px-2 py-1 text-xs font-medium text-green-700 bg-green-100 rounded-md">Completed</span>
-                  </td>
-                  <td class="py-4 px-4 text-sm text-base-content/60">2024-02-10</td>
-                </tr>
-                <tr class="border-b border-base-300 hover:bg-base-200 transition-colors duration-200">
-                  <td class="py-4 px-4 text-sm text-base-content">#12346</td>
-                  <td class="py-4 px-4 text-sm text-base-content">Jane Smith</td>
-                  <td class="py-4 px-4 text-sm text-base-content">$589.00</td>
-                  <td class="py-4 px-4 text-sm">
-                    <span class="px-2 py-1 text-xs font-medium text-yellow-700 bg-yellow-100 rounded-md">Processing</span>
-                  </td>
-                  <td class="py-4 px-4 text-sm text-base-content/60">2024-02-10</td>
-                </tr>
-                <tr class="border-b border-base-300 hover:bg-base-200 transition-colors duration-200">
-                  <td class="py-4 px-4 text-sm text-base-content">#12347</td>
-                  <td class="py-4 px-4 text-sm text-base-content">Bob Johnson</td>
-                  <td class="py-4 px-4 text-sm text-base-content">$123.99</td>
-                  <td class="py-4 px-4 text-sm">
-                    <span class="px-2 py-1 text-xs font-medium text-green-700 bg-green-100 rounded-md">Completed</span>
-                  </td>
-                  <td class="py-4 px-4 text-sm text-base-content/60">2024-02-09</td>
-                </tr>
-              {% endif %}
-            </tbody>
+            <tbody>''' + rows + '''            </tbody>
           </table>
         </div>
       </div>
-'''
+''')
     
-    layout += '''
+    parts.append('''
     </div>
   </div>
 
@@ -248,30 +240,48 @@ def _generate_sidebar_layout(title, components, theme):
       <div class="p-4">
         <h2 class="text-xl font-bold text-base-content mb-6">''' + title + '''</h2>
         <nav class="space-y-1">
-          <a href="/dashboard" class="flex items-center gap-3 px-3 py-2 text-sm font-medium text-primary bg-primary/10 rounded-md transition-colors duration-200">
-            <i data-lucide="layout-dashboard" class="w-5 h-5"></i>
-            <span>Dashboard</span>
-          </a>
-          <a href="/analytics" class="flex items-center gap-3 px-3 py-2 text-sm text-base-content/70 hover:bg-base-300 rounded-md transition-colors duration-200">
-            <i data-lucide="bar-chart-3" class="w-5 h-5"></i>
-            <span>Analytics</span>
-          </a>
-          <a href="/users" class="flex items-center gap-3 px-3 py-2 text-sm text-base-content/70 hover:bg-base-300 rounded-md transition-colors duration-200">
-            <i data-lucide="users" class="w-5 h-5"></i>
-            <span>Users</span>
-          </a>
-          <a href="/settings" class="flex items-center gap-3 px-3 py-2 text-sm text-base-content/70 hover:bg-base-300 rounded-md transition-colors duration-200">
-            <i data-lucide="settings" class="w-5 h-5"></i>
-            <span>Settings</span>
-          </a>
-        </nav>
+''' + nav_links + '''        </nav>
       </div>
     </aside>
   </div>
 </div>
-'''
+''' + runtime_script("navactive"))
     
-    return layout
+    return parts
+
+
+def _stat_card(title, value, icon, trend_color, trend_icon, description):
+    """One stat card; the arguments are literal values or Jinja expressions."""
+    return f'''          <div class="bg-base-100 border border-base-300 rounded-lg p-6 shadow-sm">
+            <div class="flex items-center justify-between mb-1">
+              <p class="text-sm text-base-content/60">{title}</p>
+              <i data-lucide="{icon}" class="w-5 h-5 text-blue-600"></i>
+            </div>
+            <p class="text-2xl font-bold text-base-content">{value}</p>
+            <p class="text-xs text-{trend_color}-600 flex items-center gap-1 mt-2">
+              <i data-lucide="{trend_icon}" class="w-3 h-3"></i>
+              <span>{description}</span>
+            </p>
+          </div>
+'''
+
+
+_ROW_CLASS = "border-b border-base-300 hover:bg-base-200 transition-colors duration-200"
+
+
+def _transaction_row(id, name, amount, status, status_color, date):
+    """One "Recent Orders" row; the arguments are literal values or Jinja expressions."""
+    badge = f"text-{status_color}-700 bg-{status_color}-100"
+    return f'''                <tr class="{_ROW_CLASS}">
+                  <td class="py-4 px-4 text-sm text-base-content">{id}</td>
+                  <td class="py-4 px-4 text-sm text-base-content">{name}</td>
+                  <td class="py-4 px-4 text-sm text-base-content">${amount}</td>
+                  <td class="py-4 px-4 text-sm">
+                    <span class="px-2 py-1 text-xs font-medium {badge} rounded-md">{status}</span>
+                  </td>
+                  <td class="py-4 px-4 text-sm text-base-content/60">{date}</td>
+                </tr>
+'''
 
 
 def _generate_topnav_layout(title, components, theme):
@@ -15,19 +15,30 @@ def create_form(form_type="custom", fields=None, method="POST", action="", inlin
     Returns:
         Form template string
     """
+    return "".join(iter_form(form_type, fields, method, action, inline))
+
+
+def iter_form(form_type="custom", fields=None, method="POST", action="", inline=False):
+    """
+    ``create_form`` as an iterator of ordered chunks: for custom forms the
+    opening markup, one chunk per field, then the closing markup.
+
+    Yields:
+        Output chunks (str)
+    """
     if fields is None:
         fields = []
     
     # Use predefined form if specified
     if form_type == "login" and not fields:
-        return _generate_login_form(action)
+        yield _generate_login_form(action)
     elif form_type == "register" and not fields:
-        return _generate_register_form(action)
+        yield _generate_register_form(action)
     elif form_type == "contact" and not fields:
-        return _generate_contact_form(action)
-    
-    # Generate custom form
-    return _generate_custom_form(fields, method, action, inline)
+        yield _generate_contact_form(action)
+    else:
+        # Generate custom form
+        yield from _iter_custom_form(fields, method, action, inline)
 
 
 def _generate_login_form(action):
@@ -223,11 +234,11 @@ def _generate_contact_form(action):
 '''
 
 
-def _generate_custom_form(fields, method, action, inline):
-    """Generate a custom form based on field specifications."""
+def _iter_custom_form(fields, method, action, inline):
+    """Generate a custom form based on field specifications, one field at a time."""
     form_class = "grid grid-cols-1 md:grid-cols-2 gap-4" if inline else ""
     
-    form_html = f'''
+    yield f'''
 <div class="max-w-4xl mx-auto p-6">
   <div class="card bg-base-100 shadow-xl">
     <div class="card-body">
@@ -251,7 +262,7 @@ def _generate_custom_form(fields, method, action, inline):
         required_attr = "required" if required else ""
         
         if field_type in ["text", "email", "password", "number"]:
-            form_html += f'''
+            yield f'''
           <div class="form-control w-full">
             <label class="label">
               <span class="label-text">{label}</span>
@@ -261,7 +272,7 @@ def _generate_custom_form(fields, method, action, inline):
 '''
         
         elif field_type == "textarea":
-            form_html += f'''
+            yield f'''
           <div class="form-control w-full {'md:col-span-2' if inline else ''}">
             <label class="label">
               <span class="label-text">{label}</span>
@@ -271,7 +282,7 @@ def _generate_custom_form(fields, method, action, inline):
 '''
         
         elif field_type == "select":
-            form_html += f'''
+            select_html = f'''
           <div class="form-control w-full">
             <label class="label">
               <span class="label-text">{label}</span>
@@ -279,14 +290,15 @@ def _generate_custom_form(fields, method, action, inline):
             <select name="{field_name}" class="select select-bordered w-full" style="border-radius:4px" {required_attr}>
               <option value="">Select {label}</option>
 '''
-            for option in options:
-                form_html += f'              <option value="{option}">{option}</option>\n'
-            form_html += '''            </select>
+            options_html = "".join(
+                f'              <option value="{option}">{option}</option>\n' for option in options
+            )
+            yield select_html + options_html + '''            </select>
           </div>
 '''
         
         elif field_type == "checkbox":
-            form_html += f'''
+            yield f'''
           <div class="form-control">
             <label class="label cursor-pointer justify-start gap-2">
               <input type="checkbox" name="{field_name}" class="checkbox checkbox-primary" {required_attr} />
@@ -296,7 +308,7 @@ def _generate_custom_form(fields, method, action, inline):
 '''
         
         elif field_type == "file":
-            form_html += f'''
+            yield f'''
           <div class="form-control w-full">
             <label class="label">
               <span class="label-text">{label}</span>
@@ -305,7 +317,7 @@ def _generate_custom_form(fields, method, action, inline):
           </div>
 '''
     
-    form_html += '''
+    yield '''
         </div>
         
         {% if error %}
@@ -323,5 +335,3 @@ def _generate_custom_form(fields, method, action, inline):
   </div>
 </div>
 '''
-    
-    return form_html
@@ -1,6 +1,7 @@
 """Landing page generation tool."""
 
 from .component import add_component
+from .page import compose_page
 
 
 def create_landing_page(title="KD UI Framework", company_name="Your Company"):
@@ -149,59 +150,12 @@ def create_landing_page(title="KD UI Framework", company_name="Your Company"):
         "items": ["Features", "Pricing", "Docs", "GitHub"]
     })
     
-    # Combine all sections into a complete HTML page
-    html = f'''<!DOCTYPE html>
-<html lang="en" data-theme="light">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    
-    <!-- Inter Font -->
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap" rel="stylesheet">
-    
-    <!-- Tailwind CSS + DaisyUI -->
-    <link href="https://cdn.jsdelivr.net/npm/daisyui@4.4.19/dist/full.min.css" rel="stylesheet" type="text/css">
-    <script src="https://cdn.tailwindcss.com"></script>
-    
-    <!-- Lucide Icons -->
-    <script src="https://unpkg.com/lucide@latest/dist/umd/lucide.js"></script>
-    
-    <style>
-        body {{
-            font-family: 'Inter', system-ui, -apple-system, sans-serif;
-        }}
-    </style>
-    
-    <script>
-        // DaisyUI theme configuration
-        tailwind.config = {{
-            daisyui: {{
-                themes: [{{
-                    light: {{
-                        "primary": "#2563eb",      // Blue-600
-                        "secondary": "#64748b",    // Slate-500
-                        "accent": "#8b5cf6",       // Purple-500
-                        "neutral": "#1f2937",      // Gray-800
-                        "base-100": "#ffffff",     // White
-                        "base-200": "#f9fafb",     // Gray-50
-                        "base-300": "#f3f4f6",     // Gray-100
-                    }}
-                }}]
-            }}
-        }};
-    </script>
-</head>
-<body class="bg-white">
-    {navbar}
-    {hero}
-    {features}
-    {testimonials}
-    {pricing}
-    {cta}
-    {footer}
-</body>
-</html>
-'''
-    
-    return html
+    # Shared scripts, styles and icons are emitted once by compose_page
+    return compose_page(
+        [
+            {"html": section}
+            for section in (navbar, hero, features, testimonials, pricing, cta, footer)
+        ],
+        layout="standalone",
+        title=title,
+    )
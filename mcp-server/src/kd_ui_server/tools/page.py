@@ -0,0 +1,244 @@
+"""Page composition tool: one document from an ordered list of sections."""
+
+import re
+
+from ..assets import LUCIDE_VERSION
+from ..icons import SPRITE_OPEN, icons_referenced, render_sprite
+from ..runtime import runtime_bundle, sidebar_state_script
+from .component import add_component
+
+LAYOUTS = ("standalone", "base")
+
+_INTER_CSS = (
+    "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap"
+)
+
+_SCRIPT_RE = re.compile(r"<script\b([^>]*)>(.*?)</script>[ \t]*\n?", re.S)
+_STYLE_RE = re.compile(r"<style\b[^>]*>(.*?)</style>[ \t]*\n?", re.S)
+_SPRITE_RE = re.compile(re.escape(SPRITE_OPEN) + r".*?</svg>\n?", re.S)
+_RUNTIME_ATTR_RE = re.compile(r'data-kd-runtime="([a-z]+)"')
+
+# Inlined in <head> so the first paint is styled before any stylesheet loads
+_CRITICAL_CSS = """body {
+  font-family: 'Inter', system-ui, -apple-system, sans-serif;
+}"""
+
+
+def _has_jinja(text):
+    return "{{" in text or "{%" in text
+
+
+def _is_executable(attrs):
+    return 'type="application/json"' not in attrs
+
+
+class _Assets:
+    """Shared assets collected from every section, in first-seen order."""
+
+    def __init__(self):
+        self.runtime = []  # runtime module names
+        self.scripts = []  # inline/external script tags
+        self.styles = []   # style sheet bodies
+        self.sidebar_state = False
+        self._seen = set()
+
+    def add_script(self, tag, key):
+        if key not in self._seen:
+            self._seen.add(key)
+            self.scripts.append(tag)
+
+    def add_style(self, css):
+        key = ("style", css)
+        if key not in self._seen:
+            self._seen.add(key)
+            self.styles.append(css)
+
+
+def _extract(html, assets):
+    """
+    Move a section's shared assets into ``assets`` and return the remaining markup.
+
+    Runtime modules are collected by their ``data-kd-runtime`` marker, other
+    scripts and styles by content, so each is emitted once per page. JSON
+    data blocks, and scripts or styles that contain Jinja (they may depend on
+    a loop or block they sit in), stay where they are.
+    """
+    sidebar_state = sidebar_state_script()
+
+    def script(match):
+        attrs, body = match.group(1), match.group(2)
+        if not _is_executable(attrs) or _has_jinja(body):
+            return match.group(0)
+
+        runtime = _RUNTIME_ATTR_RE.search(attrs)
+        if runtime:
+            if runtime.group(1) not in assets.runtime:
+                assets.runtime.append(runtime.group(1))
+        elif f"<script{attrs}>{body}</script>" == sidebar_state:
+            assets.sidebar_state = True
+        else:
+            key = ("script", attrs.strip(), body.strip())
+            assets.add_script(f"<script{attrs}>{body}</script>", key)
+        return ""
+
+    def style(match):
+        if _has_jinja(match.group(1)):
+            return match.group(0)
+        assets.add_style(match.group(1).strip("\n"))
+        return ""
+
+    html = _SPRITE_RE.sub("", html)
+    html = _SCRIPT_RE.sub(script, html)
+    return _STYLE_RE.sub(style, html)
+
+
+def _render_section(section, icon_mode, prerender_icons):
+    """Generate one section: ``{"component", "config"}`` or raw ``{"html"}``."""
+    if "html" in section:
+        return section["html"]
+    config = dict(section.get("config") or {})
+    config.setdefault("icon_mode", icon_mode)
+    config.setdefault("prerender_icons", prerender_icons)
+    return add_component(section.get("component"), config)
+
+
+def compose_page(sections, layout="standalone", title="Page", theme="light",
+                 icon_mode="inline", prerender_icons=False, critical_css=""):
+    """
+    Compose a complete page from an ordered list of sections.
+
+    Each section is generated with ``add_component`` (or taken as-is from
+    ``html``, e.g. the output of ``create_table``). Shared assets are then
+    hoisted out of the sections and emitted once: runtime modules and other
+    scripts at the end of the body, styles inlined in ``<head>`` as critical
+    CSS, and, in sprite mode, one icon sprite holding exactly the icons the
+    page references.
+
+    Args:
+        sections: List of ``{"component": type, "config": {...}}`` or
+            ``{"html": markup}`` dicts, in page order
+        layout: "standalone" (complete HTML document) or "base" (Jinja
+            template extending ``base.html``)
+        title: Page title
+        theme: DaisyUI theme name for the standalone document
+        icon_mode: Default icon mode for every section ("inline" or "sprite")
+        prerender_icons: Default for every section; resolve Lucide icons at
+            generation time
+        critical_css: Extra CSS inlined in ``<head>``
+
+    Returns:
+        Complete HTML document or Jinja2 template string
+    """
+    return "".join(
+        iter_page(sections, layout, title, theme, icon_mode, prerender_icons, critical_css)
+    )
+
+
+def iter_page(sections, layout="standalone", title="Page", theme="light",
+              icon_mode="inline", prerender_icons=False, critical_css=""):
+    """
+    ``compose_page`` as an iterator of ordered chunks.
+
+    The head depends on every section, so sections are all rendered first:
+    one empty chunk is yielded after each, for progress reporting. Then come
+    the head, one chunk per section body and the tail; joined, they equal
+    ``compose_page(...)``.
+
+    Yields:
+        Output chunks (str)
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+
+    assets = _Assets()
+    parts = []
+    for section in sections:
+        parts.append(_extract(_render_section(section, icon_mode, prerender_icons), assets))
+        yield ""
+
+    icons = list(dict.fromkeys(name for part in parts for name in icons_referenced(part)))
+    if icon_mode == "sprite" and "toasts" in assets.runtime:
+        # Toasts are built client-side; their icons never appear in the markup
+        icons += [f"alert-{kind}" for kind in ("info", "success", "warning", "error")]
+    sprite = render_sprite(icons)
+    if critical_css.strip():
+        assets.add_style(critical_css.strip())
+    styles = "\n".join(assets.styles)
+    scripts = runtime_bundle(assets.runtime) if assets.runtime else ""
+    scripts += "\n".join(assets.scripts)
+
+    if layout == "base":
+        # base.html already restores sidebar state in <head>
+        extra_head = f"<style>\n{styles}\n</style>\n" if styles else ""
+        yield f'''{{% extends "base.html" %}}
+
+{{% block title %}}{title}{{% endblock %}}
+
+{{% block extra_head %}}
+{extra_head}{{% endblock %}}
+
+{{% block content %}}
+{sprite}'''
+        yield from parts
+        yield f'''
+{{% endblock %}}
+
+{{% block extra_scripts %}}
+{scripts}
+{{% endblock %}}
+'''
+        return
+
+    sidebar_state = f"    {sidebar_state_script()}\n" if assets.sidebar_state else ""
+    yield f'''<!DOCTYPE html>
+<html lang="en" data-theme="{theme}">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+{sidebar_state}
+    <style>
+{_CRITICAL_CSS}
+{styles}
+    </style>
+
+    <!-- Inter Font -->
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="{_INTER_CSS}" rel="stylesheet">
+
+    <!-- Tailwind CSS + DaisyUI (the Tailwind CDN build must run before first paint) -->
+    <link href="https://cdn.jsdelivr.net/npm/daisyui@4.4.19/dist/full.min.css" rel="stylesheet"
+          type="text/css">
+    <script src="https://cdn.tailwindcss.com"></script>
+    <script>
+        // DaisyUI theme configuration
+        tailwind.config = {{
+            daisyui: {{
+                themes: [{{
+                    light: {{
+                        "primary": "#2563eb",      // Blue-600
+                        "secondary": "#64748b",    // Slate-500
+                        "accent": "#8b5cf6",       // Purple-500
+                        "neutral": "#1f2937",      // Gray-800
+                        "base-100": "#ffffff",     // White
+                        "base-200": "#f9fafb",     // Gray-50
+                        "base-300": "#f3f4f6",     // Gray-100
+                    }}
+                }}, "dark"]
+            }}
+        }};
+    </script>
+
+    <!-- Lucide Icons: deferred, one createIcons() pass once loaded -->
+    <script defer src="https://unpkg.com/lucide@{LUCIDE_VERSION}/dist/umd/lucide.min.js"
+            onload="lucide.createIcons()"></script>
+</head>
+<body class="bg-base-100">
+{sprite}'''
+    yield from parts
+    yield f'''
+{scripts}
+</body>
+</html>
+'''
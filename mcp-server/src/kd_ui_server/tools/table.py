@@ -1,8 +1,11 @@
 """Table generation tool for Flask templates."""
 import uuid
 
+from ..icons import render_icon
 
-def create_table(columns, features=None, rows_per_page=10, striped=True, hoverable=True, title="Data Table"):
+
+def create_table(columns, features=None, rows_per_page=10, striped=True, hoverable=True,
+                 title="Data Table", icon_mode="inline"):
     """
     Generate a data table with sorting, filtering, and pagination.
 
@@ -13,6 +16,7 @@ def create_table(columns, features=None, rows_per_page=10, striped=True, hoverab
         striped:       Alternating row colors
         hoverable:     Highlight row on hover
         title:         Table heading text
+        icon_mode:     "inline" SVG icons, or "sprite" <use> refs (page includes the icon_sprite)
 
     Returns:
         Self-contained Jinja2 template string (includes inline JS)
@@ -27,10 +31,17 @@ def create_table(columns, features=None, rows_per_page=10, striped=True, hoverab
 
     # ── Header bar: title | search | total ────────────────────────────────────
     if "search" in features:
+        search_icon = render_icon(
+            "search", icon_mode, size=14,
+            style=(
+                "position:absolute; left:10px; top:50%; transform:translateY(-50%); "
+                "color:oklch(var(--bc)/0.35); pointer-events:none;"
+            ),
+        )
         t += f'''  <div style="display:grid; grid-template-columns:auto 1fr auto; align-items:center; gap:1rem; margin-bottom:1.25rem;">
     <h2 style="font-size:1.125rem; font-weight:600; color:oklch(var(--bc)); margin:0; white-space:nowrap;">{title}</h2>
     <div style="position:relative; max-width:360px; justify-self:center; width:100%;">
-      <svg style="position:absolute; left:10px; top:50%; transform:translateY(-50%); color:oklch(var(--bc)/0.35); pointer-events:none;" xmlns="http://www.w3.org/2000/svg" width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><circle cx="11" cy="11" r="8"/><path d="m21 21-4.35-4.35"/></svg>
+      {search_icon}
       <input type="text" id="{tid}-search" placeholder="Search..." style="width:100%; padding:7px 12px 7px 32px; font-size:0.875rem; background:oklch(var(--b1, white)); color:oklch(var(--bc)); border:1px solid oklch(var(--b3)); border-radius:6px; outline:none; box-sizing:border-box;" onfocus="this.style.borderColor='#2563EB'" onblur="this.style.borderColor='oklch(var(--b3))'" />
     </div>
     <span style="font-size:0.875rem; color:oklch(var(--bc)/0.45); white-space:nowrap;">{{{{ total_rows or 0 }}}} total</span>
@@ -0,0 +1,177 @@
+"""Multi-process generation behind a single MCP front end.
+
+Generators are pure CPU-bound Python, so one server process serves one call
+at a time however many sessions are connected. With ``kd-ui-server --pool N``
+the front end (stdio or HTTP) still speaks MCP, but every ``call_tool`` is
+handed to one of N pre-forked, pre-warmed worker processes, so throughput
+scales with cores for batch-heavy traffic.
+
+Pre-rendered assets live once in a read-only ``SharedAssetCache``, a
+shared-memory segment the front end fills at startup and every worker
+attaches to: the static resources (design system, guides, layout templates)
+the front end serves, and the vendored Lucide icon set the workers' generators
+render from (see ``icons.lucide_assets``).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+
+class SharedAssetCache:
+    """Read-only ``{key: str}`` store in one shared-memory segment.
+
+    Create it in the parent with ``SharedAssetCache.build(items)``; pass
+    ``handle`` to other processes and ``SharedAssetCache.attach(handle)`` there.
+    """
+
+    def __init__(self, shm, index, owner):
+        self._shm = shm
+        self._index = index  # key -> (offset, length)
+        self._owner = owner
+
+    @classmethod
+    def build(cls, items):
+        """
+        Copy ``items`` into a new shared-memory segment.
+
+        Args:
+            items: Mapping of key to text
+
+        Returns:
+            SharedAssetCache owning the segment
+        """
+        blobs = {key: text.encode("utf-8") for key, text in items.items()}
+        shm = shared_memory.SharedMemory(create=True, size=max(1, sum(map(len, blobs.values()))))
+        index, offset = {}, 0
+        for key, blob in blobs.items():
+            shm.buf[offset:offset + len(blob)] = blob
+            index[key] = (offset, len(blob))
+            offset += len(blob)
+        return cls(shm, index, owner=True)
+
+    @property
+    def handle(self):
+        """Picklable description other processes attach with."""
+        return {"name": self._shm.name, "index": self._index}
+
+    @classmethod
+    def attach(cls, handle):
+        """Map an existing segment read-only; only the creating process unlinks it."""
+        # Workers share the creator's resource tracker, which already tracks
+        # the segment: unregistering here would drop the creator's entry
+        return cls(shared_memory.SharedMemory(name=handle["name"]), handle["index"], owner=False)
+
+    def get(self, key):
+        """Text stored under ``key``, or None."""
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        offset, length = entry
+        return bytes(self._shm.buf[offset:offset + length]).decode("utf-8")
+
+    def __contains__(self, key):
+        return key in self._index
+
+    @property
+    def size(self):
+        return self._shm.size
+
+    def close(self):
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _init_worker(handle):
+    """Worker initializer: attach the asset cache and warm every generator."""
+    from . import icons, server
+
+    # Ctrl-C reaches the whole process group; the front end shuts workers down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if handle is not None:
+        icons.shared_assets = SharedAssetCache.attach(handle)
+    server.warm_up(resources=False)
+
+
+def _generate(name, arguments):
+    from .server import _generate_chunks
+
+    return _generate_chunks(name, arguments)
+
+
+def _ready():
+    return os.getpid()
+
+
+class WorkerPool:
+    """Pre-forked, pre-warmed generator processes.
+
+    Args:
+        size: Number of workers (default: CPU count)
+        assets: Optional SharedAssetCache the workers attach to, closed with the pool
+    """
+
+    def __init__(self, size=None, assets=None):
+        self.size = size or os.cpu_count() or 1
+        self.assets = assets
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.size,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(assets.handle if assets else None,),
+        )
+
+    def start(self, timeout=60):
+        """
+        Start and warm every worker now rather than on the first calls.
+
+        Raises:
+            RuntimeError: A worker failed to warm up or wasn't ready within
+                ``timeout`` seconds; the pool is shut down
+        """
+        futures = [self._executor.submit(_ready) for _ in range(self.size)]
+        done, pending = wait(futures, timeout=timeout)
+        failed = next((future.exception() for future in done if future.exception()), None)
+        if pending:
+            # A hung worker would block a waiting shutdown
+            self.shutdown(wait=False)
+            raise RuntimeError(f"{len(pending)} of {self.size} workers not ready after {timeout}s")
+        if failed is not None:
+            self.shutdown()
+            raise RuntimeError(f"worker warm-up failed: {failed!r}") from failed
+        return self
+
+    async def generate(self, name, arguments):
+        """Run a tool's generator in a worker and return its output chunks."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _generate, name, arguments)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        if self.assets is not None:
+            self.assets.close()
+
+
+def start_pool(size=None):
+    """
+    Render the shared asset cache, start a pool and install both in the server.
+
+    Returns:
+        The started WorkerPool
+    """
+    from . import icons, server
+
+    items = {uri: server._build_resource(uri) for uri in server.RESOURCE_URIS}
+    items.update(icons.lucide_assets())
+    assets = SharedAssetCache.build(items)
+    pool = WorkerPool(size, assets).start()
+    server.shared_assets = assets
+    server.worker_pool = pool
+    return pool
+
@@ -0,0 +1,43 @@
+"""Tests for kd_ui_server.bootstrap: the fast handshake must match the SDK's."""
+
+import anyio
+from mcp import types
+from mcp.shared.message import SessionMessage
+from mcp.shared.version import SUPPORTED_PROTOCOL_VERSIONS
+
+from kd_ui_server.bootstrap import _fast_result, _sdk_protocol_versions
+from kd_ui_server.server import app
+
+
+async def _sdk_initialize(protocol_version):
+    read_writer, read_stream = anyio.create_memory_object_stream(1)
+    write_stream, write_reader = anyio.create_memory_object_stream(1)
+    request = types.JSONRPCMessage.model_validate({
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": protocol_version,
+            "capabilities": {},
+            "clientInfo": {"name": "test", "version": "0"},
+        },
+    })
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(app.run, read_stream, write_stream, app.create_initialization_options())
+        await read_writer.send(SessionMessage(request))
+        response = await write_reader.receive()
+        tg.cancel_scope.cancel()
+    return response.message.model_dump(by_alias=True, exclude_none=True)["result"]
+
+
+def test_protocol_versions_read_from_sdk_source():
+    supported, latest = _sdk_protocol_versions()
+    assert supported == tuple(SUPPORTED_PROTOCOL_VERSIONS)
+    assert latest == types.LATEST_PROTOCOL_VERSION
+
+
+def test_initialize_reply_matches_sdk():
+    versions = _sdk_protocol_versions()
+    for requested in [*SUPPORTED_PROTOCOL_VERSIONS, "1999-01-01"]:
+        params = {"protocolVersion": requested}
+        assert _fast_result("initialize", params, versions) == anyio.run(_sdk_initialize, requested)
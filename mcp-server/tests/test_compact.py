@@ -0,0 +1,52 @@
+"""Tests for kd_ui_server.compact."""
+
+import re
+
+from kd_ui_server.compact import compact_html
+from kd_ui_server.tools.table import create_table
+
+
+def _ids(html):
+    return set(re.findall(r'\sid="([^"]+)"', html))
+
+
+def test_table_script_finds_its_elements():
+    html = compact_html(create_table(
+        columns=[{"key": "name", "label": "Name", "sortable": True}],
+        features=["search", "sort", "pagination"],
+    ))
+    ids = _ids(html)
+    tid = re.search(r"var tid\s*=\s*'([^']+)'", html).group(1)
+    suffixes = re.findall(r"getElementById\(tid \+ '([^']+)'\)", html)
+
+    assert not tid.startswith("kd-tbl-")
+    assert tid in ids
+    assert sorted(suffixes) == ["-body", "-count", "-pages", "-search"]
+    assert all(tid + suffix in ids for suffix in suffixes)
+    assert set(re.findall(r"querySelectorAll\('#([\w-]+) ", html)) == {tid}
+
+
+def test_short_ids_are_stable_and_unrelated_ids_differ():
+    html = '<div id="first-element"></div><div id="second-element"></div>'
+    compacted = compact_html(html)
+    first, second = re.findall(r'id="([^"]+)"', compacted)
+
+    assert compacted == compact_html(html)
+    assert first != second
+    assert not first.startswith("first-element")
+
+
+def test_only_id_references_are_rewritten():
+    html = compact_html(
+        '<section id="pricing-plans"><a href="/pricing-plans">See pricing-plans</a>'
+        '<a href="#pricing-plans">Plans</a><label for="pricing-plans">Plan</label>'
+        '<input name="pricing-plans" value="pricing-plans"></section>'
+    )
+    short = re.search(r'<section id="([^"]+)"', html).group(1)
+
+    assert short != "pricing-plans"
+    assert 'href="/pricing-plans"' in html
+    assert ">See pricing-plans<" in html
+    assert 'name="pricing-plans" value="pricing-plans"' in html
+    assert f'href="#{short}"' in html
+    assert f'for="{short}"' in html
@@ -0,0 +1,82 @@
+"""Tests for kd_ui_server.events."""
+
+import asyncio
+
+from kd_ui_server.events import Event, EventBus, format_sse
+
+
+def _drain(sub):
+    events = []
+    while sub.pending():
+        events.append(sub.get(timeout=0))
+    return events
+
+
+def test_coalesce_replaces_pending_event_with_same_key():
+    bus = EventBus(maxsize=10, policy="coalesce")
+    sub = bus.subscribe()
+    bus.publish("jobs", {"failing": 1}, key="failing")
+    bus.publish("jobs", {"other": True})
+    bus.publish("jobs", {"failing": 3}, key="failing")
+    bus.publish("alerts", {"failing": 9}, key="failing")
+
+    assert [event.data for event in _drain(sub)] == [
+        {"failing": 3},
+        {"other": True},
+        {"failing": 9},
+    ]
+    assert sub.coalesced == 1
+
+
+def test_drop_oldest_keeps_newest_events():
+    bus = EventBus(maxsize=2, policy="drop_oldest")
+    sub = bus.subscribe()
+    for n in range(4):
+        bus.publish("n", n, key="same")
+
+    assert [event.data for event in _drain(sub)] == [2, 3]
+    assert sub.dropped == 2
+
+
+def test_drop_newest_keeps_oldest_events():
+    bus = EventBus(maxsize=2, policy="drop_newest")
+    sub = bus.subscribe()
+    for n in range(4):
+        bus.publish("n", n)
+
+    assert [event.data for event in _drain(sub)] == [0, 1]
+    assert sub.dropped == 2
+
+
+def test_topics_filter_and_async_consumer():
+    bus = EventBus()
+    sub = bus.subscribe(topics=["wanted"])
+    bus.publish("ignored", 1)
+    bus.publish("wanted", 2)
+
+    assert asyncio.run(sub.aget(timeout=1)).data == 2
+    sub.close()
+    assert bus.subscriber_count == 0
+
+
+def test_resume_replays_missed_events_from_history():
+    bus = EventBus(history=3)
+    first = [bus.publish("n", n) for n in range(5)]
+    sub = bus.subscribe(topics=["n"], last_event_id=str(first[2].id))
+    bus.publish("n", 5)
+
+    assert [event.data for event in _drain(sub)] == [3, 4, 5]
+    # Older than the history: everything still kept is replayed
+    assert [event.data for event in _drain(bus.subscribe(last_event_id="0"))] == [3, 4, 5]
+    # Garbage header: live events only
+    assert bus.subscribe(last_event_id="abc").pending() == 0
+
+
+def test_format_sse():
+    assert format_sse(Event(7, "notification", {"type": "info"}), retry=3000) == (
+        'id: 7\nevent: notification\nretry: 3000\ndata: {"type": "info"}\n\n'
+    )
+    assert format_sse(Event(8, "log", "line one\nline two")) == (
+        "id: 8\nevent: log\ndata: line one\ndata: line two\n\n"
+    )
+    assert format_sse(Event(9, "ping", "")) == "id: 9\nevent: ping\ndata: \n\n"
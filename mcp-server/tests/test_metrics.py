@@ -0,0 +1,32 @@
+"""Tests for kd_ui_server.metrics."""
+
+from kd_ui_server.metrics import DEFAULT_INTERVAL, OTHER, Metrics
+
+
+def _record(metrics, kind, name, component=None):
+    with metrics.observe(kind, name, component) as obs:
+        obs.output("<div></div>")
+
+
+def test_unknown_labels_fold_into_other():
+    metrics = Metrics()
+    _record(metrics, "tool", "add_component", "sidebar")
+    _record(metrics, "tool", "add_component", "no-such-component")
+    _record(metrics, "tool", "add_component", "another-one")
+    _record(metrics, "tool", "no_such_tool")
+    _record(metrics, "resource", "template://components/sidebar")
+    _record(metrics, "resource", "template://../secrets")
+
+    assert sorted(metrics._series) == [
+        ("resource", OTHER, ""),
+        ("resource", "template://components/sidebar", ""),
+        ("tool", "add_component", OTHER),
+        ("tool", "add_component", "sidebar"),
+        ("tool", OTHER, ""),
+    ]
+    assert metrics._series[("tool", "add_component", OTHER)].calls == 2
+
+
+def test_bad_interval_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("KD_UI_METRICS_INTERVAL", "soon")
+    assert Metrics.from_env().interval == DEFAULT_INTERVAL
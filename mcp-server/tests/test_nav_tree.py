@@ -0,0 +1,76 @@
+"""Tests for kd_ui_server.nav_tree."""
+
+import sys
+
+from kd_ui_server.nav_tree import build_tree, render_nav_tree
+
+
+def _ids(nodes):
+    return [(node["id"], _ids(node["children"])) for node in nodes]
+
+
+def test_builds_nested_tree_in_input_order():
+    nodes = [
+        {"id": "home", "parent_id": None},
+        {"id": "reports", "parent_id": None},
+        {"id": "sales", "parent_id": "reports"},
+        {"id": "traffic", "parent_id": "reports"},
+        {"id": "orphan", "parent_id": "missing"},
+    ]
+    assert _ids(build_tree(nodes)) == [
+        ("home", []),
+        ("reports", [("sales", []), ("traffic", [])]),
+    ]
+
+
+def test_self_parented_node_terminates():
+    nodes = [
+        {"id": "a", "parent_id": None},
+        {"id": "a", "parent_id": "a"},
+        {"id": "b", "parent_id": "b"},
+    ]
+    assert _ids(build_tree(nodes)) == [("a", [])]
+
+
+def test_two_node_cycle_terminates():
+    nodes = [
+        {"id": "root", "parent_id": None},
+        {"id": "a", "parent_id": "root"},
+        {"id": "b", "parent_id": "a"},
+        # Duplicate id closing the loop a -> b -> a
+        {"id": "a", "parent_id": "b"},
+        # Unreachable cycle with no root
+        {"id": "x", "parent_id": "y"},
+        {"id": "y", "parent_id": "x"},
+    ]
+    assert _ids(build_tree(nodes)) == [("root", [("a", [("b", [])])])]
+
+
+def test_pruned_subtree():
+    nodes = [
+        {"id": "admin", "parent_id": None, "permission": "admin"},
+        {"id": "users", "parent_id": "admin"},
+        {"id": "home", "parent_id": None},
+    ]
+    assert _ids(build_tree(nodes, can_view=lambda node: "permission" not in node)) == [("home", [])]
+
+
+def test_render_with_custom_id_key():
+    nodes = [
+        {"key": "reports", "parent": None, "label": "Reports"},
+        {"key": "sales", "parent": "reports", "label": "Sales", "url": "/sales"},
+    ]
+    tree = build_tree(nodes, id_key="key", parent_key="parent")
+    html = render_nav_tree(tree, active="sales", id_key="key")
+
+    assert '<li data-kd-nav-id="reports"><details open>' in html
+    assert '<a href="/sales" class="active" aria-current="page">' in html
+
+
+def test_render_deeper_than_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    nodes = [{"id": i, "parent_id": i - 1 if i else None, "label": str(i)} for i in range(depth)]
+    html = render_nav_tree(build_tree(nodes), active=depth - 1)
+
+    assert html.count("<details open>") == depth - 1
+    assert 'aria-current="page"' in html
@@ -0,0 +1,29 @@
+"""Tests for kd_ui_server.runtime.chart_canvas data binding."""
+
+import json
+import re
+
+from jinja2 import Environment
+
+from kd_ui_server.runtime import chart_canvas
+
+
+def _data(html, **context):
+    rendered = Environment().from_string(html).render(**context)
+    config = re.search(r'<script type="application/json"[^>]*>(.*?)</script>', rendered).group(1)
+    return json.loads(config)["data"]
+
+
+def test_variable_source_renders_when_undefined():
+    html = chart_canvas("sales", {"type": "bar", "data": {}}, {"variable": "series"})
+
+    assert _data(html) is None
+    assert _data(html, series={"labels": ["Q1"]}) == {"labels": ["Q1"]}
+
+
+def test_variable_source_uses_fallback():
+    fallback = {"labels": ["demo"], "datasets": []}
+    html = chart_canvas("sales", {"type": "bar"}, {"variable": "series"}, fallback=fallback)
+
+    assert _data(html) == fallback
+    assert _data(html, series={"labels": ["Q1"]}) == {"labels": ["Q1"]}
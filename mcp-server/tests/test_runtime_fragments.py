@@ -0,0 +1,116 @@
+"""Tests for the ``fragments`` runtime module, run under Node with a minimal DOM."""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from kd_ui_server.runtime import RUNTIME_MODULES
+
+# Just enough DOM for kdFragments.mount: a template whose parsed <script>
+# elements are "already started" (so inserting them runs nothing), and
+# insertion that runs scripts which are not
+_DOM = r"""
+var executed = [];
+
+function Script(started) {
+  this.tagName = 'SCRIPT';
+  this.attrs = [];
+  this.text = '';
+  this.src = '';
+  this.async = true;
+  this.started = started;
+}
+Script.prototype.setAttribute = function(name, value) {
+  this.attrs.push({ name: name, value: value });
+  if (name === 'src') this.src = value;
+};
+Object.defineProperty(Script.prototype, 'attributes', { get: function() { return this.attrs; } });
+Object.defineProperty(Script.prototype, 'textContent', { get: function() { return this.text; } });
+Script.prototype.replaceWith = function(node) {
+  var nodes = this.parent.nodes;
+  nodes[nodes.indexOf(this)] = node;
+  node.parent = this.parent;
+};
+
+function Fragment(html) {
+  var fragment = this, re = /<script([^>]*)>([\s\S]*?)<\/script>|([^<]+|<(?!script)[^>]*>)/g, m;
+  this.nodes = [];
+  while ((m = re.exec(html))) {
+    if (m[3] !== undefined) {
+      this.nodes.push({ markup: m[3] });
+      continue;
+    }
+    var script = new Script(true), attr, attrRe = /([\w-]+)="([^"]*)"/g;
+    while ((attr = attrRe.exec(m[1]))) script.setAttribute(attr[1], attr[2]);
+    script.text = m[2];
+    script.parent = fragment;
+    this.nodes.push(script);
+  }
+}
+Fragment.prototype.querySelectorAll = function(selector) {
+  return this.nodes.filter(function(node) { return node.tagName === 'SCRIPT'; });
+};
+
+var document = {
+  createElement: function(tag) {
+    if (tag === 'script') return new Script(false);
+    var tpl = { content: null };
+    Object.defineProperty(tpl, 'innerHTML', {
+      set: function(html) { tpl.content = new Fragment(html); }
+    });
+    return tpl;
+  }
+};
+
+function Element() {
+  this.dataset = {};
+  this.children = [];
+}
+Element.prototype.replaceChildren = function(fragment) {
+  this.children = fragment.nodes;
+  fragment.nodes.forEach(function(node) {
+    if (node.tagName !== 'SCRIPT' || node.started) return;
+    node.started = true;
+    executed.push({ src: node.src, async: node.async, attrs: node.attrs });
+    if (!node.src) (0, eval)(node.text);
+  });
+};
+
+var window = globalThis;
+"""
+
+
+def _run(body):
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("node is not installed")
+    source = _DOM + RUNTIME_MODULES["fragments"] + "\n" + body
+    result = subprocess.run([node, "-e", source], capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def test_mount_recreates_scripts_so_they_run():
+    result = _run(r"""
+var el = new Element();
+window.kdFragments.mount(el,
+  '<p>Analytics</p>'
+  + '<script src="/static/chart.js" data-kd="1"></script>'
+  + '<script type="text/javascript">window.panelRan = (window.panelRan || 0) + 1;</script>');
+console.log(JSON.stringify({
+  ran: window.panelRan,
+  executed: executed,
+  lazy: el.dataset.kdLazy,
+  markup: el.children.filter(function(n) { return n.markup; }).map(function(n) { return n.markup; })
+}));
+""")
+
+    assert result["ran"] == 1
+    src, inline = result["executed"]
+    assert src["src"] == "/static/chart.js" and src["async"] is False
+    assert {"name": "data-kd", "value": "1"} in src["attrs"]
+    assert inline["attrs"] == [{"name": "type", "value": "text/javascript"}]
+    assert result["markup"] == ["<p>", "Analytics", "</p>"]
+    assert result["lazy"] == "loaded"
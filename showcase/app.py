@@ -4,6 +4,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../mcp-server/src'))
 
 from flask import Flask, render_template, render_template_string
+from kd_ui_server.fixtures import PROJECTS
 from kd_ui_server.tools.component import add_component
 from kd_ui_server.tools.table import create_table
 from kd_ui_server.tools.form import create_form
@@ -89,7 +90,8 @@ def showcase():
     })
 
     # --- Tabs ---
-    c['tabs'] = add_component("tabs", {"tabs": [
+    # Lazy: inactive panels are mounted by kdFragments on first open
+    c['tabs'] = add_component("tabs", {"lazy": True, "tabs": [
         {"id": "tab_overview", "label": "Overview", "content": "<p class='text-sm py-1'>Overview content goes here.</p>", "active": True},
         {"id": "tab_analytics", "label": "Analytics", "content": "<p class='text-sm py-1'>Analytics data and charts.</p>"},
         {"id": "tab_settings", "label": "Settings", "content": "<p class='text-sm py-1'>Configuration options.</p>"},
@@ -203,30 +205,22 @@ def showcase():
     c['chart'] = add_component("chart_container", {
         "id": "showcaseChart",
         "title": "Monthly Revenue",
-        "height": "280px"
+        "height": "280px",
+        "demo_data": True
     })
 
     # --- Form (pre-rendered to resolve Jinja2 conditionals) ---
     raw_form = create_form(form_type="login")
     c['form'] = render_template_string(raw_form, csrf_token=None, error=None)
 
-    # --- Table (pre-rendered with mock data) ---
+    # --- Table (pre-rendered with fixture data) ---
     table_columns = [
         {"name": "name", "label": "Project", "sortable": True},
         {"name": "status", "label": "Status", "type": "badge", "sortable": False},
         {"name": "updated", "label": "Last Updated", "sortable": True},
     ]
-    table_data = [
-        {"name": "alpha-api",       "status": "Active",   "status_color": "success",     "updated": "2026-02-15"},
-        {"name": "beta-dashboard",  "status": "Draft",    "status_color": "warning",     "updated": "2026-02-12"},
-        {"name": "gamma-service",   "status": "Archived", "status_color": "error",       "updated": "2026-01-30"},
-        {"name": "delta-worker",    "status": "Active",   "status_color": "success",     "updated": "2026-02-10"},
-        {"name": "epsilon-jobs",    "status": "Draft",    "status_color": "warning",     "updated": "2026-02-08"},
-        {"name": "zeta-gateway",    "status": "Active",   "status_color": "success",     "updated": "2026-02-05"},
-        {"name": "eta-scheduler",   "status": "Archived", "status_color": "secondary",   "updated": "2026-01-28"},
-    ]
     raw_table = create_table(table_columns, features=["search", "sort", "pagination"], title="Projects", rows_per_page=5)
-    c['table'] = render_template_string(raw_table, data=table_data, total_rows=7)
+    c['table'] = render_template_string(raw_table, data=PROJECTS, total_rows=len(PROJECTS))
 
     return render_template('showcase.html', c=c)
 